@@ -1,9 +1,15 @@
 import csv
-from country_map import country_map
+from country_map import normalize_country
+from corridor_matrix import CORRIDOR_FILE, CorridorMatrix
+from country_index import INDEX_FILE, CountryIndex
+from date_partitions import parse_timestamp, partition_dir, remove_month_partitions, write_month_partitions
 
 INPUT_FILE = "RawData.csv"
 OUTPUT_FILE = "AllowedApplicantsExploded.csv"
 
+# Also write the output as one CSV per month (see process_raw_data.py)
+PARTITION_BY_MONTH = False
+
 
 def parse_budget(budget_raw):
     """Return avg budget."""
@@ -26,14 +32,6 @@ def parse_budget(budget_raw):
             return ""
 
 
-def normalize_country(raw):
-    """Normalize country using country_map."""
-    if not raw:
-        return ""
-    key = raw.strip().upper()
-    return country_map.get(key, raw.strip())
-
-
 def main():
     # Load RawData.csv
     with open(INPUT_FILE, "r", encoding="utf-8") as f:
@@ -55,6 +53,7 @@ def main():
         "Budget Avg",
         "Country Normalized",   # client's normalized country
         "Absolute Date",
+        "Timestamp",            # Absolute Date as epoch milliseconds
         "Job Type",
         "Experience Level",
         "Allowed Applicant Country"
@@ -62,6 +61,9 @@ def main():
 
     output.append(output_header)
 
+    # One entry per row for the country bitmask index
+    index_rows = []
+
     for row in rows:
         # Extract shared fields
         category = row.get("category", "")
@@ -70,6 +72,8 @@ def main():
         client_location = row.get("clientLocation", "")
         norm_country = normalize_country(client_location)
         abs_date = row.get("absoluteDate", "")
+        ts = parse_timestamp(abs_date)
+        ts = "" if ts is None else ts
         job_type = row.get("jobType", "")
         exp_level = row.get("experienceLevel", "")
 
@@ -84,6 +88,8 @@ def main():
             if row.get(c, "").strip() != ""
         ]
 
+        index_rows.append((job_id, allowed_list, bavg, category, job_type, exp_level, norm_country))
+
         # Create exploded rows
         for allowed_country in allowed_list:
             output.append([
@@ -93,6 +99,7 @@ def main():
                 bavg,
                 norm_country,
                 abs_date,
+                ts,
                 job_type,
                 exp_level,
                 allowed_country
@@ -103,8 +110,23 @@ def main():
         writer = csv.writer(f)
         writer.writerows(output)
 
+    if PARTITION_BY_MONTH:
+        write_month_partitions(OUTPUT_FILE, output_header, output[1:])
+    else:
+        # stale partitions would shadow the file just written
+        remove_month_partitions(OUTPUT_FILE)
+
+    index = CountryIndex.from_jobs(index_rows)
+    index.save(INDEX_FILE)
+    corridors = CorridorMatrix.from_index(index)
+    corridors.save(CORRIDOR_FILE)
+
     print("Allowed Applicant Countries exploded.")
     print(f"Wrote: {OUTPUT_FILE}")
+    if PARTITION_BY_MONTH:
+        print(f"Wrote: {partition_dir(OUTPUT_FILE)}/")
+    print(f"Wrote: {INDEX_FILE} ({len(index)} jobs, {len(index.countries)} countries)")
+    print(f"Wrote: {CORRIDOR_FILE}")
 
 
 if __name__ == "__main__":
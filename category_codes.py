@@ -0,0 +1,126 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from date_partitions import iter_time_range, read_time_range
+
+# Pipeline-wide value -> code dictionaries, grown by process_raw_data.py
+DICTIONARY_FILE = "Dictionaries.json"
+
+# Columns held as categoricals with dictionary codes
+CATEGORICAL_COLS = ["Category", "Job Type", "Experience Level", "Country Normalized", "Skill"]
+
+
+class Dictionaries:
+    """
+    Value <-> int code mapping per column. Values are stripped and codes are
+    handed out in first seen order and never change, so codes stored or
+    compared across stages stay valid as the dictionaries grow.
+    """
+
+    def __init__(self, values=None):
+        self.values = {}
+        self.codes = {}
+        for column, vs in (values or {}).items():
+            for v in vs:
+                self.code(column, v)
+
+    def code(self, column, value):
+        """Code of one value, added to the column's dictionary when new."""
+        value = str(value).strip()
+        codes = self.codes.setdefault(column, {})
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+            self.values.setdefault(column, []).append(value)
+        return code
+
+    def encode(self, column, values):
+        """Codes (int64 array) of distinct values; None / NaN get -1."""
+        return np.fromiter(
+            (-1 if pd.isna(v) else self.code(column, v) for v in values),
+            dtype=np.int64, count=len(values),
+        )
+
+    def categories(self, column):
+        return pd.Index(self.values.get(column, []), dtype=object)
+
+    def ranks(self, column):
+        """Rank of every code in sorted value order, to sort by codes as strings would sort."""
+        values = np.asarray(self.values.get(column, []), dtype=object)
+        ranks = np.empty(len(values), dtype=np.int64)
+        ranks[np.argsort(values, kind="stable")] = np.arange(len(values))
+        return ranks
+
+    def save(self, path=DICTIONARY_FILE):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.values, f, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path=DICTIONARY_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+def load_dictionaries(path=DICTIONARY_FILE):
+    """Saved dictionaries, or empty ones when there are none yet."""
+    if path and os.path.exists(path):
+        return Dictionaries.load(path)
+    return Dictionaries()
+
+
+def encode_columns(df, columns=CATEGORICAL_COLS, dictionaries=None):
+    """
+    Turn the given columns of df (where present) into categoricals whose
+    codes are the dictionary codes. Only the distinct values are stripped
+    and looked up, never every row. Returns df and the dictionaries used.
+    """
+    if dictionaries is None:
+        dictionaries = Dictionaries()
+    for column in columns:
+        if column not in df.columns:
+            continue
+        s = df[column]
+        if not isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype("category")
+        # local category -> dictionary code, then one take over the rows
+        lookup = np.append(dictionaries.encode(column, s.cat.categories), -1)
+        codes = lookup[s.cat.codes.to_numpy()]
+        df[column] = pd.Categorical.from_codes(codes, categories=dictionaries.categories(column))
+    return df, dictionaries
+
+
+def read_categorical_csv(path, columns=CATEGORICAL_COLS, dictionaries=None, start=None, end=None, **kwargs):
+    """
+    read_csv with the given columns parsed straight into categoricals and
+    re-coded with the dictionaries (stripped column names, like the
+    scripts do). With start / end only the rows dated in [start, end) are
+    read, from the month partitions when there are any. Every partition is
+    encoded before the frames are joined, so the columns never widen to
+    strings. Returns the frame and the dictionaries.
+    """
+    if dictionaries is None:
+        dictionaries = Dictionaries()
+    dtype = {c: "category" for c in columns}
+    frames = []
+    for df in iter_time_range(path, start, end, dtype=dtype, **kwargs):
+        df.columns = [c.strip() for c in df.columns]
+        frames.append(encode_columns(df, columns, dictionaries)[0])
+    if not frames:
+        df = read_time_range(path, start, end, dtype=dtype, **kwargs)
+        df.columns = [c.strip() for c in df.columns]
+        return encode_columns(df, columns, dictionaries)
+    if len(frames) == 1:
+        return frames[0], dictionaries
+
+    # earlier frames were coded against a prefix of the grown dictionaries;
+    # with the same categories everywhere concat keeps the categoricals
+    for df in frames:
+        for column in columns:
+            if column in df.columns:
+                df[column] = pd.Categorical.from_codes(
+                    df[column].cat.codes, categories=dictionaries.categories(column)
+                )
+    return pd.concat(frames, ignore_index=True), dictionaries
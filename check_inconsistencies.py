@@ -1,62 +1,129 @@
-import pandas as pd
+import csv
 
-INPUT_FILE = "SkillsExploded.csv"
+from category_codes import Dictionaries, load_dictionaries
 
-# Load data
-df = pd.read_csv(INPUT_FILE)
-df.columns = [c.strip() for c in df.columns]
+INPUT_FILE = "SkillsExploded.csv"
+OUTPUT_DETAILED = "InconsistentJobs_detailed.csv"
+OUTPUT_SUMMARY = "InconsistentJobs_summary.csv"
 
-# Keep only valid rows
-df = df[df["Job ID"].notna() & df["Skill"].notna()].copy()
+# Columns that define your segment
+SEG_COLS = ["Category", "Job Type", "Experience Level"]
 
-# Basic cleaning for text fields
-for col in ["Skill", "Category", "Job Type", "Experience Level", "Country Normalized"]:
-    if col in df.columns:
-        df[col] = df[col].astype(str).str.strip()
+# Columns whose seen values are tracked per Job ID
+TRACKED_COLS = SEG_COLS + ["Country Normalized"]
 
-# Columns that define your segment
-seg_cols = ["Category", "Job Type", "Experience Level"]
-
-# 1. Detect Job IDs that belong to multiple categories or levels or job types
-meta = (
-    df.groupby("Job ID")[seg_cols]
-      .nunique()
-)
-
-problem_jobs = meta[
-    (meta["Category"] > 1) |
-    (meta["Job Type"] > 1) |
-    (meta["Experience Level"] > 1)
+SUMMARY_HEADER = [
+    "Job ID", "Skill", "Categories", "Job_Types", "Experience_Levels", "Countries"
 ]
 
-print(f"Jobs with inconsistent segment info: {len(problem_jobs)}")
-
-# 2. Detailed view: all raw rows for those Job IDs
-detailed = df[df["Job ID"].isin(problem_jobs.index)].copy()
-detailed = detailed.sort_values(
-    ["Job ID", "Category", "Job Type", "Experience Level", "Skill"]
-)
-
-detailed.to_csv("InconsistentJobs_detailed.csv", index=False)
-print("Saved detailed rows to InconsistentJobs_detailed.csv")
-
-# 3. Compact summary: one row per Job ID and Skill with lists of values
-def unique_join(series):
-    vals = sorted(set(series.dropna()))
-    return ", ".join(vals)
-
-summary = (
-    detailed
-    .groupby(["Job ID", "Skill"])
-    .agg(
-        Categories=("Category", unique_join),
-        Job_Types=("Job Type", unique_join),
-        Experience_Levels=("Experience Level", unique_join),
-        Countries=("Country Normalized", unique_join) if "Country Normalized" in df.columns else ("Category", lambda s: "")
-    )
-    .reset_index()
-)
-
-summary = summary.sort_values(["Job ID", "Skill"])
-summary.to_csv("InconsistentJobs_summary.csv", index=False)
-print("Saved summary to InconsistentJobs_summary.csv")
+
+class InconsistencyTracker:
+    """
+    Streaming detector for Job IDs that show up with conflicting segment info.
+
+    Every tracked value is interned to its code in the shared dictionaries
+    (category_codes) and each Job ID keeps one bitmask per tracked column
+    with the codes seen so far. Rows can be fed one by one while they are
+    produced, nothing else is kept in memory.
+    """
+
+    def __init__(self, header, dictionaries=None):
+        self.job_idx = header.index("Job ID")
+        self.skill_idx = header.index("Skill")
+        self.col_idx = [header.index(c) if c in header else None for c in TRACKED_COLS]
+        self.dictionaries = dictionaries if dictionaries is not None else Dictionaries()
+        self.masks = {}
+        self.problem_jobs = set()
+
+    def _code(self, col, value):
+        return self.dictionaries.code(TRACKED_COLS[col], value)
+
+    def add(self, row):
+        """Update the state of the row's Job ID."""
+        job_id = str(row[self.job_idx]).strip()
+        if not job_id or not str(row[self.skill_idx]).strip():
+            return
+
+        masks = self.masks.get(job_id)
+        if masks is None:
+            masks = self.masks[job_id] = [0] * len(TRACKED_COLS)
+
+        for col, idx in enumerate(self.col_idx):
+            if idx is None:
+                continue
+            masks[col] |= 1 << self._code(col, str(row[idx]).strip())
+
+        # more than one bit set in any segment column -> conflicting job
+        for col in range(len(SEG_COLS)):
+            m = masks[col]
+            if m & (m - 1):
+                self.problem_jobs.add(job_id)
+                break
+
+
+def unique_join(values):
+    return ", ".join(sorted(v for v in values if v))
+
+
+def write_reports(rows, header, problem_jobs,
+                  detailed_file=OUTPUT_DETAILED, summary_file=OUTPUT_SUMMARY):
+    """
+    Write the raw rows of the problem jobs and a compact summary with one
+    row per (Job ID, Skill) listing every value seen for it.
+    """
+    job_idx = header.index("Job ID")
+    skill_idx = header.index("Skill")
+    sort_idx = [header.index(c) for c in ["Job ID"] + SEG_COLS + ["Skill"]]
+    col_idx = [header.index(c) if c in header else None for c in TRACKED_COLS]
+
+    detailed = [r for r in rows if str(r[job_idx]).strip() in problem_jobs]
+    detailed.sort(key=lambda r: [str(r[i]).strip() for i in sort_idx])
+
+    with open(detailed_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(detailed)
+    print(f"Saved detailed rows to {detailed_file}")
+
+    # (Job ID, Skill) -> one set of seen values per tracked column
+    seen = {}
+    for r in detailed:
+        key = (str(r[job_idx]).strip(), str(r[skill_idx]).strip())
+        sets = seen.get(key)
+        if sets is None:
+            sets = seen[key] = [set() for _ in TRACKED_COLS]
+        for col, idx in enumerate(col_idx):
+            if idx is not None:
+                sets[col].add(str(r[idx]).strip())
+
+    with open(summary_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_HEADER)
+        for key in sorted(seen):
+            writer.writerow(list(key) + [unique_join(s) for s in seen[key]])
+    print(f"Saved summary to {summary_file}")
+
+
+def main():
+    # Pass 1: stream SkillsExploded.csv through the tracker
+    with open(INPUT_FILE, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = [c.strip() for c in next(reader)]
+        tracker = InconsistencyTracker(header, load_dictionaries())
+        for row in reader:
+            tracker.add(row)
+
+    print(f"Jobs with inconsistent segment info: {len(tracker.problem_jobs)}")
+
+    # Pass 2: stream again, keeping only rows of problem jobs
+    job_idx = header.index("Job ID")
+    with open(INPUT_FILE, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        rows = [r for r in reader if r[job_idx].strip() in tracker.problem_jobs]
+
+    write_reports(rows, header, tracker.problem_jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+# Default cache database, shared by every stage (each uses its own namespace)
+CACHE_FILE = "ContentCache.sqlite"
+MAX_CACHE_MB = 1024
+
+# SQLite limits the number of bound parameters per statement
+BATCH = 500
+
+
+def content_key(*parts):
+    """Stable hash of the given strings (e.g. extractor version + text)."""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(str(p).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class ContentCache:
+    """
+    Persistent key -> JSON value cache in a single SQLite file.
+
+    Entries live in namespaces so several stages can share one file. Every
+    read refreshes the entry's last use; close() evicts the least recently
+    used entries until the file content fits in max_mb. Hits and misses are
+    counted for reporting.
+    """
+
+    def __init__(self, path=CACHE_FILE, namespace="default", max_mb=MAX_CACHE_MB):
+        self.path = path
+        self.namespace = namespace
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_used REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self.conn.commit()
+
+    def get_many(self, keys, count=True):
+        """
+        Dict of key -> value for the keys found in the cache. count=False
+        leaves hits and misses alone, for repeat lookups of the same run.
+        """
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        for start in range(0, len(keys), BATCH):
+            batch = keys[start:start + BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({marks})",
+                [self.namespace] + batch,
+            ).fetchall()
+            for key, value in rows:
+                found[key] = json.loads(value)
+
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE entries SET last_used = ? WHERE namespace = ? AND key = ?",
+            [(now, self.namespace, k) for k in found],
+        )
+        self.conn.commit()
+        if count:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items):
+        """Store a dict of key -> JSON serializable value."""
+        now = time.time()
+        rows = []
+        for key, value in items.items():
+            blob = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+            rows.append((self.namespace, key, blob, len(blob), now))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries (namespace, key, value, size, last_used)"
+            " VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def evict(self):
+        """Drop least recently used entries (any namespace) above the size bound."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+
+        doomed = []
+        for namespace, key, size in self.conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY last_used"
+        ):
+            if total <= self.max_bytes:
+                break
+            doomed.append((namespace, key))
+            total -= size
+        self.conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", doomed)
+        self.conn.commit()
+        return len(doomed)
+
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self):
+        return (
+            f"cache '{self.namespace}': {self.hits} hits, {self.misses} misses "
+            f"({self.hit_ratio():.1%} hit ratio)"
+        )
+
+    def close(self):
+        evicted = self.evict()
+        self.conn.close()
+        return evicted
+
+
+def open_cache(path, namespace, max_mb=MAX_CACHE_MB):
+    """ContentCache for a path, or None when caching is switched off (path=None)."""
+    if not path:
+        return None
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    return ContentCache(path, namespace, max_mb)
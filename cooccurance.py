@@ -1,19 +1,30 @@
-import pandas as pd
-import itertools
 import numpy as np
+import pandas as pd
+
+from category_codes import encode_columns, load_dictionaries, read_categorical_csv
+from near_duplicates import load_cluster_representatives
+from pair_significance import add_significance, significant
 
 # === Configuration ===
 INPUT_FILE = "SkillsExploded.csv"
 OUTPUT_FILE = "SkillsPairsDetailed.csv"
-
-# === Load data ===
-df = pd.read_csv(INPUT_FILE)
-df.columns = [c.strip() for c in df.columns]
-
-# Filter valid data
-df = df[df["Job ID"].notna() & df["Skill"].notna()]
-df["Budget Avg"] = pd.to_numeric(df["Budget Avg"], errors="coerce")
-df["Skill"] = df["Skill"].astype(str).str.strip()
+# DescriptionClusters.csv from near_duplicates.py: when set, near-duplicate
+# reposts are dropped and only each cluster's representative job is counted
+CLUSTERS_FILE = None
+
+# Only jobs dated in [START_DATE, END_DATE) are counted (None = open ended),
+# e.g. "2025-10-01" or date_partitions.days_ago(30)
+START_DATE = None
+END_DATE = None
+
+# Significance of every pair: one sided "fisher" (exact) or "chi2" p-values
+# (None = off), Benjamini-Hochberg q-values over the table when FDR, and a
+# LIFT_CI_LEVEL interval of Lift. With MAX_Q_VALUE set only the pairs at or
+# below it are saved (the p-value when FDR is off).
+P_VALUE_METHOD = "fisher"
+FDR = True
+LIFT_CI_LEVEL = 0.95
+MAX_Q_VALUE = None
 
 # === Segmentation columns (WITHOUT country) ===
 seg_cols = [
@@ -22,132 +33,181 @@ seg_cols = [
     "Experience Level"
 ]
 
-# === Build job records ===
-# IMPORTANT: group by (Job ID, Category, Job Type, Experience Level)
-# So the same Job ID in multiple segments is treated as multiple jobs.
-def job_info(group):
-    return {
-        "skills": sorted(set(group["Skill"].dropna())),
-        "budget_avg": group["Budget Avg"].mean(),
-        "budget_median": group["Budget Avg"].median(),
-        "category": group["Category"].iloc[0],
-        "job_type": group["Job Type"].iloc[0],
-        "experience": group["Experience Level"].iloc[0]
-    }
-
-jobs = (
-    df.groupby(["Job ID", "Category", "Job Type", "Experience Level"])
-      .apply(job_info)
-      .to_dict()
-)
-
-# === Build canonical job+skill table for supports ===
-job_skill_rows = []
-for (job_id, category, job_type, experience), info in jobs.items():
-    for s in info["skills"]:
-        job_skill_rows.append({
-            "Job ID": job_id,
-            "Skill": s,
-            "Category": info["category"],
-            "Job Type": info["job_type"],
-            "Experience Level": info["experience"],
-        })
-
-job_skills_df = pd.DataFrame(job_skill_rows)
-
-# === Generate pairs per (Job ID, Category, Job Type, Experience) job ===
-rows = []
-for (job_id, category, job_type, experience), info in jobs.items():
-    skills = info["skills"]
-    if len(skills) < 2:
-        continue
-    for a, b in itertools.combinations(skills, 2):
-        rows.append({
-            "Skill A": a,
-            "Skill B": b,
-            "Category": info["category"],
-            "Job Type": info["job_type"],
-            "Experience Level": info["experience"],
-            "Budget Avg": info["budget_avg"],
-            "Budget Median": info["budget_median"]
-        })
-
-pairs_df = pd.DataFrame(rows)
-
-# === SEGMENTED AGGREGATION (Category + Job Type + Experience) ===
-agg = pairs_df.groupby(
-    seg_cols + ["Skill A", "Skill B"]
-).agg(
-    Jobs_Count=("Skill A", "count"),
-    Avg_Budget=("Budget Avg", "mean"),
-    Median_Budget=("Budget Median", "median"),
-    Min_Budget=("Budget Avg", "min"),
-    Max_Budget=("Budget Avg", "max")
-).reset_index()
-
-# === SEGMENTED SUPPORTS & METRICS (all inside same segment) ===
-
-# 1) Support for single skills inside each segment (from canonical job_skills_df)
-skill_seg_counts = (
-    job_skills_df
-    .groupby(seg_cols + ["Skill"])["Job ID"]
-    .nunique()
-    .reset_index()
-)
-
-# For Skill A
-supportA = skill_seg_counts.rename(
-    columns={"Skill": "Skill A", "Job ID": "Support A"}
-)
-agg = agg.merge(
-    supportA,
-    on=seg_cols + ["Skill A"],
-    how="left"
-)
-
-# For Skill B
-supportB = skill_seg_counts.rename(
-    columns={"Skill": "Skill B", "Job ID": "Support B"}
-)
-agg = agg.merge(
-    supportB,
-    on=seg_cols + ["Skill B"],
-    how="left"
-)
-
-# 2) Support AB inside the segment
-agg["Support AB"] = agg["Jobs_Count"]
-
-# 3) Total jobs per segment (for Lift), from canonical job_skills_df
-seg_total_jobs = (
-    job_skills_df.groupby(seg_cols)["Job ID"]
-    .nunique()
-    .to_dict()
-)
-
-seg_keys = agg[seg_cols].apply(tuple, axis=1)
-seg_totals_series = seg_keys.map(seg_total_jobs)
-
-# 4) Confidence, Lift, Jaccard (all segmented, consistent)
-agg["Confidence A→B"] = agg["Support AB"] / agg["Support A"]
-agg["Confidence B→A"] = agg["Support AB"] / agg["Support B"]
-
-agg["Lift"] = (
-    agg["Support AB"] * seg_totals_series
-    / (agg["Support A"] * agg["Support B"])
-)
-
-agg["Jaccard"] = agg["Support AB"] / (
-    agg["Support A"] + agg["Support B"] - agg["Support AB"]
-)
-
-# === Save output ===
-agg = agg.sort_values("Jobs_Count", ascending=False)
-agg.to_csv(OUTPUT_FILE, index=False)
-
-print(f"✅ Saved {len(agg)} segmented skill pairs to {OUTPUT_FILE}")
-
-
 
+# === Load data ===
+def load_skills(path=INPUT_FILE, dictionaries=None, start=START_DATE, end=END_DATE):
+    """SkillsExploded with the segment and skill columns as dictionary coded categoricals."""
+    df, _ = read_categorical_csv(path, dictionaries=dictionaries, start=start, end=end)
+    return df
+
+
+def job_skill_table(groups, skills, skill_ranks):
+    """
+    Distinct (group, skill) pairs sorted by group, then by skill value
+    (skill_ranks orders the codes as their strings sort).
+    """
+    n_skills = max(len(skill_ranks), 1)
+    key = np.unique(groups * n_skills + skill_ranks[skills])
+    rank_to_code = np.argsort(skill_ranks)
+    return key // n_skills, rank_to_code[key % n_skills]
+
+
+def skill_pairs(groups, skills, n_groups):
+    """
+    Every (group, Skill A, Skill B) with A before B, from the sorted output
+    of job_skill_table, ordered by group. Groups of the same size are
+    expanded together through one triangle index, so there is no Python
+    loop over jobs.
+    """
+    sizes = np.bincount(groups, minlength=n_groups)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    out_g, out_a, out_b = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    for k in np.unique(sizes[sizes >= 2]):
+        g = np.flatnonzero(sizes == k)
+        members = skills[offsets[g][:, None] + np.arange(k)]
+        ia, ib = np.triu_indices(k, 1)
+        out_g.append(np.repeat(g, len(ia)))
+        out_a.append(members[:, ia].ravel())
+        out_b.append(members[:, ib].ravel())
+    g, a, b = np.concatenate(out_g), np.concatenate(out_a), np.concatenate(out_b)
+    order = np.argsort(g, kind="stable")
+    return g[order], a[order], b[order]
 
 
+# === Build job records ===
+# IMPORTANT: group by (Job ID, Category, Job Type, Experience Level)
+# So the same Job ID in multiple segments is treated as multiple jobs.
+def build_segment_pairs(df, dictionaries=None):
+    """
+    Segmented co-occurrence table: one row per (segment, Skill A, Skill B)
+    with job counts, budget stats, supports, confidence, lift and jaccard.
+
+    Everything runs on dictionary codes: jobs, segments and skills are
+    small integers and only the final table holds categoricals.
+    """
+    # Filter valid data
+    df = df[df["Job ID"].notna() & df["Skill"].notna()].copy()
+    df["Budget Avg"] = pd.to_numeric(df["Budget Avg"], errors="coerce")
+    df, dictionaries = encode_columns(df, seg_cols + ["Skill"], dictionaries)
+
+    cols = seg_cols + ["Skill"]
+    codes = {c: df[c].cat.codes.to_numpy().astype(np.int64) for c in cols}
+    # rows with a missing segment value belong to no job
+    valid = np.logical_and.reduce([codes[c] >= 0 for c in cols])
+    codes = {c: v[valid] for c, v in codes.items()}
+    budget = df["Budget Avg"].to_numpy()[valid]
+    job_ids = pd.factorize(df["Job ID"].to_numpy()[valid], sort=True)[0]
+    dims = [len(dictionaries.values.get(c, [])) for c in seg_cols]
+
+    # one job per (Job ID, segment), numbered in the order of the sorted
+    # values so budgets are summed in the same order as a string groupby
+    if len(job_ids):
+        seg = np.ravel_multi_index([codes[c] for c in seg_cols], dims)
+        seg_rank = np.ravel_multi_index([dictionaries.ranks(c)[codes[c]] for c in seg_cols], dims)
+    else:
+        seg = seg_rank = np.zeros(0, dtype=np.int64)
+    keys, first, groups = np.unique(
+        job_ids * max(int(np.prod(dims)), 1) + seg_rank, return_index=True, return_inverse=True
+    )
+    n_groups = len(keys)
+    group_seg = seg[first]
+    group_budget = pd.Series(budget).groupby(groups).agg(["mean", "median"])
+
+    # === canonical job+skill table for supports ===
+    skill_ranks = dictionaries.ranks("Skill")
+    js_group, js_skill = job_skill_table(groups, codes["Skill"], skill_ranks)
+
+    # === pairs per (Job ID, Category, Job Type, Experience) job ===
+    pg, pa, pb = skill_pairs(js_group, js_skill, n_groups)
+    n_skills = max(len(skill_ranks), 1)
+    pair_key = (group_seg[pg] * n_skills + pa) * n_skills + pb
+    pairs = pd.DataFrame({
+        "key": pair_key,
+        "avg": group_budget["mean"].to_numpy()[pg],
+        "median": group_budget["median"].to_numpy()[pg],
+    })
+
+    # === SEGMENTED AGGREGATION (Category + Job Type + Experience) ===
+    agg = pairs.groupby("key").agg(
+        Jobs_Count=("avg", "size"),
+        Avg_Budget=("avg", "mean"),
+        Median_Budget=("median", "median"),
+        Min_Budget=("avg", "min"),
+        Max_Budget=("avg", "max"),
+    )
+    pair_seg, rest = np.divmod(agg.index.to_numpy(), n_skills * n_skills)
+    a, b = np.divmod(rest, n_skills)
+
+    # === SEGMENTED SUPPORTS & METRICS (all inside same segment) ===
+    # 1) jobs per (segment, skill) and 3) jobs per segment
+    support = pd.Series(np.ones(len(js_group), dtype=np.int64)).groupby(
+        group_seg[js_group] * n_skills + js_skill
+    ).sum()
+    seg_total = np.bincount(group_seg, minlength=max(int(np.prod(dims)), 1))
+
+    support_a = support.reindex(pair_seg * n_skills + a).to_numpy()
+    support_b = support.reindex(pair_seg * n_skills + b).to_numpy()
+    support_ab = agg["Jobs_Count"].to_numpy()
+    totals = seg_total[pair_seg]
+
+    # same row order as grouping on the strings: segment values, then skills
+    seg_codes = np.unravel_index(pair_seg, dims) if len(pair_seg) else [np.zeros(0, dtype=np.int64)] * len(seg_cols)
+    order = np.lexsort(
+        [skill_ranks[b], skill_ranks[a]]
+        + [dictionaries.ranks(c)[seg_codes[i]] for i, c in reversed(list(enumerate(seg_cols)))]
+    )
+
+    out = pd.DataFrame({
+        c: pd.Categorical.from_codes(seg_codes[i][order], categories=dictionaries.categories(c))
+        for i, c in enumerate(seg_cols)
+    })
+    skill_categories = dictionaries.categories("Skill")
+    out["Skill A"] = pd.Categorical.from_codes(a[order], categories=skill_categories)
+    out["Skill B"] = pd.Categorical.from_codes(b[order], categories=skill_categories)
+    for col in ["Jobs_Count", "Avg_Budget", "Median_Budget", "Min_Budget", "Max_Budget"]:
+        out[col] = agg[col].to_numpy()[order]
+    out["Support A"] = support_a[order]
+    out["Support B"] = support_b[order]
+
+    # 2) Support AB inside the segment
+    out["Support AB"] = support_ab[order]
+    totals = totals[order]
+
+    # 4) Confidence, Lift, Jaccard (all segmented, consistent)
+    out["Confidence A→B"] = out["Support AB"] / out["Support A"]
+    out["Confidence B→A"] = out["Support AB"] / out["Support B"]
+
+    out["Lift"] = (
+        out["Support AB"] * totals
+        / (out["Support A"] * out["Support B"])
+    )
+
+    out["Jaccard"] = out["Support AB"] / (
+        out["Support A"] + out["Support B"] - out["Support AB"]
+    )
+
+    # 5) P-values, q-values and Lift interval, against the segment's jobs
+    if P_VALUE_METHOD:
+        out = add_significance(out, totals, P_VALUE_METHOD, FDR, LIFT_CI_LEVEL)
+
+    return out.sort_values("Jobs_Count", ascending=False)
+
+
+def main():
+    dictionaries = load_dictionaries()
+    df = load_skills(dictionaries=dictionaries)
+    if CLUSTERS_FILE:
+        keep = load_cluster_representatives(CLUSTERS_FILE)
+        df = df[df["Job ID"].astype(str).isin(keep)]
+    agg = build_segment_pairs(df, dictionaries)
+    if P_VALUE_METHOD and MAX_Q_VALUE is not None:
+        agg = significant(agg, MAX_Q_VALUE)
+
+    # === Save output ===
+    agg.to_csv(OUTPUT_FILE, index=False)
+
+    print(f"✅ Saved {len(agg)} segmented skill pairs to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import random
+import statistics
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+import cooccurance
+import global_cooccurance
+from cooccurance import build_segment_pairs
+from global_cooccurance import build_global_pairs
+
+# Differential check: run the production co-occurrence engines and a slow,
+# literal brute force reference on small random datasets and compare every
+# metric column. Run this before adopting any faster engine.
+
+N_DATASETS = 50
+SEED = 1234
+
+CATEGORIES = ["QA Testing", "Web Development", "Data Science"]
+JOB_TYPES = ["Hourly", "Fixed"]
+LEVELS = ["Entry Level", "Intermediate", "Expert"]
+SKILLS = ["Python", "SQL", "Selenium", "React", "AWS", "Docker", "Figma", "Jira"]
+
+SEG_KEYS = ["Category", "Job Type", "Experience Level", "Skill A", "Skill B"]
+SEG_METRICS = [
+    "Jobs_Count", "Avg_Budget", "Median_Budget", "Min_Budget", "Max_Budget",
+    "Support A", "Support B", "Support AB",
+    "Confidence A→B", "Confidence B→A", "Lift", "Jaccard",
+]
+
+GLOBAL_KEYS = ["Skill A", "Skill B"]
+GLOBAL_METRICS = [
+    "Support AB", "Support A", "Support B",
+    "Confidence A→B", "Confidence B→A", "Lift", "Jaccard",
+    "Hourly_Jobs", "Fixed_Jobs",
+    "Hourly_Avg", "Hourly_Median", "Fixed_Avg", "Fixed_Median",
+]
+
+
+def significance_metrics(module):
+    """Significance columns the engine of module adds with its settings."""
+    if not module.P_VALUE_METHOD:
+        return []
+    return ["P Value"] + (["Q Value"] if module.FDR else []) + ["Lift Low", "Lift High"]
+
+
+# --------------------------------------------------
+# Random datasets with the edge cases we care about
+# --------------------------------------------------
+def random_dataset(rng):
+    """
+    SkillsExploded-like rows with duplicate Job IDs across segments,
+    single-skill jobs, missing budgets, hourly+fixed mixes, repeated
+    skills and the odd missing segment value.
+    """
+    rows = []
+    n_jobs = rng.randint(3, 25)
+    for j in range(n_jobs):
+        job_id = f"J{j:03d}"
+        n_records = 1 if rng.random() < 0.7 else rng.randint(2, 3)
+        for _ in range(n_records):
+            category = rng.choice(CATEGORIES)
+            job_type = rng.choice(JOB_TYPES)
+            level = rng.choice(LEVELS) if rng.random() > 0.05 else None
+            if rng.random() < 0.2:
+                budget = None
+            else:
+                budget = float(rng.choice([5, 15, 25, 40, 100, 500, 1500]))
+            n_skills = 1 if rng.random() < 0.25 else rng.randint(2, 5)
+            skills = rng.sample(SKILLS, n_skills)
+            if rng.random() < 0.1:
+                skills.append(skills[0])
+            for skill in skills:
+                rows.append({
+                    "Category": category,
+                    "Job ID": job_id,
+                    "Sub ID": "~" + job_id,
+                    "Budget Avg": budget,
+                    "Country Normalized": "United States",
+                    "Absolute Date": "2025-10-01T00:00:00.000Z",
+                    "Job Type": job_type,
+                    "Experience Level": level,
+                    "Skill": skill,
+                })
+    return pd.DataFrame(rows)
+
+
+def _mean(values):
+    return statistics.fmean(values) if values else float("nan")
+
+
+def _median(values):
+    return statistics.median(values) if values else float("nan")
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+# --------------------------------------------------
+# Brute force references, straight from the definitions
+# --------------------------------------------------
+def reference_significance(out, totals, method, fdr, level):
+    """P-values per 2x2 table, Benjamini-Hochberg by hand and the Poisson Lift interval."""
+    if not method:
+        return out
+    for r, total in zip(out, totals):
+        sab, sa, sb = r["Support AB"], r["Support A"], r["Support B"]
+        table = [[sab, sa - sab], [sb - sab, total - sa - sb + sab]]
+        if method == "fisher":
+            r["P Value"] = stats.fisher_exact(table, alternative="greater")[1]
+        else:
+            try:
+                p = stats.chi2_contingency(table, correction=False)[1]
+            except ValueError:
+                # a skill present in every job: expected count of zero
+                p = None
+            # one sided like fisher: half the two sided p when seen together
+            # more often than expected
+            if p is None:
+                r["P Value"] = 1.0
+            elif sab * total > sa * sb:
+                r["P Value"] = p / 2
+            else:
+                r["P Value"] = 1 - p / 2
+        alpha = 1 - level
+        scale = total / (sa * sb)
+        r["Lift Low"] = stats.gamma.ppf(alpha / 2, sab) * scale
+        r["Lift High"] = stats.gamma.ppf(1 - alpha / 2, sab + 1) * scale
+
+    if fdr:
+        m = len(out)
+        ranked = sorted(out, key=lambda r: r["P Value"])
+        q = 1.0
+        for i in range(m, 0, -1):
+            q = min(q, ranked[i - 1]["P Value"] * m / i)
+            ranked[i - 1]["Q Value"] = q
+    return out
+
+
+def reference_segment_pairs(df):
+    records = [
+        r for r in df.to_dict("records")
+        if not _is_missing(r["Job ID"]) and not _is_missing(r["Skill"])
+    ]
+
+    # one job per (Job ID, segment), rows with a missing segment value are dropped
+    jobs = {}
+    for r in records:
+        key = (r["Job ID"], r["Category"], r["Job Type"], r["Experience Level"])
+        if any(_is_missing(k) for k in key):
+            continue
+        job = jobs.setdefault(key, {"skills": set(), "budgets": []})
+        job["skills"].add(str(r["Skill"]).strip())
+        if not _is_missing(r["Budget Avg"]):
+            job["budgets"].append(float(r["Budget Avg"]))
+
+    out, totals = [], []
+    segments = {k[1:] for k in jobs}
+    for seg in segments:
+        seg_jobs = {k: v for k, v in jobs.items() if k[1:] == seg}
+        total = len({k[0] for k in seg_jobs})
+        skills = sorted(set().union(*(v["skills"] for v in seg_jobs.values())))
+        for a, b in combinations(skills, 2):
+            with_a = {k[0] for k, v in seg_jobs.items() if a in v["skills"]}
+            with_b = {k[0] for k, v in seg_jobs.items() if b in v["skills"]}
+            both = [v for v in seg_jobs.values() if a in v["skills"] and b in v["skills"]]
+            if not both:
+                continue
+            avgs = [_mean(v["budgets"]) for v in both if v["budgets"]]
+            medians = [_median(v["budgets"]) for v in both if v["budgets"]]
+            sa, sb, sab = len(with_a), len(with_b), len(both)
+            out.append({
+                "Category": seg[0], "Job Type": seg[1], "Experience Level": seg[2],
+                "Skill A": a, "Skill B": b,
+                "Jobs_Count": sab,
+                "Avg_Budget": _mean(avgs),
+                "Median_Budget": _median(medians),
+                "Min_Budget": min(avgs) if avgs else float("nan"),
+                "Max_Budget": max(avgs) if avgs else float("nan"),
+                "Support A": sa, "Support B": sb, "Support AB": sab,
+                "Confidence A→B": sab / sa,
+                "Confidence B→A": sab / sb,
+                "Lift": sab * total / (sa * sb),
+                "Jaccard": sab / (sa + sb - sab),
+            })
+            totals.append(total)
+    out = reference_significance(
+        out, totals, cooccurance.P_VALUE_METHOD, cooccurance.FDR, cooccurance.LIFT_CI_LEVEL
+    )
+    return pd.DataFrame(out)
+
+
+def reference_global_pairs(df):
+    records = [
+        r for r in df.to_dict("records")
+        if not _is_missing(r["Job ID"]) and not _is_missing(r["Skill"])
+    ]
+
+    jobs = {}
+    for r in records:
+        job = jobs.setdefault(str(r["Job ID"]), {"skills": set(), "hourly": [], "fixed": [], "types": set()})
+        job["skills"].add(r["Skill"])
+        job_type = "" if _is_missing(r["Job Type"]) else r["Job Type"].lower()
+        job["types"].add(job_type)
+        if job_type in ("hourly", "fixed") and not _is_missing(r["Budget Avg"]):
+            job[job_type].append(float(r["Budget Avg"]))
+
+    total = len(jobs)
+    skills = sorted(set().union(*(v["skills"] for v in jobs.values())))
+    out = []
+    for a, b in combinations(skills, 2):
+        with_a = [v for v in jobs.values() if a in v["skills"]]
+        with_b = [v for v in jobs.values() if b in v["skills"]]
+        both = [v for v in with_a if b in v["skills"]]
+        if not both:
+            continue
+        sa, sb, sab = len(with_a), len(with_b), len(both)
+        out.append({
+            "Skill A": a, "Skill B": b,
+            "Support AB": sab, "Support A": sa, "Support B": sb,
+            "Confidence A→B": sab / sa,
+            "Confidence B→A": sab / sb,
+            "Lift": sab * total / (sa * sb),
+            "Jaccard": sab / (sa + sb - sab),
+            "Hourly_Jobs": sum(1 for v in both if "hourly" in v["types"]),
+            "Fixed_Jobs": sum(1 for v in both if "fixed" in v["types"]),
+            "Hourly_Avg": _mean([_mean(v["hourly"]) for v in both if v["hourly"]]),
+            "Hourly_Median": _median([_median(v["hourly"]) for v in both if v["hourly"]]),
+            "Fixed_Avg": _mean([_mean(v["fixed"]) for v in both if v["fixed"]]),
+            "Fixed_Median": _median([_median(v["fixed"]) for v in both if v["fixed"]]),
+        })
+    out = reference_significance(
+        out, [total] * len(out), global_cooccurance.P_VALUE_METHOD,
+        global_cooccurance.FDR, global_cooccurance.LIFT_CI_LEVEL,
+    )
+    return pd.DataFrame(out)
+
+
+# --------------------------------------------------
+# Comparison
+# --------------------------------------------------
+def compare(name, produced, expected, keys, metrics):
+    """Return a list of mismatch messages (empty when both tables agree)."""
+    problems = []
+    merged = produced[keys + metrics].merge(
+        expected[keys + metrics], on=keys, how="outer",
+        suffixes=(" prod", " ref"), indicator=True,
+    )
+    only = merged[merged["_merge"] != "both"]
+    if len(only):
+        problems.append(f"{name}: {len(only)} pairs present in only one table")
+    merged = merged[merged["_merge"] == "both"]
+
+    for col in metrics:
+        a = merged[col + " prod"].astype(float).to_numpy()
+        b = merged[col + " ref"].astype(float).to_numpy()
+        bad = ~np.isclose(a, b, rtol=1e-9, atol=1e-12, equal_nan=True)
+        if bad.any():
+            first = merged[bad].iloc[0]
+            problems.append(
+                f"{name}: {col} differs on {int(bad.sum())} pairs, e.g. "
+                f"{tuple(first[k] for k in keys)}: {first[col + ' prod']} != {first[col + ' ref']}"
+            )
+    return problems
+
+
+def main():
+    rng = random.Random(SEED)
+    failures = []
+
+    for i in range(N_DATASETS):
+        df = random_dataset(rng)
+        problems = compare(
+            "segmented",
+            build_segment_pairs(df.copy()), reference_segment_pairs(df),
+            SEG_KEYS, SEG_METRICS + significance_metrics(cooccurance),
+        )
+        problems += compare(
+            "global",
+            build_global_pairs(df.copy()), reference_global_pairs(df),
+            GLOBAL_KEYS, GLOBAL_METRICS + significance_metrics(global_cooccurance),
+        )
+        for p in problems:
+            failures.append(f"dataset {i}: {p}")
+
+    print(f"Checked {N_DATASETS} random datasets against the brute force reference.")
+    print(f"Mismatches found: {len(failures)}")
+    for f in failures[:10]:
+        print(f)
+
+    assert not failures, "co-occurrence engines disagree with the reference"
+
+
+if __name__ == "__main__":
+    main()
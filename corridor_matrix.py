@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from country_index import INDEX_FILE, CountryIndex
+
+CORRIDOR_FILE = "AllowedCorridors.npz"
+
+# Allowed country column of the jobs without a country list
+ANYWHERE = "Anywhere"
+
+# Axes of every array, in order
+AXES = ["client", "allowed", "job_type", "experience"]
+LABEL_COLS = {
+    "client": "Country Normalized",
+    "allowed": "Allowed Applicant Country",
+    "job_type": "Job Type",
+    "experience": "Experience Level",
+}
+
+
+class CorridorMatrix:
+    """
+    Hiring corridors: client country x allowed applicant country x Job Type
+    x Experience Level arrays of job counts and Budget Avg sum / count /
+    min / max. A job counts once in every allowed country it lists (or in
+    ANYWHERE), so slices are array sums rather than regroupings.
+    """
+
+    def __init__(self, labels, jobs, budget_sum, budget_count, budget_min, budget_max):
+        self.labels = {axis: list(labels[axis]) for axis in AXES}
+        self.positions = {axis: {v: i for i, v in enumerate(vs)} for axis, vs in self.labels.items()}
+        self.jobs = jobs
+        self.budget_sum = budget_sum
+        self.budget_count = budget_count
+        self.budget_min = budget_min
+        self.budget_max = budget_max
+
+    @classmethod
+    def from_index(cls, index: CountryIndex):
+        labels, codes = {}, {}
+        for axis in ["client", "job_type", "experience"]:
+            codes[axis], uniques = pd.factorize(index.jobs[LABEL_COLS[axis]].fillna(""), sort=True)
+            labels[axis] = uniques.tolist()
+        labels["allowed"] = index.countries + [ANYWHERE]
+
+        # (job, allowed country) pairs, unrestricted jobs pair with ANYWHERE
+        bits = np.column_stack([index.bit_matrix(), index.unrestricted])
+        job, allowed = np.nonzero(bits)
+
+        shape = tuple(len(labels[axis]) for axis in AXES)
+        cell = np.ravel_multi_index(
+            (codes["client"][job], allowed, codes["job_type"][job], codes["experience"][job]), shape
+        )
+        size = int(np.prod(shape))
+        budget = index.budget[job]
+        priced = ~np.isnan(budget)
+
+        jobs = np.bincount(cell, minlength=size)
+        budget_sum = np.bincount(cell[priced], weights=budget[priced], minlength=size)
+        budget_count = np.bincount(cell[priced], minlength=size)
+        budget_min = np.full(size, np.inf)
+        budget_max = np.full(size, -np.inf)
+        np.minimum.at(budget_min, cell[priced], budget[priced])
+        np.maximum.at(budget_max, cell[priced], budget[priced])
+        return cls(
+            labels,
+            *(a.reshape(shape) for a in (jobs, budget_sum, budget_count, budget_min, budget_max)),
+        )
+
+    # --------------- persistence ---------------
+
+    def save(self, path=CORRIDOR_FILE):
+        np.savez(
+            path,
+            jobs=self.jobs, budget_sum=self.budget_sum, budget_count=self.budget_count,
+            budget_min=self.budget_min, budget_max=self.budget_max,
+            **{f"labels_{axis}": np.asarray(self.labels[axis], dtype=str) for axis in AXES},
+        )
+
+    @classmethod
+    def load(cls, path=CORRIDOR_FILE):
+        with np.load(path) as data:
+            labels = {axis: data[f"labels_{axis}"].tolist() for axis in AXES}
+            return cls(
+                labels, data["jobs"], data["budget_sum"], data["budget_count"],
+                data["budget_min"], data["budget_max"],
+            )
+
+    # --------------- slices ---------------
+
+    def _index(self, selection):
+        """Index tuple of the selected labels on every axis (all when None)."""
+        idx = []
+        for axis in AXES:
+            values = selection.get(axis)
+            if values is None:
+                idx.append(np.arange(len(self.labels[axis])))
+                continue
+            if isinstance(values, str):
+                values = [values]
+            pos = self.positions[axis]
+            idx.append(np.array([pos[v] for v in values if v in pos], dtype=np.int64))
+        return np.ix_(*idx)
+
+    def stats(self, by=("client", "allowed"), **selection):
+        """
+        Jobs and budget stats of the selected cells (axis=label or list of
+        labels, e.g. allowed="Ukraine", job_type="Hourly"), summed over the
+        axes not in by. One row per non empty group, columns in AXES order.
+        Summing over allowed counts a job once per country it lists.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        ix = self._index(selection)
+        other = tuple(i for i, axis in enumerate(AXES) if axis not in by)
+        kept = [(i, axis) for i, axis in enumerate(AXES) if axis in by]
+        # a single total row when by is empty
+        shape = tuple(ix[i].size for i, _ in kept) or (1,)
+
+        jobs = self.jobs[ix].sum(axis=other).reshape(shape)
+        budget_sum = self.budget_sum[ix].sum(axis=other).reshape(shape)
+        budget_count = self.budget_count[ix].sum(axis=other).reshape(shape)
+        budget_min = self.budget_min[ix].min(axis=other, initial=np.inf).reshape(shape)
+        budget_max = self.budget_max[ix].max(axis=other, initial=-np.inf).reshape(shape)
+
+        # non empty groups; cells holds one position array per kept axis
+        cells = np.nonzero(jobs)
+        table = pd.DataFrame({
+            LABEL_COLS[axis]: np.asarray(self.labels[axis])[ix[i].ravel()][c]
+            for (i, axis), c in zip(kept, cells)
+        })
+        table["Jobs"] = jobs[cells]
+        table["Budget Jobs"] = budget_count[cells]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            table["Avg Budget"] = budget_sum[cells] / budget_count[cells]
+        table["Min Budget"] = np.where(np.isinf(budget_min[cells]), np.nan, budget_min[cells])
+        table["Max Budget"] = np.where(np.isinf(budget_max[cells]), np.nan, budget_max[cells])
+        return table.sort_values("Jobs", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main():
+    print(f"[INFO] Loading {INDEX_FILE}...")
+    matrix = CorridorMatrix.from_index(CountryIndex.load(INDEX_FILE))
+    matrix.save(CORRIDOR_FILE)
+    print(f"[INFO] Saved {CORRIDOR_FILE} ({' x '.join(str(len(matrix.labels[a])) for a in AXES)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from country_map import country_map, normalize_country
+
+INDEX_FILE = "AllowedCountries.npz"
+SKILLS_FILE = "SkillsExploded.csv"
+
+# Per job columns kept next to the masks for segment filters
+SEGMENT_COLS = ["Categories", "Job Type", "Experience Level", "Country Normalized"]
+WORD_BITS = 64
+
+
+class CountryIndex:
+    """
+    Allowed applicant countries of every job as a fixed width bitmask:
+    masks[i] holds one bit per country (countries[b] is bit b % 64 of word
+    b // 64). Jobs without a country list accept applicants from anywhere
+    and are flagged in unrestricted instead.
+
+    Every filter returns a boolean array over jobs, so filters combine
+    with & and | and feed count() as where=.
+    """
+
+    def __init__(self, job_ids, masks, unrestricted, countries, jobs=None, budget=None):
+        self.job_ids = np.asarray(job_ids, dtype=str)
+        self.masks = np.asarray(masks, dtype=np.uint64)
+        self.unrestricted = np.asarray(unrestricted, dtype=bool)
+        self.countries = list(countries)
+        self.bits = {c: b for b, c in enumerate(self.countries)}
+        self.bits_lower = {c.lower(): b for b, c in enumerate(self.countries)}
+        self.jobs = jobs if jobs is not None else pd.DataFrame(index=range(len(self.job_ids)))
+        self.budget = (
+            np.asarray(budget, dtype=np.float64) if budget is not None
+            else np.full(len(self.job_ids), np.nan)
+        )
+        # skill -> job rows, indexed on the first has_skills() call
+        self.skill_rows = None
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    @classmethod
+    def from_jobs(cls, rows, countries=None):
+        """
+        Build from (job_id, allowed countries, budget avg, segment values...)
+        rows, segment values in SEGMENT_COLS order. Rows of the same job
+        (one per category it is listed under) are merged.
+        """
+        rows = list(rows)
+        ids = [r[0] for r in rows]
+        job_ids = list(dict.fromkeys(ids))
+        pos = {j: i for i, j in enumerate(job_ids)}
+        row_job = np.fromiter((pos[j] for j in ids), dtype=np.int64, count=len(ids))
+
+        allowed = [[normalize_country(c) for c in r[1] if c.strip()] for r in rows]
+        # every country_map country has a bit, so masks of separate builds line up
+        universe = sorted(set(country_map.values())) if countries is None else list(countries)
+        known = set(universe)
+        universe += sorted({c for a in allowed for c in a} - known)
+        bits = {c: b for b, c in enumerate(universe)}
+
+        n_words = max((len(universe) + WORD_BITS - 1) // WORD_BITS, 1)
+        masks = np.zeros((len(job_ids), n_words), dtype=np.uint64)
+        pair_job = np.repeat(row_job, [len(a) for a in allowed])
+        pair_bit = np.fromiter((bits[c] for a in allowed for c in a), dtype=np.int64, count=len(pair_job))
+        np.bitwise_or.at(
+            masks, (pair_job, pair_bit // WORD_BITS),
+            np.left_shift(np.uint64(1), (pair_bit % WORD_BITS).astype(np.uint64)),
+        )
+        unrestricted = ~masks.any(axis=1)
+
+        frame = pd.DataFrame(
+            [r[3:] for r in rows], columns=["Categories"] + SEGMENT_COLS[1:]
+        ).assign(_job=row_job)
+        jobs = frame.groupby("_job", sort=True).agg({
+            "Categories": lambda s: ", ".join(dict.fromkeys(v for v in s if v)),
+            **{c: "first" for c in SEGMENT_COLS[1:]},
+        })
+        budget = pd.Series(pd.to_numeric([r[2] for r in rows], errors="coerce"))
+        budget = budget.groupby(row_job).first().reindex(range(len(job_ids))).to_numpy()
+        return cls(job_ids, masks, unrestricted, universe, jobs.reset_index(drop=True), budget)
+
+    # --------------- persistence ---------------
+
+    def save(self, path=INDEX_FILE):
+        np.savez(
+            path,
+            job_ids=self.job_ids, masks=self.masks, unrestricted=self.unrestricted,
+            countries=np.asarray(self.countries, dtype=str), budget=self.budget,
+            **{c: self.jobs[c].fillna("").to_numpy(dtype=str) for c in SEGMENT_COLS if c in self.jobs},
+        )
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with np.load(path) as data:
+            jobs = pd.DataFrame({c: data[c] for c in SEGMENT_COLS if c in data.files})
+            return cls(
+                data["job_ids"], data["masks"], data["unrestricted"],
+                data["countries"].tolist(), jobs, data["budget"],
+            )
+
+    # --------------- queries ---------------
+
+    def query_mask(self, countries):
+        """
+        Bitmask (one uint64 per word) of a country set. Names go through
+        country_map, then match case insensitively; unknown ones have no bit.
+        """
+        if isinstance(countries, str):
+            countries = [countries]
+        q = np.zeros(self.masks.shape[1], dtype=np.uint64)
+        for c in countries:
+            c = normalize_country(c)
+            b = self.bits.get(c, self.bits_lower.get(c.lower()))
+            if b is not None:
+                q[b // WORD_BITS] |= np.uint64(1) << np.uint64(b % WORD_BITS)
+        return q
+
+    def open_to(self, countries, require_all=False, include_unrestricted=True):
+        """
+        Jobs applicants from countries can apply to: from any of them, or
+        with require_all, from every one of them.
+        """
+        q = self.query_mask(countries)
+        hit = self.masks & q
+        if require_all:
+            listed = (hit == q).all(axis=1) & q.any()
+        else:
+            listed = hit.any(axis=1)
+        return listed | self.unrestricted if include_unrestricted else listed
+
+    def count(self, countries=None, where=None, **kwargs):
+        """Jobs open to countries (every job when None) among where."""
+        sel = self.open_to(countries, **kwargs) if countries is not None else np.ones(len(self), dtype=bool)
+        if where is not None:
+            sel = sel & where
+        return int(sel.sum())
+
+    def bit_matrix(self, where=None):
+        """Jobs x countries 0/1 uint8 matrix of the listed countries, among where."""
+        masks = self.masks if where is None else self.masks[where]
+        bits = np.unpackbits(masks.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+        return bits[:, :len(self.countries)]
+
+    def allowed(self, i):
+        """Countries listed by job i (empty when unrestricted)."""
+        return [self.countries[b] for b in np.flatnonzero(self.bit_matrix([i])[0])]
+
+    def country_counts(self, where=None):
+        """Restricted jobs listing each country, among where."""
+        counts = self.bit_matrix(where).sum(axis=0)
+        return pd.Series(counts, index=self.countries, name="Jobs").sort_values(ascending=False)
+
+    # --------------- filters ---------------
+
+    def segment(self, column, values):
+        """Jobs whose column (one of SEGMENT_COLS) is one of values."""
+        if isinstance(values, str):
+            values = [values]
+        if column == "Categories":
+            # jobs listed under several categories match any of them
+            cats = self.jobs[column].fillna("").str.split(", ").explode()
+            return cats.isin(values).groupby(level=0).any().to_numpy()
+        return self.jobs[column].isin(values).to_numpy()
+
+    def budget_between(self, low=None, high=None):
+        sel = ~np.isnan(self.budget)
+        if low is not None:
+            sel &= self.budget >= low
+        if high is not None:
+            sel &= self.budget <= high
+        return sel
+
+    def has_jobs(self, job_ids):
+        """Jobs whose ID is in job_ids."""
+        return np.isin(self.job_ids, np.asarray(list(job_ids), dtype=str))
+
+    def index_skills(self, skills_df=None):
+        """
+        Index the jobs of every skill from skills_df (Job ID, Skill rows,
+        SKILLS_FILE when None), so has_skills() never scans the table.
+        """
+        if skills_df is None:
+            skills_df = pd.read_csv(SKILLS_FILE, dtype={"Job ID": str}, usecols=["Job ID", "Skill"])
+        rows = pd.Series(np.arange(len(self)), index=self.job_ids)
+        found = skills_df["Job ID"].astype(str).map(rows)
+        keep = found.notna().to_numpy()
+        codes, skills = pd.factorize(skills_df["Skill"].to_numpy()[keep])
+        order = np.argsort(codes, kind="stable")
+        job_rows = found.to_numpy()[keep][order].astype(np.int64)
+        ptr = np.searchsorted(codes[order], np.arange(len(skills) + 1))
+        self.skill_rows = {s: job_rows[ptr[i]:ptr[i + 1]] for i, s in enumerate(skills)}
+
+    def has_skills(self, skills, skills_df=None):
+        """
+        Jobs tagged with any of skills in SkillsExploded. The skills are
+        indexed once, from skills_df when given, else from SKILLS_FILE.
+        """
+        if isinstance(skills, str):
+            skills = [skills]
+        if skills_df is not None or self.skill_rows is None:
+            self.index_skills(skills_df)
+        sel = np.zeros(len(self), dtype=bool)
+        for skill in skills:
+            sel[self.skill_rows.get(skill, [])] = True
+        return sel
@@ -250,3 +250,11 @@ country_map = {
     "ZWE": "Zimbabwe", "ZW": "Zimbabwe"
 }
 
+
+
+def normalize_country(raw):
+    """Normalize country using country_map."""
+    if not raw:
+        return ""
+    key = raw.strip().upper()
+    return country_map.get(key, raw.strip())
@@ -0,0 +1,187 @@
+import csv
+import glob
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+# Epoch milliseconds (UTC) of Absolute Date, written next to it at ingestion
+TIMESTAMP_COL = "Timestamp"
+DATE_COL = "Absolute Date"
+
+# Month partitions of X.csv go to X_by_month/YYYY-MM.csv
+PARTITION_SUFFIX = "_by_month"
+# Partition of the rows without a parseable date
+UNDATED = "undated"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_timestamp(value):
+    """Epoch milliseconds of an ISO date string, None when it does not parse."""
+    if not value:
+        return None
+    s = str(value).strip()
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(milliseconds=1)
+
+
+def to_timestamp(value):
+    """
+    Epoch milliseconds of a range bound: epoch ms as a number, a datetime
+    or anything pd.Timestamp parses ("2025-10-01"). None stays None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int((ts - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1))
+
+
+def days_ago(days, now=None):
+    """Range start of the last `days` days, e.g. START_DATE = days_ago(30)."""
+    now = now or datetime.now(timezone.utc)
+    return to_timestamp(now - timedelta(days=days))
+
+
+def month_of(ts):
+    """YYYY-MM partition of an epoch ms timestamp (UNDATED for None)."""
+    if ts is None or ts == "" or (isinstance(ts, float) and np.isnan(ts)):
+        return UNDATED
+    return (EPOCH + timedelta(milliseconds=int(ts))).strftime("%Y-%m")
+
+
+def partition_dir(path):
+    return os.path.splitext(path)[0] + PARTITION_SUFFIX
+
+
+def write_month_partitions(path, header, rows):
+    """
+    Write rows (csv lists holding TIMESTAMP_COL) to one CSV per month under
+    partition_dir(path), replacing earlier partitions. Returns rows per month.
+    """
+    ts_idx = header.index(TIMESTAMP_COL)
+    months = {}
+    for r in rows:
+        months.setdefault(month_of(r[ts_idx]), []).append(r)
+
+    out_dir = partition_dir(path)
+    os.makedirs(out_dir, exist_ok=True)
+    for old in glob.glob(os.path.join(out_dir, "*.csv")):
+        os.remove(old)
+    for month, month_rows in sorted(months.items()):
+        with open(os.path.join(out_dir, f"{month}.csv"), "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(month_rows)
+    return {m: len(r) for m, r in sorted(months.items())}
+
+
+def remove_month_partitions(path):
+    """Delete the month partitions of path, so readers fall back to path itself."""
+    out_dir = partition_dir(path)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+
+
+def current_partitions(path):
+    """
+    Month partitions of path, or None when there are none or they are older
+    than path (path rewritten since, e.g. with partitioning turned off).
+    """
+    parts = sorted(glob.glob(os.path.join(partition_dir(path), "*.csv")))
+    if not parts:
+        return None
+    if os.path.exists(path) and min(os.path.getmtime(p) for p in parts) < os.path.getmtime(path):
+        return None
+    return parts
+
+
+def files_in_range(path, start=None, end=None):
+    """
+    Files to read for [start, end): the month partitions overlapping the
+    range when path has current partitions, else path itself. Unbounded
+    reads always take path.
+    """
+    if start is None and end is None:
+        return [path]
+    start, end = to_timestamp(start), to_timestamp(end)
+    parts = current_partitions(path)
+    if parts is None:
+        return [path]
+
+    first = month_of(start) if start is not None else None
+    last = month_of(end - 1) if end is not None else None
+    keep = []
+    for p in parts:
+        month = os.path.splitext(os.path.basename(p))[0]
+        if month == UNDATED:
+            continue
+        if (first is None or month >= first) and (last is None or month <= last):
+            keep.append(p)
+    return keep
+
+
+def timestamps(df):
+    """TIMESTAMP_COL of df, parsed from DATE_COL for files written before it existed."""
+    if TIMESTAMP_COL in df.columns:
+        return pd.to_numeric(df[TIMESTAMP_COL], errors="coerce")
+    dates = pd.to_datetime(df[DATE_COL], utc=True, errors="coerce", format="ISO8601")
+    return (dates - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(milliseconds=1)
+
+
+def iter_time_range(path, start=None, end=None, chunksize=None, **kwargs):
+    """
+    Frames of the rows of path dated in [start, end), read from the month
+    partitions when there are any: one per file, or per chunk of chunksize
+    rows. Bounds go through to_timestamp; None leaves that side open.
+    kwargs go to pd.read_csv.
+    """
+    start, end = to_timestamp(start), to_timestamp(end)
+    bounded = start is not None or end is not None
+
+    usecols = kwargs.pop("usecols", None)
+    if bounded and usecols is not None:
+        # the date columns are read for the filter and dropped after it
+        requested = set(usecols)
+        wanted = requested | {TIMESTAMP_COL, DATE_COL}
+        kwargs["usecols"] = lambda c: c in wanted
+    elif usecols is not None:
+        kwargs["usecols"] = usecols
+
+    for file in files_in_range(path, start, end):
+        frames = pd.read_csv(file, chunksize=chunksize, **kwargs) if chunksize else [pd.read_csv(file, **kwargs)]
+        for df in frames:
+            if bounded:
+                ts = timestamps(df)
+                keep = ts.notna()
+                if start is not None:
+                    keep &= ts >= start
+                if end is not None:
+                    keep &= ts < end
+                df = df[keep.to_numpy()].reset_index(drop=True)
+                if usecols is not None:
+                    df = df[[c for c in df.columns if c in requested]]
+            yield df
+
+
+def read_time_range(path, start=None, end=None, **kwargs):
+    """All rows of path dated in [start, end) as one frame (see iter_time_range)."""
+    frames = list(iter_time_range(path, start, end, **kwargs))
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    if not frames:
+        # no partition in range: an empty frame with the file's columns
+        return pd.read_csv(path, nrows=0, **kwargs) if os.path.exists(path) else pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -1,67 +1,431 @@
 # Description Analysis Script for CleanData.csv
 
-import pandas as pd
-import string
-from collections import Counter
-from nltk.corpus import stopwords
-from nltk.util import ngrams
-import nltk
+import os
+from functools import partial
 
-# Download stopwords if not already
-nltk.download('stopwords')
+import numpy as np
 
-print("=== Starting Job Description Analysis ===")
+from content_cache import CACHE_FILE, content_key, open_cache
+from date_partitions import iter_time_range, read_time_range
+from description_tokenizer import map_chunks, tokenize_chunk
+from keyword_engine import KeywordEngine, decode_feature
+from near_duplicates import NearDuplicateIndex, cluster_descriptions, representatives
+from ngram_stats import NgramStats
+from tech_matcher import TECH_TERMS, get_matcher, load_skill_terms, normalize_term
+from token_store import TOKEN_STORE_DIR, TokenStoreWriter, Vocabulary, take_rows
 
-# === 1. Load data ===
 input_file = 'CleanData.csv'
 output_file = 'DescriptionsAnalysed.csv'
+# Encoded tokens (CSR int32 ids + vocabulary) are written here
+token_store_dir = TOKEN_STORE_DIR
+
+# Worker processes for tokenization and term matching (None = one per core)
+N_WORKERS = None
+
+# Keyword scoring: "tfidf" (corpus level) or "count" (raw per-job counts)
+KEYWORD_MODE = "tfidf"
+# Column whose values get their own IDF table, e.g. "Category" (None = whole corpus)
+TFIDF_GROUP_BY = None
+TOP_N = 5
+
+# Tech dictionary behind TechnicalScore
+TECH_DICTIONARY = TECH_TERMS
+# Scraped skill vocabulary used to derive skills from the text (None = off)
+SKILL_TERMS_FILE = 'SkillsExploded.csv'
+SKILL_TERMS_MIN_JOBS = 3
+# Jobs with fewer tags than this get DerivedSkills from their description
+DERIVE_SKILLS_BELOW = 3
+
+# Near-duplicate reposts (MinHash similarity >= threshold) are analysed once
+# and share the results of their cluster's representative, e.g. 0.9
+# (None = off). Shared results can differ slightly from analysing each job.
+NEAR_DUPLICATE_THRESHOLD = None
+
+# Per-description analysis cache keyed by a hash of the text (None = off).
+# Bump ANALYSIS_VERSION whenever tokenization changes.
+ANALYSIS_CACHE_FILE = CACHE_FILE
+ANALYSIS_CACHE_MAX_MB = 1024
+ANALYSIS_VERSION = "1"
+
+# Jobs per n-gram (up to trigrams), corpus wide and per Category x
+# Experience Level, counted while tokenizing (None = off)
+NGRAM_STATS_FILE = 'NgramStats.csv'
+
+# Streaming mode: CleanData.csv is read and DescriptionsAnalysed.csv appended
+# this many rows at a time, so descriptions, tokens and results are held
+# per chunk (None = load everything at once). What still grows with the
+# corpus: the vocabulary, the TF-IDF document frequencies, the n-gram
+# summaries (bounded per segment) and, with near-duplicate detection on, its
+# index plus one cluster id per row. TF-IDF takes two passes over the input:
+# document frequencies first, scoring second; keep the analysis cache on so
+# the second pass does not tokenize again.
+STREAM_CHUNK_ROWS = None
+
+# Only jobs dated in [START_DATE, END_DATE) are analysed (None = open ended),
+# e.g. "2025-10-01" or date_partitions.days_ago(30). Partitioned inputs
+# (process_raw_data.PARTITION_BY_MONTH) are only read for those months.
+START_DATE = None
+END_DATE = None
+
+
+def join_terms(terms):
+    return ', '.join(terms)
+
+
+# === Worker: tokens and dictionary term counts of one chunk ===
+def analyse_chunk(texts, terms=()):
+    """Tokens and matched dictionary terms of every description in a chunk."""
+    matcher = get_matcher(terms)
+    tokens = tokenize_chunk(texts)
+    return [(t, dict(matcher.count(text))) for t, text in zip(tokens, texts)]
+
+
+def match_chunk(texts, terms=()):
+    """Matched dictionary terms only, for cached tokens with an old dictionary."""
+    matcher = get_matcher(terms)
+    return [dict(matcher.count(text)) for text in texts]
+
+
+def load_term_dictionary():
+    """Tech terms plus the scraped skill vocabulary (normalized -> skill name)."""
+    tech_keys = {normalize_term(t) for t in TECH_DICTIONARY}
+    skill_names = {}
+    if SKILL_TERMS_FILE and os.path.exists(SKILL_TERMS_FILE):
+        for skill in load_skill_terms(SKILL_TERMS_FILE, SKILL_TERMS_MIN_JOBS):
+            skill_names.setdefault(normalize_term(skill), skill)
+        print(f"Loaded {len(skill_names)} skills from '{SKILL_TERMS_FILE}'.")
+    terms = tuple(TECH_DICTIONARY) + tuple(skill_names.values())
+    return terms, tech_keys, skill_names
+
+
+# === 2. Clean, tokenize and match dictionary terms (cache misses only) ===
+def analyse_descriptions(texts, terms, cache, repeat=False):
+    """
+    Tokens and term counts of every text. Cached entries are reused, entries
+    cached with a different term dictionary only get their terms recounted
+    and entries with keywords for a different TOP_N only get new keywords.
+    Returns tokens, term counts, cache entries and keys, the dictionary
+    digest and the rows whose entries have to be (re)stored. A repeat
+    analysis of texts looked up before in this run is not counted in the
+    cache's hits and misses.
+    """
+    digest = content_key(*terms)
+    keys = [content_key(ANALYSIS_VERSION, t) for t in texts]
+    cached = cache.get_many(keys, count=not repeat) if cache else {}
+    entries = [cached.get(k) for k in keys]
+
+    todo = [i for i, e in enumerate(entries) if e is None]
+    stale = [i for i, e in enumerate(entries) if e is not None and e['terms_digest'] != digest]
+    rescore = [
+        i for i, e in enumerate(entries)
+        if e is not None and e['terms_digest'] == digest and e.get('top_n') != TOP_N
+    ]
+
+    tokens = [e['tokens'] if e else None for e in entries]
+    counts = [e['terms'] if e else None for e in entries]
+
+    fresh = map_chunks(partial(analyse_chunk, terms=terms), [texts[i] for i in todo], workers=N_WORKERS)
+    for i, (t, c) in zip(todo, fresh):
+        tokens[i], counts[i] = t, c
+    recount = map_chunks(partial(match_chunk, terms=terms), [texts[i] for i in stale], workers=N_WORKERS)
+    for i, c in zip(stale, recount):
+        counts[i] = c
+
+    return tokens, counts, entries, keys, digest, todo + stale + rescore
+
+
+# === 3/4. Per-job top keywords and bigrams ===
+def decode_top_terms(keys, offsets, vocab):
+    """Decode top feature keys to one list of terms per document."""
+    terms = [' '.join(vocab.decode(decode_feature(int(k)))) for k in keys]
+    return [terms[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+
+def top_terms(engine, offsets, ids, vocab, groups=None, use_idf=True):
+    uni_keys, uni_offsets, bi_keys, bi_offsets = engine.top_terms(
+        offsets, ids, groups, k=TOP_N, use_idf=use_idf
+    )
+    return decode_top_terms(uni_keys, uni_offsets, vocab), decode_top_terms(bi_keys, bi_offsets, vocab)
+
+
+# === 5. Technical score and skills derived from the text ===
+def technical_score(counts, tech_keys):
+    return sum(n for term, n in counts.items() if term in tech_keys)
+
+
+def format_term_counts(counts, keys):
+    found = sorted(((n, t) for t, n in counts.items() if t in keys), key=lambda x: (-x[0], x[1]))
+    return join_terms(f'{t}:{n}' for n, t in found)
+
+
+def derive_skills(counts, skill_names, tags):
+    """Skills from the vocabulary found in the text but not tagged on the job."""
+    tagged = {normalize_term(t) for t in tags}
+    found = sorted(
+        ((n, t) for t, n in counts.items() if t in skill_names and t not in tagged),
+        key=lambda x: (-x[0], x[1]),
+    )
+    return join_terms(skill_names[t] for _, t in found)
+
+
+class DescriptionAnalyser:
+    """
+    State shared by every chunk of a run: term dictionaries, cache, corpus
+    vocabulary, document frequencies and near-duplicate clusters. A chunk
+    goes through cluster() -> analyse() -> (fit()) -> finish().
+
+    Near-duplicates share the analysis of the first member of their cluster
+    inside the same chunk; in streaming mode a repost of a job from an
+    earlier chunk still points to it in DuplicateCluster but is analysed
+    on its own.
+    """
+
+    def __init__(self, cache=None):
+        self.terms, self.tech_keys, self.skill_names = load_term_dictionary()
+        self.cache = cache
+        self.vocab = Vocabulary()
+        self.group_vocab = Vocabulary()
+        self.engine = KeywordEngine()
+        self.index = NearDuplicateIndex(NEAR_DUPLICATE_THRESHOLD) if NEAR_DUPLICATE_THRESHOLD else None
+        # cluster id -> Job ID of its representative, only kept with the index
+        self.rep_job_ids = {}
+        # clusters first seen in the last clustered chunk
+        self.new_clusters = set()
+        self.n_rows = 0
+        self.ngrams = NgramStats() if NGRAM_STATS_FILE else None
+
+    def cluster(self, df):
+        """Corpus wide near-duplicate cluster id of every row of a chunk."""
+        if self.index is None:
+            # every row is a cluster of its own
+            cluster_ids = self.row_ids(self.n_rows, len(df))
+            self.n_rows += len(df)
+            self.new_clusters = set(cluster_ids.tolist())
+            return cluster_ids
+
+        descriptions = df['Description'].tolist()
+        cluster_ids = cluster_descriptions(descriptions, workers=N_WORKERS, index=self.index)
+        self.n_rows += len(df)
+        self.new_clusters = set()
+        for cid, job_id in zip(cluster_ids.tolist(), df['Job ID'].tolist()):
+            if cid not in self.rep_job_ids:
+                self.rep_job_ids[cid] = job_id
+                self.new_clusters.add(cid)
+        return cluster_ids
+
+    @staticmethod
+    def row_ids(start, n):
+        """Cluster ids of n rows from row start on, without near-duplicate detection."""
+        return np.arange(start, start + n, dtype=np.int64)
+
+    def analyse(self, df, cluster_ids, repeat=False):
+        """
+        Tokens, term counts and raw count keywords of the chunk's cluster
+        representatives. New cache entries are stored right away. repeat:
+        the chunk was analysed before in this run (see analyse_descriptions).
+        """
+        reps = representatives(cluster_ids - cluster_ids.min()) if len(cluster_ids) else cluster_ids
+        rep_rows, rep_pos = np.unique(reps, return_inverse=True)
+        descriptions = df['Description'].to_numpy()
+
+        token_lists, term_counts, entries, keys, digest, changed = analyse_descriptions(
+            descriptions[rep_rows].tolist(), self.terms, self.cache, repeat
+        )
+        offsets, ids = self.vocab.encode(token_lists)
+        del token_lists
+
+        # raw count keywords are per description, so they are cached; only new
+        # or changed entries need them computed
+        changed_offsets, changed_ids = take_rows(offsets, ids, changed)
+        counted = dict(zip(changed, zip(*top_terms(
+            self.engine, changed_offsets, changed_ids, self.vocab, use_idf=False
+        ))))
+        counted.update(
+            (i, (e['keywords'], e['bigrams']))
+            for i, e in enumerate(entries) if i not in counted
+        )
+        scores = [technical_score(c, self.tech_keys) for c in term_counts]
+
+        if self.cache:
+            self.cache.put_many({
+                keys[i]: {
+                    'tokens': self.vocab.decode(ids[offsets[i]:offsets[i + 1]]),
+                    'terms': term_counts[i],
+                    'terms_digest': digest,
+                    'keywords': counted[i][0],
+                    'bigrams': counted[i][1],
+                    'top_n': TOP_N,
+                }
+                for i in changed
+            })
+
+        groups = None
+        if TFIDF_GROUP_BY:
+            values = df[TFIDF_GROUP_BY].fillna('').astype(str).to_numpy()[rep_rows]
+            groups = [self.group_vocab.add(v) for v in values]
+
+        return {
+            'rep_rows': rep_rows, 'rep_pos': rep_pos, 'rep_clusters': cluster_ids[rep_rows],
+            'offsets': offsets, 'ids': ids, 'groups': groups,
+            'term_counts': term_counts, 'counted': counted, 'scores': scores,
+        }
+
+    def store_tokens(self, df, batch, store):
+        """Append the tokens of every row of the chunk and count its n-grams."""
+        offsets, ids = take_rows(batch['offsets'], batch['ids'], batch['rep_pos'])
+        store.append(offsets, ids)
+        if self.ngrams is not None:
+            self.ngrams.add(offsets, ids, self.ngrams.segment_codes(df))
+
+    def fit(self, batch):
+        """
+        Add the chunk's representatives to the TF-IDF document frequencies.
+        Call right after cluster(): reposts of clusters from earlier chunks
+        are left out, so every cluster counts once.
+        """
+        new = [i for i, c in enumerate(batch['rep_clusters'].tolist()) if c in self.new_clusters]
+        offsets, ids = take_rows(batch['offsets'], batch['ids'], new)
+        groups = [batch['groups'][i] for i in new] if batch['groups'] is not None else None
+        self.engine.partial_fit(offsets, ids, groups)
+
+    def finish(self, df, cluster_ids, batch):
+        """Add the analysis columns to the chunk."""
+        rep_pos = batch['rep_pos']
+        term_counts = batch['term_counts']
+        if self.index is not None:
+            df['DuplicateCluster'] = [self.rep_job_ids[c] for c in cluster_ids.tolist()]
+        else:
+            df['DuplicateCluster'] = df['Job ID']
+
+        # === 3/4. Top keywords and bigrams from one sparse document-term matrix ===
+        if KEYWORD_MODE == "tfidf":
+            # corpus dependent, always rescored from the (cached) tokens
+            keywords, bigrams = top_terms(
+                self.engine, batch['offsets'], batch['ids'], self.vocab, batch['groups']
+            )
+        else:
+            counted = batch['counted']
+            keywords = [counted[i][0] for i in range(len(counted))]
+            bigrams = [counted[i][1] for i in range(len(counted))]
+
+        # Decode to text only for the columns that are written out
+        df['TopKeywords'] = [join_terms(keywords[p]) for p in rep_pos]
+        df['TopBigrams'] = [join_terms(bigrams[p]) for p in rep_pos]
+
+        # === 5. Technical score from the multi-pattern matcher ===
+        df['TechnicalScore'] = [batch['scores'][p] for p in rep_pos]
+        df['TechTerms'] = [format_term_counts(term_counts[p], self.tech_keys) for p in rep_pos]
+        if self.skill_names:
+            tags = df['Skills'].fillna('').astype(str).str.split(', ')
+            df['DerivedSkills'] = [
+                derive_skills(term_counts[p], self.skill_names, t)
+                if len([x for x in t if x]) < DERIVE_SKILLS_BELOW else ''
+                for p, t in zip(rep_pos, tags)
+            ]
+        return df
+
+
+# === 1. Load data ===
+def prepare(df):
+    # Fill missing descriptions
+    df['Description'] = df['Description'].fillna('').astype(str)
+    return df
+
+
+def read_chunks():
+    # Keep Job ID as string to avoid scientific notation
+    for df in iter_time_range(input_file, START_DATE, END_DATE,
+                              chunksize=STREAM_CHUNK_ROWS, dtype={'Job ID': str}):
+        if len(df):
+            yield prepare(df)
+
 
-print(f"Loading data from '{input_file}'...")
-# Keep Job ID as string to avoid scientific notation
-df = pd.read_csv(input_file, dtype={'Job ID': str})
-print(f"Data loaded: {len(df)} rows.")
+def run_in_memory(analyser, store):
+    print(f"Loading data from '{input_file}'...")
+    # Keep Job ID as string to avoid scientific notation
+    df = prepare(read_time_range(input_file, START_DATE, END_DATE, dtype={'Job ID': str}))
+    print(f"Data loaded: {len(df)} rows.")
 
-# Fill missing descriptions
-df['Description'] = df['Description'].fillna('').astype(str)
+    print("Clustering, cleaning and tokenizing descriptions...")
+    cluster_ids = analyser.cluster(df)
+    batch = analyser.analyse(df, cluster_ids)
+    print(f"{len(batch['rep_rows'])} distinct descriptions analysed.")
+    analyser.store_tokens(df, batch, store)
 
-# === 2. Clean and tokenize ===
-stop_words = set(stopwords.words('english'))
-translator = str.maketrans('', '', string.punctuation)
+    print(f"Scoring keywords ({KEYWORD_MODE})...")
+    if KEYWORD_MODE == "tfidf":
+        analyser.fit(batch)
+    analyser.finish(df, cluster_ids, batch)
 
-def clean_text(text):
-    text = text.lower().translate(translator)
-    tokens = [word for word in text.split() if word not in stop_words]
-    return tokens
+    # === 6. Save processed CSV ===
+    df.to_csv(output_file, index=False)
 
-print("Cleaning and tokenizing descriptions...")
-df['Tokens'] = df['Description'].apply(clean_text)
 
-# === 3. Compute per-job top keywords ===
-def top_keywords(tokens, n=5):
-    counts = Counter(tokens)
-    return [word for word, _ in counts.most_common(n)]
+def run_streaming(analyser, store):
+    tfidf = KEYWORD_MODE == "tfidf"
+    # pass 2 needs the clusters of pass 1; without near-duplicate detection
+    # they are just row numbers
+    cluster_ids = [] if analyser.index is not None else None
+    if tfidf:
+        # Pass 1: every job has to be seen before any job can be scored
+        print(f"Pass 1: document frequencies, {STREAM_CHUNK_ROWS} rows per chunk...")
+        for df in read_chunks():
+            ids = analyser.cluster(df)
+            batch = analyser.analyse(df, ids)
+            analyser.store_tokens(df, batch, store)
+            analyser.fit(batch)
+            if cluster_ids is not None:
+                cluster_ids.append(ids)
+        print(f"Document frequencies from {analyser.n_rows} rows.")
 
-df['TopKeywords'] = df['Tokens'].apply(lambda t: top_keywords(t, 5))
+    print(f"Analysing '{input_file}' in chunks of {STREAM_CHUNK_ROWS} rows...")
+    n_rows = 0
+    for n, df in enumerate(read_chunks()):
+        if not tfidf:
+            ids = analyser.cluster(df)
+        elif cluster_ids is not None:
+            ids = cluster_ids[n]
+        else:
+            ids = analyser.row_ids(n_rows, len(df))
+        # pass 2 reads back what pass 1 just cached: keep it out of the hit ratio
+        batch = analyser.analyse(df, ids, repeat=tfidf)
+        if not tfidf:
+            analyser.store_tokens(df, batch, store)
+        analyser.finish(df, ids, batch)
 
-# === 4. Compute per-job top bigrams ===
-def top_bigrams(tokens, n=5):
-    bigram_list = list(ngrams(tokens, 2))
-    counts = Counter(bigram_list)
-    return [' '.join(b) for b, _ in counts.most_common(n)]
+        # === 6. Append processed chunk ===
+        df.to_csv(output_file, mode='w' if n == 0 else 'a', header=n == 0, index=False)
+        n_rows += len(df)
+        print(f"  {n_rows} rows written.")
 
-df['TopBigrams'] = df['Tokens'].apply(lambda t: top_bigrams(t, 5))
 
-# === 5. Optional technical score ===
-tech_keywords = ['python','java','c#','sql','javascript','react','node','azure','aws','docker','ml','ai','tensorflow','pytorch']
+def main():
+    print("=== Starting Job Description Analysis ===")
 
-def technical_score(tokens):
-    return sum(1 for token in tokens if token.lower() in tech_keywords)
+    cache = open_cache(ANALYSIS_CACHE_FILE, "descriptions", ANALYSIS_CACHE_MAX_MB)
+    analyser = DescriptionAnalyser(cache)
+    # Encoded tokens are appended chunk by chunk
+    store = TokenStoreWriter(token_store_dir)
 
-df['TechnicalScore'] = df['Tokens'].apply(technical_score)
+    if STREAM_CHUNK_ROWS:
+        run_streaming(analyser, store)
+    else:
+        run_in_memory(analyser, store)
 
-# === 6. Save processed CSV ===
-df.to_csv(output_file, index=False)
-print(f"Processed data saved to '{output_file}'.")
-print("=== Analysis Completed ===")
+    store.close(analyser.vocab)
+    print(f"Encoded {store.n_tokens} tokens ({len(analyser.vocab)} distinct) to '{token_store_dir}'.")
+    print(f"Processed data saved to '{output_file}'.")
+    if analyser.ngrams is not None:
+        table = analyser.ngrams.table(analyser.vocab)
+        table.to_csv(NGRAM_STATS_FILE, index=False)
+        print(f"N-gram statistics saved to '{NGRAM_STATS_FILE}' ({len(table)} rows).")
+    if cache:
+        print(cache.report())
+        evicted = cache.close()
+        if evicted:
+            print(f"Evicted {evicted} old cache entries.")
+    print("=== Analysis Completed ===")
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import re
+import string
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# Bundled copy of the NLTK English stopword list, so no download is needed
+STOPWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stopwords_english.txt")
+
+# Descriptions per chunk handed to a worker
+CHUNK_SIZE = 2000
+
+# Same cleaning as the old clean_text(): lowercase, drop ASCII punctuation,
+# split on whitespace, drop stopwords. The regex replaces str.translate,
+# which is slow on long non-ASCII strings.
+PUNCT_RE = re.compile("[%s]+" % re.escape(string.punctuation))
+
+# Separates descriptions inside a joined chunk
+DOC_SEP = "\x00"
+
+
+@lru_cache(maxsize=None)
+def get_stop_words():
+    """Load the bundled stopword set on first use."""
+    with open(STOPWORDS_FILE, "r", encoding="utf-8") as f:
+        return frozenset(w.strip() for w in f if w.strip())
+
+
+def tokenize_chunk(texts):
+    """
+    Tokenize a list of descriptions in one go: the whole chunk is joined,
+    lowercased and stripped of punctuation with single C level calls, then
+    split back into one token list per description.
+    """
+    if not texts:
+        return []
+    stop_words = get_stop_words()
+
+    joined = f" {DOC_SEP} ".join(texts)
+    if joined.count(DOC_SEP) != len(texts) - 1:
+        # a description contains the separator itself
+        joined = f" {DOC_SEP} ".join(t.replace(DOC_SEP, " ") for t in texts)
+
+    joined = PUNCT_RE.sub("", joined.lower())
+    return [
+        [w for w in doc.split() if w not in stop_words]
+        for doc in joined.split(DOC_SEP)
+    ]
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def map_chunks(func, texts, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Apply func (list of texts -> list of per text results) chunk by chunk,
+    spreading chunks over a process pool. workers=1 (or a single chunk)
+    runs in the current process. func must be picklable.
+    """
+    texts = [t if isinstance(t, str) else "" for t in texts]
+    chunks = list(chunked(texts, chunk_size))
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [func(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(func, chunks))
+
+    out = []
+    for r in results:
+        out.extend(r)
+    return out
+
+
+def tokenize_descriptions(texts, workers=None, chunk_size=CHUNK_SIZE):
+    """Tokenize all descriptions, spreading chunks over a process pool."""
+    return map_chunks(tokenize_chunk, texts, workers, chunk_size)
@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from date_partitions import read_time_range
+from description_tokenizer import chunked
+from near_duplicates import cluster_descriptions, representatives
+from org_cache import ORG_FIELDS, cached_org_fields, org_columns, open_org_cache
+from org_extraction import get_backend
+
+INPUT_FILE = "CleanData.csv"
+OUTPUT_FILE = "Org.csv"
+
+# Categories to extract orgs for (None = every category)
+CATEGORIES = None
+
+# Only jobs dated in [START_DATE, END_DATE) are extracted (None = open ended),
+# e.g. "2025-10-01" or date_partitions.days_ago(30)
+START_DATE = None
+END_DATE = None
+
+# Org extraction backend: "rules", "ner" or "hybrid"
+BACKEND = "hybrid"
+
+# Worker processes (None = one per core) and jobs per shard
+N_WORKERS = None
+SHARD_SIZE = 500
+
+# Near-duplicate reposts (title + description) share the org fields of
+# their cluster's representative instead of being extracted again, e.g.
+# 0.9 (None = off). The org fields of a near-duplicate can differ from its
+# own extraction, so this trades exactness for speed.
+NEAR_DUPLICATE_THRESHOLD = None
+
+
+def load_jobs(path=INPUT_FILE, categories=CATEGORIES, start=START_DATE, end=END_DATE):
+    """
+    One row per Job ID dated in [start, end) with its title, description
+    and the categories it was listed under.
+    """
+    df = read_time_range(
+        path, start, end, dtype={"Job ID": str},
+        usecols=["Job ID", "Category", "Title", "Description"],
+    )
+    df = df[df["Job ID"].notna()]
+    if categories:
+        df = df[df["Category"].isin(categories)]
+
+    cats = (
+        df.groupby("Job ID", sort=False)["Category"]
+          .agg(lambda s: ", ".join(dict.fromkeys(s.dropna().astype(str))))
+    )
+    jobs = df.drop_duplicates("Job ID").drop(columns="Category").reset_index(drop=True)
+    jobs["Categories"] = jobs["Job ID"].map(cats)
+    jobs["Title"] = jobs["Title"].fillna("").astype(str)
+    jobs["Description"] = jobs["Description"].fillna("").astype(str)
+    return jobs
+
+
+def extract_shard(shard):
+    """Org columns (one array per field) of a shard of (title, description) pairs."""
+    titles, descriptions = shard
+    # every worker loads the NER model itself, on its first NER row
+    return org_columns(get_backend(BACKEND).extract_batch(titles, descriptions))
+
+
+def extract_orgs(titles, descriptions, workers=N_WORKERS, shard_size=SHARD_SIZE):
+    """
+    Org fields of every (title, description), sharded over a process pool.
+    Returns one object array per ORG_FIELDS entry.
+    """
+    shards = list(zip(chunked(titles, shard_size), chunked(descriptions, shard_size)))
+    if workers == 1 or len(shards) <= 1:
+        results = [extract_shard(s) for s in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(extract_shard, shards))
+
+    if not results:
+        return org_columns([])
+    return [np.concatenate([r[n] for r in results]) for n in range(len(ORG_FIELDS))]
+
+
+def main():
+    print(f"[INFO] Loading {INPUT_FILE}...")
+    jobs = load_jobs()
+    if jobs.empty:
+        print("[WARN] No jobs to process.")
+        return
+    print(f"[INFO] {len(jobs)} distinct jobs.")
+
+    descriptions = jobs["Description"].tolist()
+    if NEAR_DUPLICATE_THRESHOLD:
+        print("[INFO] Clustering near-duplicate jobs...")
+        texts = [t + "\n" + d for t, d in zip(jobs["Title"], descriptions)]
+        reps = representatives(
+            cluster_descriptions(texts, NEAR_DUPLICATE_THRESHOLD, workers=N_WORKERS)
+        )
+    else:
+        reps = np.arange(len(jobs))
+    rep_rows, rep_pos = np.unique(reps, return_inverse=True)
+
+    print(f"[INFO] Extracting organizations for {len(rep_rows)} distinct descriptions...")
+    titles = jobs["Title"].to_numpy()
+    cache = open_org_cache()
+    columns, extracted = cached_org_fields(
+        titles[rep_rows].tolist(), [descriptions[i] for i in rep_rows],
+        get_backend(BACKEND).version(), extract_orgs, cache,
+    )
+    print(f"[INFO] {extracted} descriptions extracted, the rest came from the cache.")
+    if cache:
+        print(f"[INFO] {cache.report()}")
+        cache.close()
+
+    org = pd.DataFrame({"Job ID": jobs["Job ID"], "Categories": jobs["Categories"]})
+    for name, values in zip(ORG_FIELDS, columns):
+        org[name] = values[rep_pos]
+    org["DuplicateCluster"] = jobs["Job ID"].to_numpy()[reps]
+
+    found = (org["OrgConfidence"] != "none").sum()
+    print(f"[INFO] Org found for {found} of {len(org)} jobs.")
+    org.to_csv(OUTPUT_FILE, index=False)
+    print(f"[INFO] Saved {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,135 +1,164 @@
+import numpy as np
 import pandas as pd
-from itertools import combinations
+
+from category_codes import encode_columns, load_dictionaries, read_categorical_csv
+from cooccurance import job_skill_table, skill_pairs
+from near_duplicates import load_cluster_representatives
+from pair_significance import add_significance, significant
 
 INPUT_FILE = "SkillsExploded.csv"
 OUTPUT_FILE = "SkillsPairsGlobal.csv"
+# DescriptionClusters.csv from near_duplicates.py: when set, near-duplicate
+# reposts are dropped and only each cluster's representative job is counted
+CLUSTERS_FILE = None
 
-# --------------------------------------------------
-# Load and clean data
-# --------------------------------------------------
-df = pd.read_csv(INPUT_FILE)
-df.columns = [c.strip() for c in df.columns]
-
-df = df.rename(columns={
-    "Job ID": "job_id",
-    "Skill": "skill",
-    "Job Type": "job_type",
-    "Budget Avg": "budget",
-})
-
-# keep only valid rows
-df = df[df["job_id"].notna() & df["skill"].notna()].copy()
-df["budget"] = pd.to_numeric(df["budget"], errors="coerce")
-df["job_type"] = df["job_type"].str.lower().fillna("")
-df["job_id"] = df["job_id"].astype(str)
-
-# one set of skills per job
-skill_groups = (
-    df.groupby("job_id")["skill"]
-      .apply(lambda s: sorted(set(s)))
-)
+# Only jobs dated in [START_DATE, END_DATE) are counted (None = open ended),
+# e.g. "2025-10-01" or date_partitions.days_ago(30)
+START_DATE = None
+END_DATE = None
 
-# --------------------------------------------------
-# Build pair rows per job, with correct job counts
-# --------------------------------------------------
-pair_records = []
-
-for job_id, skills in skill_groups.items():
-    if len(skills) < 2:
-        continue
-
-    job_rows = df[df["job_id"] == job_id]
-
-    is_hourly = (job_rows["job_type"] == "hourly").any()
-    is_fixed  = (job_rows["job_type"] == "fixed").any()
-
-    hourly_budgets = job_rows[job_rows["job_type"] == "hourly"]["budget"].dropna()
-    fixed_budgets  = job_rows[job_rows["job_type"] == "fixed"]["budget"].dropna()
-
-    hourly_avg = hourly_budgets.mean()   if not hourly_budgets.empty else None
-    hourly_med = hourly_budgets.median() if not hourly_budgets.empty else None
-    fixed_avg  = fixed_budgets.mean()    if not fixed_budgets.empty else None
-    fixed_med  = fixed_budgets.median()  if not fixed_budgets.empty else None
-
-    for a, b in combinations(skills, 2):
-        pair_records.append({
-            "Skill A": a,
-            "Skill B": b,
-            # per job indicators
-            "Hourly_Jobs": 1 if is_hourly else 0,
-            "Fixed_Jobs":  1 if is_fixed  else 0,
-            # per job budget stats
-            "Hourly_Avg":    hourly_avg,
-            "Hourly_Median": hourly_med,
-            "Fixed_Avg":     fixed_avg,
-            "Fixed_Median":  fixed_med,
-            "job_id": job_id,
-        })
-
-pairs = pd.DataFrame(pair_records)
+# Significance of every pair: one sided "fisher" (exact) or "chi2" p-values
+# (None = off), Benjamini-Hochberg q-values over the table when FDR, and a
+# LIFT_CI_LEVEL interval of Lift. With MAX_Q_VALUE set only the pairs at or
+# below it are saved (the p-value when FDR is off).
+P_VALUE_METHOD = "fisher"
+FDR = True
+LIFT_CI_LEVEL = 0.95
+MAX_Q_VALUE = None
 
-# --------------------------------------------------
-# Global supports A, B, AB
-# --------------------------------------------------
-support_A = (
-    df.groupby("skill")["job_id"]
-      .nunique()
-      .rename("Support A")
-)
-
-support_B = support_A.rename("Support B")
-
-support_AB = (
-    pairs.groupby(["Skill A", "Skill B"])["job_id"]
-         .nunique()
-         .rename("Support AB")
-)
 
-total_jobs = df["job_id"].nunique()
-
-# --------------------------------------------------
-# Association metrics: confidence, lift, jaccard
 # --------------------------------------------------
-stats = support_AB.reset_index()
-stats = stats.merge(support_A, left_on="Skill A", right_index=True)
-stats = stats.merge(support_B, left_on="Skill B", right_index=True)
-
-stats["Confidence A→B"] = stats["Support AB"] / stats["Support A"]
-stats["Confidence B→A"] = stats["Support AB"] / stats["Support B"]
-
-stats["Lift"] = (
-    stats["Support AB"] * total_jobs /
-    (stats["Support A"] * stats["Support B"])
-)
-
-stats["Jaccard"] = (
-    stats["Support AB"] /
-    (stats["Support A"] + stats["Support B"] - stats["Support AB"])
-)
-
-# --------------------------------------------------
-# Aggregate budget stats per pair
+# Load and clean data
 # --------------------------------------------------
-budget_stats = (
-    pairs.groupby(["Skill A", "Skill B"])
-         .agg({
-             "Hourly_Jobs":   "sum",
-             "Fixed_Jobs":    "sum",
-             "Hourly_Avg":    "mean",
-             "Hourly_Median": "median",
-             "Fixed_Avg":     "mean",
-             "Fixed_Median":  "median",
-         })
-         .reset_index()
-)
-
-final = stats.merge(budget_stats, on=["Skill A", "Skill B"], how="left")
-final = final.sort_values("Support AB", ascending=False)
-
-final.to_csv(OUTPUT_FILE, index=False)
-print(f"✔ Global co-occurrence created: {OUTPUT_FILE}")
-
-
-
-
-
+def load_skills(path=INPUT_FILE, dictionaries=None, start=START_DATE, end=END_DATE):
+    """SkillsExploded with the segment and skill columns as dictionary coded categoricals."""
+    df, _ = read_categorical_csv(path, dictionaries=dictionaries, start=start, end=end)
+    return df
+
+
+def build_global_pairs(df, dictionaries=None):
+    """
+    Global co-occurrence table: one row per (Skill A, Skill B) over all jobs
+    with supports, confidence, lift, jaccard and hourly/fixed budget stats.
+
+    Jobs, skills and job types are handled as integer codes throughout.
+    """
+    # keep only valid rows
+    df = df[df["Job ID"].notna() & df["Skill"].notna()].copy()
+    df, dictionaries = encode_columns(df, ["Job Type", "Skill"], dictionaries)
+
+    # jobs numbered in sorted Job ID order, like a groupby on the strings
+    job = pd.factorize(df["Job ID"].astype(str), sort=True)[0]
+    skill = df["Skill"].cat.codes.to_numpy().astype(np.int64)
+    budget = pd.to_numeric(df["Budget Avg"], errors="coerce").to_numpy()
+    n_jobs = int(job.max()) + 1 if len(job) else 0
+
+    # job type per row, compared case insensitively
+    types = df["Job Type"].cat.categories.str.lower()
+    type_codes = df["Job Type"].cat.codes.to_numpy()
+    job_type = np.where(type_codes >= 0, np.asarray(types, dtype=object)[type_codes], "") if len(types) else np.full(len(df), "")
+
+    # --------------------------------------------------
+    # Per job indicators and budget stats
+    # --------------------------------------------------
+    per_job = {}
+    for kind in ["hourly", "fixed"]:
+        rows = job_type == kind
+        per_job[kind] = np.bincount(job[rows], minlength=n_jobs) > 0
+        priced = rows & ~np.isnan(budget)
+        stats = pd.Series(budget[priced]).groupby(job[priced]).agg(["mean", "median"]).reindex(range(n_jobs))
+        per_job[kind + "_avg"] = stats["mean"].to_numpy()
+        per_job[kind + "_median"] = stats["median"].to_numpy()
+
+    # one sorted set of skills per job, and its pairs
+    skill_ranks = dictionaries.ranks("Skill")
+    js_job, js_skill = job_skill_table(job, skill, skill_ranks)
+    pj, pa, pb = skill_pairs(js_job, js_skill, n_jobs)
+
+    # --------------------------------------------------
+    # Global supports A, B, AB
+    # --------------------------------------------------
+    n_skills = max(len(skill_ranks), 1)
+    support = np.bincount(js_skill, minlength=n_skills)
+    total_jobs = n_jobs
+
+    pairs = pd.DataFrame({
+        "key": pa * n_skills + pb,
+        "Hourly_Jobs": per_job["hourly"][pj].astype(np.int64),
+        "Fixed_Jobs": per_job["fixed"][pj].astype(np.int64),
+        "Hourly_Avg": per_job["hourly_avg"][pj],
+        "Hourly_Median": per_job["hourly_median"][pj],
+        "Fixed_Avg": per_job["fixed_avg"][pj],
+        "Fixed_Median": per_job["fixed_median"][pj],
+    })
+
+    # --------------------------------------------------
+    # Aggregate budget stats per pair
+    # --------------------------------------------------
+    budget_stats = pairs.groupby("key").agg(
+        support_ab=("Hourly_Jobs", "size"),
+        Hourly_Jobs=("Hourly_Jobs", "sum"),
+        Fixed_Jobs=("Fixed_Jobs", "sum"),
+        Hourly_Avg=("Hourly_Avg", "mean"),
+        Hourly_Median=("Hourly_Median", "median"),
+        Fixed_Avg=("Fixed_Avg", "mean"),
+        Fixed_Median=("Fixed_Median", "median"),
+    )
+    a, b = np.divmod(budget_stats.index.to_numpy(), n_skills)
+    # same row order as grouping on the skill strings
+    order = np.lexsort([skill_ranks[b], skill_ranks[a]])
+    a, b = a[order], b[order]
+    budget_stats = budget_stats.iloc[order].reset_index(drop=True)
+
+    categories = dictionaries.categories("Skill")
+    final = pd.DataFrame({
+        "Skill A": pd.Categorical.from_codes(a, categories=categories),
+        "Skill B": pd.Categorical.from_codes(b, categories=categories),
+        "Support AB": budget_stats["support_ab"].to_numpy(),
+        "Support A": support[a],
+        "Support B": support[b],
+    })
+
+    # --------------------------------------------------
+    # Association metrics: confidence, lift, jaccard
+    # --------------------------------------------------
+    final["Confidence A→B"] = final["Support AB"] / final["Support A"]
+    final["Confidence B→A"] = final["Support AB"] / final["Support B"]
+
+    final["Lift"] = (
+        final["Support AB"] * total_jobs /
+        (final["Support A"] * final["Support B"])
+    )
+
+    final["Jaccard"] = (
+        final["Support AB"] /
+        (final["Support A"] + final["Support B"] - final["Support AB"])
+    )
+
+    for col in ["Hourly_Jobs", "Fixed_Jobs", "Hourly_Avg", "Hourly_Median", "Fixed_Avg", "Fixed_Median"]:
+        final[col] = budget_stats[col].to_numpy()
+
+    # --------------------------------------------------
+    # Significance: p-values, q-values, Lift interval
+    # --------------------------------------------------
+    if P_VALUE_METHOD:
+        final = add_significance(final, total_jobs, P_VALUE_METHOD, FDR, LIFT_CI_LEVEL)
+    return final.sort_values("Support AB", ascending=False)
+
+
+def main():
+    dictionaries = load_dictionaries()
+    df = load_skills(dictionaries=dictionaries)
+    if CLUSTERS_FILE:
+        keep = load_cluster_representatives(CLUSTERS_FILE)
+        df = df[df["Job ID"].astype(str).isin(keep)]
+    final = build_global_pairs(df, dictionaries)
+    if P_VALUE_METHOD and MAX_Q_VALUE is not None:
+        final = significant(final, MAX_Q_VALUE)
+
+    final.to_csv(OUTPUT_FILE, index=False)
+    print(f"✔ Global co-occurrence created: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
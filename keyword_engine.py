@@ -0,0 +1,169 @@
+import numpy as np
+from scipy import sparse
+
+# Feature keys pack (group, first token, second token) into one int64:
+#   bits 48.. group code, bits 24..47 first token id + 1,
+#   bits 0..23 second token id + 1 (0 for unigrams)
+ID_BITS = 24
+ID_MASK = (1 << ID_BITS) - 1
+GROUP_SHIFT = 2 * ID_BITS
+MAX_VOCAB = ID_MASK - 1
+
+
+def doc_index(offsets):
+    """Document number of every token of a CSR token array."""
+    return np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+
+
+def ngram_features(offsets, ids):
+    """
+    (doc, feature key) for every unigram and bigram occurrence, in token
+    order. Bigrams never cross a document boundary.
+    """
+    if len(ids) and int(ids.max()) > MAX_VOCAB:
+        raise ValueError(f"vocabulary larger than {MAX_VOCAB} tokens")
+    doc = doc_index(offsets)
+    a = ids.astype(np.int64) + 1
+    same = doc[:-1] == doc[1:]
+    uni_keys = a << ID_BITS
+    bi_keys = (a[:-1][same] << ID_BITS) | a[1:][same]
+    return np.concatenate([doc, doc[:-1][same]]), np.concatenate([uni_keys, bi_keys])
+
+
+def document_term_matrix(offsets, ids):
+    """
+    Unigram + bigram document-term counts built in one pass.
+
+    Returns the CSR matrix, the feature key of every column and, aligned
+    with the matrix entries in (row, col) order, the rows, columns, counts
+    and the index of the first occurrence of each entry (used to break ties
+    the way Counter.most_common does).
+    """
+    n_docs = len(offsets) - 1
+    docs, keys = ngram_features(offsets, ids)
+    features, cols = np.unique(keys, return_inverse=True)
+    n_features = max(len(features), 1)
+
+    entries, first, counts = np.unique(
+        docs * n_features + cols, return_index=True, return_counts=True
+    )
+    rows = entries // n_features
+    cols = entries % n_features
+
+    matrix = sparse.csr_matrix(
+        (counts, (rows, cols)), shape=(n_docs, len(features))
+    )
+    return matrix, features, rows, cols, counts, first
+
+
+def decode_feature(key):
+    """Token ids of a feature key: (a,) for unigrams, (a, b) for bigrams."""
+    a = ((key >> ID_BITS) & ID_MASK) - 1
+    b = (key & ID_MASK) - 1
+    return (a,) if b < 0 else (a, b)
+
+
+def _segmented_top_k(rows, scores, first, n_docs, k):
+    """
+    Best k entries of every document without a per-document loop: one
+    lexsort by (document, -score, first occurrence), then the rank inside
+    each document decides what is kept. Returns entry indices and offsets.
+    """
+    order = np.lexsort((first, -scores, rows))
+    r = rows[order]
+    if len(r):
+        starts = np.flatnonzero(np.r_[True, r[1:] != r[:-1]])
+        rank = np.arange(len(r)) - np.repeat(starts, np.diff(np.r_[starts, len(r)]))
+        keep = order[rank < k]
+    else:
+        keep = order
+    offsets = np.zeros(n_docs + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows[keep], minlength=n_docs), out=offsets[1:])
+    return keep, offsets
+
+
+class KeywordEngine:
+    """
+    Corpus document frequencies for unigrams and bigrams (overall or per
+    group, e.g. Category) and per-document TF-IDF top-k extraction.
+
+    Document frequencies are kept as a sorted array of (group, feature) keys
+    with counts, so partial_fit can be called chunk by chunk.
+    """
+
+    def __init__(self):
+        self.df_keys = np.zeros(0, dtype=np.int64)
+        self.df_counts = np.zeros(0, dtype=np.int64)
+        self.n_docs = np.zeros(0, dtype=np.int64)
+
+    @staticmethod
+    def _groups(groups, n_docs):
+        if groups is None:
+            return np.zeros(n_docs, dtype=np.int64)
+        return np.asarray(groups, dtype=np.int64)
+
+    def partial_fit(self, offsets, ids, groups=None):
+        """Add the document frequencies of a chunk of encoded documents."""
+        n_docs = len(offsets) - 1
+        if n_docs == 0:
+            return self
+        groups = self._groups(groups, n_docs)
+        matrix, features, *_ = document_term_matrix(offsets, ids)
+
+        # group x feature document counts as one sparse product
+        n_groups = int(groups.max()) + 1
+        membership = sparse.csr_matrix(
+            (np.ones(n_docs, dtype=np.int64), (groups, np.arange(n_docs))),
+            shape=(n_groups, n_docs),
+        )
+        present = matrix.copy()
+        present.data = np.ones_like(present.data)
+        df = (membership @ present).tocoo()
+
+        keys = (df.row.astype(np.int64) << GROUP_SHIFT) | features[df.col]
+        all_keys = np.concatenate([self.df_keys, keys])
+        all_counts = np.concatenate([self.df_counts, df.data.astype(np.int64)])
+        self.df_keys, inverse = np.unique(all_keys, return_inverse=True)
+        self.df_counts = np.bincount(inverse, weights=all_counts).astype(np.int64)
+
+        if n_groups > len(self.n_docs):
+            self.n_docs = np.concatenate(
+                [self.n_docs, np.zeros(n_groups - len(self.n_docs), dtype=np.int64)]
+            )
+        self.n_docs[:n_groups] += np.bincount(groups, minlength=n_groups)
+        return self
+
+    def document_frequency(self, keys):
+        idx = np.searchsorted(self.df_keys, keys)
+        idx = np.minimum(idx, max(len(self.df_keys) - 1, 0))
+        if not len(self.df_keys):
+            return np.zeros(len(keys), dtype=np.int64)
+        return np.where(self.df_keys[idx] == keys, self.df_counts[idx], 0)
+
+    def top_terms(self, offsets, ids, groups=None, k=5, use_idf=True):
+        """
+        Top k unigrams and top k bigrams of every document.
+
+        Scores are tf * idf with the smoothed idf log((1 + N) / (1 + df)) + 1
+        of the document's group, or raw counts when use_idf is False.
+        Returns (unigram_keys, unigram_offsets, bigram_keys, bigram_offsets).
+        """
+        n_docs = len(offsets) - 1
+        groups = self._groups(groups, n_docs)
+        _, features, rows, cols, counts, first = document_term_matrix(offsets, ids)
+        keys = features[cols] if len(features) else np.zeros(0, dtype=np.int64)
+
+        scores = counts.astype(np.float64)
+        if use_idf:
+            g = groups[rows]
+            df = self.document_frequency((g << GROUP_SHIFT) | keys)
+            n = self.n_docs[g] if len(self.n_docs) else np.zeros(len(g))
+            scores *= np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+        out = []
+        is_bigram = (keys & ID_MASK) != 0
+        for mask in (~is_bigram, is_bigram):
+            sel = np.flatnonzero(mask)
+            keep, top_offsets = _segmented_top_k(rows[sel], scores[sel], first[sel], n_docs, k)
+            out.extend([keys[sel][keep], top_offsets])
+        return tuple(out)
@@ -0,0 +1,156 @@
+import csv
+import re
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from description_tokenizer import map_chunks
+
+INPUT_FILE = "CleanData.csv"
+OUTPUT_FILE = "DescriptionClusters.csv"
+
+# Words per shingle
+SHINGLE_SIZE = 5
+# MinHash signature length, split into BANDS bands of NUM_PERM // BANDS rows
+NUM_PERM = 128
+BANDS = 16
+# Estimated Jaccard similarity needed to join a cluster
+THRESHOLD = 0.9
+SEED = 1
+# Texts with fewer words than this have no signature and always stay in a
+# cluster of their own: empty or boilerplate-short texts say nothing about
+# the job and must not pull unrelated jobs together
+MIN_WORDS = SHINGLE_SIZE
+
+WORD_RE = re.compile(r"\w+")
+# Odd 64 bit multiplier used to fold word hashes into shingle hashes
+SHINGLE_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+_rng = np.random.RandomState(SEED)
+# Multiply-shift hash family: h_i(x) = (a_i * x + b_i) mod 2^64 >> 32
+PERM_A = (_rng.randint(0, 2 ** 62, NUM_PERM, dtype=np.int64).astype(np.uint64) << np.uint64(1)) | np.uint64(1)
+PERM_B = _rng.randint(0, 2 ** 62, NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """Distinct 64 bit hashes of the k-word shingles of a text."""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    h = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    k = min(k, len(h))
+    n = len(h) - k + 1
+    shingles = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(k):
+            shingles = shingles * SHINGLE_MULT + h[j:j + n]
+    return np.unique(shingles)
+
+
+def minhash(text):
+    """MinHash signature (NUM_PERM uint32 values) of a text, None below MIN_WORDS words."""
+    if len(WORD_RE.findall(text.lower())) < MIN_WORDS:
+        return None
+    shingles = shingle_hashes(text)
+    with np.errstate(over="ignore"):
+        hashed = (PERM_A[:, None] * shingles[None, :] + PERM_B[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def minhash_chunk(texts):
+    return [minhash(t) for t in texts]
+
+
+class NearDuplicateIndex:
+    """
+    Banded LSH index over MinHash signatures.
+
+    Documents are added one by one. A document joins the cluster of the
+    first earlier representative that shares a band bucket with it and has
+    an estimated similarity >= threshold, otherwise it starts a new cluster
+    and becomes its representative. A document without a signature (too
+    short) always starts a new cluster. Each add costs BANDS dict lookups plus
+    a few signature comparisons, so clustering is roughly linear.
+    """
+
+    def __init__(self, threshold=THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.leaders = []
+
+    def add(self, signature):
+        """Cluster id of the signature (new ids are 0, 1, 2, ...)."""
+        if signature is None:
+            self.leaders.append(None)
+            return len(self.leaders) - 1
+        keys = [
+            signature[b * self.rows:(b + 1) * self.rows].tobytes()
+            for b in range(self.bands)
+        ]
+        checked = set()
+        for band, key in enumerate(keys):
+            for cid in self.buckets[band].get(key, ()):
+                if cid in checked:
+                    continue
+                checked.add(cid)
+                if np.mean(self.leaders[cid] == signature) >= self.threshold:
+                    return cid
+
+        cid = len(self.leaders)
+        self.leaders.append(signature)
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, []).append(cid)
+        return cid
+
+
+def cluster_descriptions(texts, threshold=THRESHOLD, workers=None, index=None):
+    """
+    Near-duplicate cluster id of every text. Signatures are computed over a
+    process pool, clustering runs in order so the first text of a cluster
+    is its representative. Pass an index to keep clustering across calls.
+    """
+    if index is None:
+        index = NearDuplicateIndex(threshold)
+    signatures = map_chunks(minhash_chunk, texts, workers)
+    return np.array([index.add(s) for s in signatures], dtype=np.int64)
+
+
+def representatives(cluster_ids):
+    """Row of the representative (first member) of every row's cluster."""
+    cluster_ids = np.asarray(cluster_ids)
+    _, first = np.unique(cluster_ids, return_index=True)
+    rep_of_cluster = np.empty(cluster_ids.max() + 1 if len(cluster_ids) else 0, dtype=np.int64)
+    rep_of_cluster[cluster_ids[first]] = first
+    return rep_of_cluster[cluster_ids]
+
+
+def load_cluster_representatives(path=OUTPUT_FILE):
+    """Job IDs that represent their cluster in a DescriptionClusters file."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return {
+            row["Job ID"] for row in csv.DictReader(f)
+            if row["Job ID"] == row["DuplicateCluster"]
+        }
+
+
+def main():
+    print(f"[INFO] Loading {INPUT_FILE}...")
+    df = pd.read_csv(INPUT_FILE, dtype={"Job ID": str}, usecols=["Job ID", "Description"])
+    texts = df["Description"].fillna("").astype(str).tolist()
+
+    print(f"[INFO] Clustering {len(texts)} descriptions...")
+    reps = representatives(cluster_descriptions(texts))
+    job_ids = df["Job ID"].to_numpy()
+    out = pd.DataFrame({"Job ID": job_ids, "DuplicateCluster": job_ids[reps]})
+
+    n_clusters = len(np.unique(reps))
+    print(f"[INFO] {n_clusters} clusters, {len(out) - n_clusters} near-duplicate rows.")
+    out.to_csv(OUTPUT_FILE, index=False)
+    print(f"[INFO] Saved {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from keyword_engine import doc_index
+from token_store import TOKEN_STORE_DIR, TokenStore
+
+INPUT_FILE = "CleanData.csv"
+OUTPUT_FILE = "NgramStats.csv"
+
+# Segments with their own n-gram counts (every job also counts globally)
+SEGMENT_COLS = ["Category", "Experience Level"]
+# Unigrams up to MAX_N-grams
+MAX_N = 3
+# Counters kept per (segment, n); more distinct n-grams than this are
+# tracked approximately (Space-Saving), the heavy hitters stay exact enough
+CAPACITY = 5000
+# N-grams written per (segment, n)
+TOP_K = 50
+# Segment n-grams are ranked by smoothed lift over the corpus: the
+# segment's share is shrunk toward the corpus share as if LIFT_PRIOR_JOBS
+# more jobs had the corpus share, so a handful of jobs cannot produce a
+# huge lift. N-grams in fewer than MIN_JOBS of the segment's jobs are
+# left out. The corpus-wide rows are ranked by count.
+LIFT_PRIOR_JOBS = 20
+MIN_JOBS = 5
+# Label of the corpus-wide rows in the segment columns
+ALL = "ALL"
+
+# Odd 64 bit multiplier used to fold token ids into n-gram hashes
+HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+
+
+def ngram_windows(offsets, ids, n):
+    """
+    (doc, hash, start) of every n-gram that does not cross a document
+    boundary; start indexes ids, so ids[start:start + n] is the n-gram.
+    """
+    doc = doc_index(offsets)
+    m = len(ids) - n + 1
+    if m <= 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty.astype(np.uint64), empty
+    start = np.flatnonzero(doc[:m] == doc[n - 1:])
+    h = np.zeros(len(start), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(n):
+            h = h * HASH_MULT + ids[start + j].astype(np.uint64) + np.uint64(1)
+    return doc[start], h, start
+
+
+class SpaceSaving:
+    """
+    Bounded heavy-hitter counter over 64 bit n-gram hashes.
+
+    Chunks are merged in batches: known keys add their counts, new keys
+    enter on top of the smallest tracked count (recorded as their error)
+    and only the `capacity` largest counters survive. Counts never
+    underestimate; Count - Error is a lower bound.
+    """
+
+    def __init__(self, n, capacity=CAPACITY):
+        self.n = n
+        self.capacity = capacity
+        self.keys = np.zeros(0, dtype=np.uint64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+        # token ids of every tracked n-gram, for decoding
+        self.grams = np.zeros((0, n), dtype=np.int32)
+
+    def update(self, keys, counts, grams):
+        """Add counts of sorted distinct keys (with their token ids)."""
+        idx = np.searchsorted(self.keys, keys)
+        idx = np.minimum(idx, max(len(self.keys) - 1, 0))
+        found = (self.keys[idx] == keys) if len(self.keys) else np.zeros(len(keys), dtype=bool)
+        self.counts[idx[found]] += counts[found]
+
+        new = ~found
+        floor = int(self.counts.min()) if len(self.keys) >= self.capacity else 0
+        keys = np.concatenate([self.keys, keys[new]])
+        counts = np.concatenate([self.counts, counts[new] + floor])
+        errors = np.concatenate([self.errors, np.full(int(new.sum()), floor, dtype=np.int64)])
+        grams = np.concatenate([self.grams, grams[new]])
+
+        if len(keys) > self.capacity:
+            keep = np.argpartition(-counts, self.capacity - 1)[:self.capacity]
+        else:
+            keep = np.arange(len(keys))
+        keep = keep[np.argsort(keys[keep])]
+        self.keys, self.counts, self.errors, self.grams = keys[keep], counts[keep], errors[keep], grams[keep]
+
+    def top(self, k=None):
+        """Tracked n-grams by count, the k largest (all when None)."""
+        order = np.lexsort((self.keys, -self.counts))[:k]
+        return self.grams[order], self.counts[order], self.errors[order], self.keys[order]
+
+
+class NgramStats:
+    """
+    Jobs containing each unigram..MAX_N-gram, corpus wide and per segment
+    (e.g. Category x Experience Level), accumulated chunk by chunk from
+    encoded tokens.
+    """
+
+    def __init__(self, max_n=MAX_N, capacity=CAPACITY):
+        self.max_n = max_n
+        self.capacity = capacity
+        # segment tuple -> code; code 0 is the whole corpus
+        self.segments = {(ALL,) * len(SEGMENT_COLS): 0}
+        self.jobs = [0]
+        self.summaries = {}
+
+    def _summary(self, code, n):
+        key = (code, n)
+        if key not in self.summaries:
+            self.summaries[key] = SpaceSaving(n, self.capacity)
+        return self.summaries[key]
+
+    def segment_codes(self, df):
+        """Segment code of every row of a frame holding SEGMENT_COLS."""
+        values = df[SEGMENT_COLS].fillna("").astype(str).itertuples(index=False, name=None)
+        codes = []
+        for seg in values:
+            code = self.segments.get(seg)
+            if code is None:
+                code = self.segments[seg] = len(self.segments)
+                self.jobs.append(0)
+            codes.append(code)
+        return np.asarray(codes, dtype=np.int64)
+
+    def add(self, offsets, ids, segments):
+        """Count the n-grams of a chunk of encoded jobs (one segment code each)."""
+        segments = np.asarray(segments, dtype=np.int64)
+        self.jobs[0] += len(segments)
+        for code, count in zip(*np.unique(segments, return_counts=True)):
+            self.jobs[code] += int(count)
+
+        for n in range(1, self.max_n + 1):
+            doc, h, start = ngram_windows(offsets, ids, n)
+            # presence per job: a job counts once per n-gram
+            order = np.lexsort((h, doc))
+            doc, h, start = doc[order], h[order], start[order]
+            first = np.r_[True, (doc[1:] != doc[:-1]) | (h[1:] != h[:-1])]
+            doc, h, start = doc[first], h[first], start[first]
+            seg = segments[doc]
+
+            for code in np.r_[0, np.unique(seg)]:
+                sel = slice(None) if code == 0 else seg == code
+                keys, pos, counts = np.unique(h[sel], return_index=True, return_counts=True)
+                s = start[sel][pos]
+                grams = ids[s[:, None] + np.arange(n)] if len(s) else np.zeros((0, n), dtype=np.int32)
+                self._summary(int(code), n).update(keys, counts.astype(np.int64), grams)
+        return self
+
+    def table(self, vocab, top_k=TOP_K, min_jobs=MIN_JOBS, prior_jobs=LIFT_PRIOR_JOBS):
+        """
+        Most distinctive n-grams of every segment (by smoothed lift, among
+        the Space-Saving candidates seen in at least min_jobs jobs) and the
+        most frequent corpus-wide ones, with their share of the segment's
+        jobs, raw lift and smoothed lift over the corpus-wide share.
+        """
+        names = {code: seg for seg, code in self.segments.items()}
+        corpus = {
+            n: (s.keys, s.counts)
+            for (code, n), s in self.summaries.items() if code == 0
+        }
+        total = max(self.jobs[0], 1)
+        columns = SEGMENT_COLS + ["N", "Ngram", "Jobs", "Error", "Share", "Lift", "Smoothed Lift"]
+
+        frames = []
+        for (code, n), summary in sorted(self.summaries.items()):
+            jobs = max(self.jobs[code], 1)
+            grams, counts, errors, keys = summary.top()
+            corpus_keys, corpus_counts = corpus[n]
+            idx = np.minimum(np.searchsorted(corpus_keys, keys), max(len(corpus_keys) - 1, 0))
+            found = corpus_keys[idx] == keys if len(corpus_keys) else np.zeros(len(keys), dtype=bool)
+            # an n-gram dropped from the corpus summary was in at least the segment's jobs
+            corpus_share = np.where(found, corpus_counts[idx] if len(corpus_keys) else 0, counts) / total
+            share = counts / jobs
+            lift = share / corpus_share
+            smoothed = (counts + prior_jobs * corpus_share) / (jobs + prior_jobs) / corpus_share
+
+            if code == 0:
+                order = np.arange(len(keys))[:top_k]
+            else:
+                order = np.flatnonzero(counts >= min_jobs)
+                order = order[np.lexsort((keys[order], -counts[order], -smoothed[order]))][:top_k]
+            frames.append(pd.DataFrame({
+                **{c: v for c, v in zip(SEGMENT_COLS, names[code])},
+                "N": n,
+                "Ngram": [" ".join(vocab.decode(g)) for g in grams[order]],
+                "Jobs": counts[order], "Error": errors[order], "Share": share[order],
+                "Lift": lift[order], "Smoothed Lift": smoothed[order],
+            }, columns=columns))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def main():
+    print(f"[INFO] Loading {INPUT_FILE} and tokens from {TOKEN_STORE_DIR}...")
+    df = pd.read_csv(INPUT_FILE, usecols=SEGMENT_COLS)
+    store = TokenStore(TOKEN_STORE_DIR)
+    if len(store) != len(df):
+        raise ValueError(f"{TOKEN_STORE_DIR} holds {len(store)} jobs, {INPUT_FILE} has {len(df)} rows")
+
+    stats = NgramStats()
+    stats.add(np.asarray(store.offsets), np.asarray(store.ids), stats.segment_codes(df))
+    table = stats.table(store.vocab)
+    table.to_csv(OUTPUT_FILE, index=False)
+    print(f"[INFO] Saved {len(table)} n-gram rows to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from org_extraction import hybrid, ner, rules
+from org_resolution import compact_name
+
+INPUT_FILE = "CleanData.csv"
+# Labeled jobs: Job ID, Title, Description, GoldOrg (empty = no client org)
+GOLD_FILE = "OrgGold.csv"
+REPORT_FILE = "OrgBenchmark.json"
+
+# Without a gold set, this many random jobs are written to GOLD_FILE
+# with an empty GoldOrg column to label
+SAMPLE_SIZE = 200
+SEED = 1
+
+# Timed passes over the gold set, latencies are taken over all of them
+REPEATS = 3
+
+
+def rules_args(title, desc):
+    text = (title + "\n" + desc).strip()
+    return text, (text, text.lower())
+
+
+def hybrid_args(title, desc):
+    intro = desc[:600]
+    return intro, (desc, intro, intro.lower())
+
+
+def same_org(predicted, gold):
+    return bool(predicted) and bool(gold) and compact_name(predicted) == compact_name(gold)
+
+
+def latency_stats(seconds):
+    if not len(seconds):
+        return {"mean_ms": None, "p99_ms": None}
+    ms = np.asarray(seconds) * 1000.0
+    return {"mean_ms": float(ms.mean()), "p99_ms": float(np.percentile(ms, 99))}
+
+
+def ratio(a, b):
+    return a / b if b else None
+
+
+def benchmark_extractor(module, build_args, ner_fallback, gold):
+    """
+    Quality and speed of one extractor over the gold rows. Every rule is
+    also run on its own for every row, so hit rates, standalone precision
+    and latencies are known even for rules a higher priority rule shadows.
+    """
+    # every rule is called as rule(args, ner_text)
+    rule_funcs = [(name, lambda args, _, f=func: f(*args)) for name, _, func in module.RULES]
+    if ner_fallback and ner.ner_available():
+        rule_funcs.append(("ner", lambda _, text: (ner.ml_org_candidate(text), "medium")))
+
+    names = [name for name, _ in rule_funcs]
+    fires = dict.fromkeys(names, 0)
+    fire_correct = dict.fromkeys(names, 0)
+    wins = dict.fromkeys(names + ["none"], 0)
+    win_correct = dict.fromkeys(names + ["none"], 0)
+    rule_times = {name: [] for name in names}
+    row_times = []
+    tp = fp = fn = 0
+
+    for title, desc, gold_org in gold:
+        _, args = build_args(title, desc)
+        ner_text = title + " " + desc
+
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            fields = module.extract_org_fields(title, desc)
+            row_times.append(time.perf_counter() - start)
+        predicted = fields[1]
+
+        winner = "none"
+        for name, func in rule_funcs:
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                candidate = func(args, ner_text)[0]
+                rule_times[name].append(time.perf_counter() - start)
+            if candidate:
+                fires[name] += 1
+                fire_correct[name] += same_org(module.normalize_org_name(candidate), gold_org)
+                if winner == "none":
+                    winner = name
+
+        correct = same_org(predicted, gold_org)
+        wins[winner] += bool(predicted)
+        win_correct[winner] += correct
+        tp += correct
+        fp += bool(predicted) and not correct
+        fn += bool(gold_org) and not correct
+
+    n_rows = len(gold)
+    positives = sum(1 for _, _, g in gold if g)
+    precision, recall = ratio(tp, tp + fp), ratio(tp, tp + fn)
+    return {
+        "rows": n_rows,
+        "gold_orgs": positives,
+        "precision": precision,
+        "recall": recall,
+        "f1": ratio(2 * precision * recall, precision + recall) if precision and recall else None,
+        "row_latency": latency_stats(row_times),
+        "rules": {
+            name: {
+                "hit_rate": ratio(fires[name], n_rows),
+                "standalone_precision": ratio(fire_correct[name], fires[name]),
+                "wins": wins[name],
+                "precision": ratio(win_correct[name], wins[name]),
+                "recall": ratio(win_correct[name], positives),
+                "latency": latency_stats(rule_times[name]),
+            }
+            for name in names
+        },
+    }
+
+
+def write_gold_template(path=GOLD_FILE):
+    df = pd.read_csv(INPUT_FILE, dtype={"Job ID": str}, usecols=["Job ID", "Title", "Description"])
+    df = df.drop_duplicates("Job ID")
+    sample = df.sample(n=min(SAMPLE_SIZE, len(df)), random_state=SEED)
+    sample["GoldOrg"] = ""
+    sample.to_csv(path, index=False)
+
+
+def load_gold(path=GOLD_FILE):
+    gold = pd.read_csv(path, dtype=str).fillna("")
+    return list(zip(gold["Title"], gold["Description"], gold["GoldOrg"].str.strip()))
+
+
+def print_summary(name, result):
+    lat = result["row_latency"]
+    print(f"\n=== {name}: {result['rows']} rows, {result['gold_orgs']} gold orgs ===")
+    print(f"precision {result['precision']}, recall {result['recall']}, f1 {result['f1']}")
+    print(f"row latency mean {lat['mean_ms']:.3f} ms, p99 {lat['p99_ms']:.3f} ms")
+    print(f"{'rule':<14}{'hit rate':>10}{'wins':>7}{'prec':>8}{'recall':>8}{'mean ms':>10}{'p99 ms':>10}")
+    for rule, r in result["rules"].items():
+        fmt = lambda v: f"{v:.3f}" if v is not None else "-"
+        print(
+            f"{rule:<14}{fmt(r['hit_rate']):>10}{r['wins']:>7}{fmt(r['precision']):>8}"
+            f"{fmt(r['recall']):>8}{fmt(r['latency']['mean_ms']):>10}{fmt(r['latency']['p99_ms']):>10}"
+        )
+
+
+def main():
+    if not os.path.exists(GOLD_FILE):
+        write_gold_template()
+        print(f"[WARN] No gold set found. Wrote {SAMPLE_SIZE} jobs to {GOLD_FILE};")
+        print("       fill in GoldOrg (leave empty when there is no client org) and rerun.")
+        return
+
+    gold = load_gold()
+    print(f"[INFO] {len(gold)} gold rows from {GOLD_FILE}")
+
+    report = {
+        "gold_file": GOLD_FILE,
+        "repeats": REPEATS,
+        "extractors": {
+            "rules": benchmark_extractor(rules, rules_args, False, gold),
+            "hybrid": benchmark_extractor(hybrid, hybrid_args, True, gold),
+        },
+    }
+    report["extractors"]["hybrid"]["ner_available"] = ner.ner_available()
+
+    for name, result in report["extractors"].items():
+        print_summary(name, result)
+
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Saved {REPORT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import numpy as np
+
+from content_cache import CACHE_FILE, content_key, open_cache
+
+# One cache for every org extraction backend (qa_org_with_rules,
+# qa_org_with_ner.py, extract_orgs.py); entries are keyed by backend
+# version, title and description, so switching backends keeps the results
+# of both
+ORG_CACHE_FILE = CACHE_FILE
+ORG_CACHE_MAX_MB = 1024
+ORG_CACHE_NAMESPACE = "org"
+
+ORG_FIELDS = ["OrgNameRaw", "OrgNameNormalized", "OrgConfidence", "OrgType", "OrgSource"]
+
+
+def open_org_cache(path=ORG_CACHE_FILE):
+    return open_cache(path, ORG_CACHE_NAMESPACE, ORG_CACHE_MAX_MB)
+
+
+def org_columns(rows):
+    """One object array per ORG_FIELDS entry from rows of org fields."""
+    if not rows:
+        return [np.zeros(0, dtype=object) for _ in ORG_FIELDS]
+    return [np.array(col, dtype=object) for col in zip(*rows)]
+
+
+def cached_org_fields(titles, descriptions, version, extract_batch, cache=None):
+    """
+    Org fields of every (title, description) as one object array per
+    ORG_FIELDS entry. Rows seen before by the same extractor version come
+    from the cache; extract_batch(titles, descriptions) -> columns computes
+    the rest, which are stored. Returns the columns and the number of rows
+    that had to be extracted.
+    """
+    keys = [content_key(version, t, d) for t, d in zip(titles, descriptions)]
+    found = cache.get_many(keys) if cache else {}
+
+    # every distinct missing key is extracted once
+    todo = {}
+    for i, k in enumerate(keys):
+        if k not in found and k not in todo:
+            todo[k] = i
+    rows = [titles[i] for i in todo.values()], [descriptions[i] for i in todo.values()]
+    fresh = extract_batch(*rows) if todo else org_columns([])
+    for n, k in enumerate(todo):
+        found[k] = [col[n] for col in fresh]
+    if cache and todo:
+        cache.put_many({k: found[k] for k in todo})
+
+    return org_columns([found[k] for k in keys]), len(todo)
@@ -0,0 +1,7 @@
+from .backends import BACKENDS, HybridBackend, NerBackend, RulesBackend, get_backend
+from .common import normalize_org_name
+
+__all__ = [
+    "BACKENDS", "HybridBackend", "NerBackend", "RulesBackend", "get_backend",
+    "normalize_org_name",
+]
@@ -0,0 +1,68 @@
+from . import hybrid, ner, rules
+from .common import RULES_VERSION, finish_org_fields
+
+
+class RulesBackend:
+    """Rule patterns only (the qa_org_with_rules extractor), no model."""
+
+    name = "rules"
+
+    def version(self):
+        return rules.EXTRACTOR_VERSION
+
+    def extract(self, title, description):
+        return rules.extract_org_fields(title, description)
+
+    def extract_batch(self, titles, descriptions):
+        return rules.extract_org_fields_batch(titles, descriptions)
+
+
+class NerBackend:
+    """spaCy NER on title + description, no rules."""
+
+    name = "ner"
+
+    def version(self):
+        return f"ner-{RULES_VERSION}-{ner.model_version() or 'none'}"
+
+    def extract(self, title, description):
+        return self.extract_batch([title], [description])[0]
+
+    def extract_batch(self, titles, descriptions):
+        titles = [t or "" for t in titles]
+        descriptions = [d or "" for d in descriptions]
+        found = ner.ml_org_candidates([t + " " + d for t, d in zip(titles, descriptions)])
+        return [
+            finish_org_fields(t, d, c, "medium", "ner") if c else finish_org_fields(t, d, None, "none")
+            for t, d, c in zip(titles, descriptions, found)
+        ]
+
+
+class HybridBackend:
+    """Rule patterns first, NER for the rows no rule matched."""
+
+    name = "hybrid"
+
+    def version(self):
+        return hybrid.extractor_version()
+
+    def extract(self, title, description):
+        return hybrid.extract_org_fields(title, description)
+
+    def extract_batch(self, titles, descriptions):
+        return hybrid.extract_org_fields_batch(titles, descriptions)
+
+
+BACKENDS = {b.name: b for b in (RulesBackend, NerBackend, HybridBackend)}
+
+
+def get_backend(name):
+    """
+    Org extraction backend by name. Every backend has version() (its cache
+    key), extract(title, description) and extract_batch(titles,
+    descriptions), returning OrgNameRaw, OrgNameNormalized, OrgConfidence,
+    OrgType, OrgSource per row. Models load on first use, not here.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown org extraction backend {name!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name]()
@@ -0,0 +1,210 @@
+import glob
+import hashlib
+import os
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+
+def sources_version():
+    """Short hash of every module of this package."""
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), "*.py"))):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# Part of every backend's cache key. Any change to the rules, the shared
+# helpers below or the NER settings changes it, so cached results are redone.
+RULES_VERSION = sources_version()
+
+# Names we never treat as client orgs
+ORG_BLOCKLIST = {
+    "upwork", "google", "gmail", "notion", "jira", "atlassian", "github",
+    "figma", "stripe", "paypal", "braintree", "facebook", "instagram",
+    "whatsapp", "shopify", "trustly", "browserstack", "postman",
+}
+
+# Domains we never treat as client orgs
+DOMAIN_BLOCKLIST = {
+    "upwork.com", "google.com", "gmail.com", "docs.google.com",
+    "notion.so", "jira.com", "atlassian.com", "github.com",
+    "figma.com", "stripe.com", "paypal.com", "braintreepayments.com",
+    "facebook.com", "instagram.com", "whatsapp.com", "shopify.com",
+}
+
+# Company suffixes to strip
+COMPANY_SUFFIXES = [
+    " inc", " inc.", " llc", " ltd", " gmbh", " sas", " srl", " bv", " plc",
+]
+
+# TLDs a bare domain may end in, and the ones that make a token look like
+# a brand and are glued back to the name ("socialtoast . ai")
+URL_TLDS = ("com", "io", "ai", "co", "net", "org", "app")
+NAME_TLDS = ("ai", "io", "co")
+
+
+# --------------- compiled patterns ---------------
+
+SPACES_RE = re.compile(r"\s+")
+LETTER_RE = re.compile(r"[a-zA-Z]")
+
+
+@lru_cache(maxsize=None)
+def url_patterns(tlds):
+    """
+    (URL_RE, URL_HINT_RE) for a tuple of TLDs. Every url match contains a
+    hint match, the cheap test before URL_RE.findall.
+    """
+    alternatives = "|".join(tlds)
+    url_re = re.compile(
+        rf"(https?://[^\s]+|www\.[^\s]+|\b[\w.-]+\.(?:{alternatives})\b)",
+        re.IGNORECASE,
+    )
+    hint_re = re.compile(rf"https?://|www\.|\.(?:{alternatives})\b", re.IGNORECASE)
+    return url_re, hint_re
+
+
+# --------------- helpers: generic ---------------
+
+def extract_urls(text: str, tlds=URL_TLDS):
+    if not text:
+        return []
+    url_re, hint_re = url_patterns(tuple(tlds))
+    if not hint_re.search(text):
+        return []
+    return url_re.findall(text)
+
+
+def domain_from_url(raw_url: str):
+    if not raw_url:
+        return None
+    url = raw_url
+    if not url.startswith("http"):
+        url = "http://" + url
+    try:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+        return host
+    except Exception:
+        return None
+
+
+def normalize_org_name(raw: str, suffixes=COMPANY_SUFFIXES, tlds=NAME_TLDS):
+    if not raw:
+        return ""
+    name = raw.strip()
+
+    # drop surrounding quotes
+    if (name.startswith('"') and name.endswith('"')) or (name.startswith("'") and name.endswith("'")):
+        name = name[1:-1].strip()
+
+    # if short token then parentheses, keep token before "("
+    if "(" in name and ")" in name:
+        before_paren = name.split("(", 1)[0].strip()
+        if before_paren:
+            name = before_paren
+
+    name = name.lower().strip()
+
+    # remove trailing punctuation
+    name = name.rstrip(".,;: ")
+
+    # strip company suffixes
+    for suf in suffixes:
+        if name.endswith(suf):
+            name = name[: -len(suf)].rstrip()
+
+    # fix spaced TLDs
+    for tld in tlds:
+        name = name.replace(f" .{tld}", f".{tld}").replace(f". {tld}", f".{tld}")
+
+    # collapse spaces
+    name = SPACES_RE.sub(" ", name)
+
+    return name
+
+
+def looks_like_org_token(token: str, tlds=NAME_TLDS):
+    if not token:
+        return False
+    t = token.strip().strip(",.")
+    if not t:
+        return False
+    lower = t.lower()
+    if lower in {"we", "our", "company", "agency", "firm", "startup"}:
+        return False
+    if not LETTER_RE.search(t):
+        return False
+    # either capitalized or looks like a brand or domain
+    if t[0].isupper() or any(f".{tld}" in lower for tld in tlds) or any(
+        word in lower for word in ["labs", "studio", "consulting", "digital"]
+    ):
+        return True
+    return False
+
+
+def first_non_empty_lines(text: str, n: int):
+    """
+    First n non empty lines, stripped. Only a growing prefix of the text is
+    split, the last line of a prefix may be cut off so it is never used.
+    """
+    size = 1024
+    while True:
+        lines = text[:size].splitlines()
+        if size < len(text):
+            lines = lines[:-1]
+        non_empty = [ln for ln in (ln.strip() for ln in lines) if ln]
+        if len(non_empty) >= n or size >= len(text):
+            return non_empty[:n]
+        size *= 4
+
+
+# --------------- helpers: org type ---------------
+
+def classify_org_type(full_text: str, org_name_norm: str, confidence: str):
+    """
+    Simple org type classifier based on text.
+    """
+    if confidence == "none" or not full_text:
+        return "individual_or_undefined"
+
+    low = full_text.lower()
+
+    if any(w in low for w in ["agency", "consulting firm", "consultancy", "advisory partners", "outsourced cto"]):
+        return "agency"
+
+    if any(w in low for w in ["platform", "marketplace", "saas", "software product", "app ", "application", "tool"]):
+        return "product_company"
+
+    if "our client is" in low or "on behalf of our client" in low:
+        return "end_client_business"
+
+    return "individual_or_undefined"
+
+
+def finish_org_fields(title: str, description: str, org_raw, org_conf, org_source="none"):
+    """
+    Normalize and classify a candidate.
+    Returns OrgNameRaw, OrgNameNormalized, OrgConfidence, OrgType, OrgSource
+    """
+    org_norm = normalize_org_name(org_raw) if org_raw else ""
+
+    full_text = (title or "") + "\n" + (description or "")
+    org_type = classify_org_type(full_text, org_norm, org_conf)
+
+    # blocklist guard
+    if org_norm in ORG_BLOCKLIST:
+        org_raw = ""
+        org_norm = ""
+        org_conf = "none"
+        org_type = "individual_or_undefined"
+        org_source = "none"
+
+    if not org_conf:
+        org_conf = "none"
+
+    return org_raw, org_norm, org_conf, org_type, org_source
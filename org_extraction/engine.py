@@ -0,0 +1,32 @@
+class RuleEngine:
+    """
+    Ordered org extraction rules with cheap guards.
+
+    rules is a list of (name, needles, func) in precedence order. needles
+    are literal strings of which at least one has to occur in the guard
+    text for the rule to be able to fire at all (None = always tried).
+    Rules are called in order with the same arguments and the first one
+    returning a candidate wins, so guards only skip work. A guard must never
+    be stricter than its rule, otherwise results change.
+    """
+
+    def __init__(self, rules, default):
+        self.rules = rules
+        self.default = default
+
+    def match(self, guard_text, *args):
+        """
+        (name, result) of the first rule (called with *args) whose candidate
+        is not empty, or (None, default result).
+        """
+        for name, needles, func in self.rules:
+            if needles is not None and not any(n in guard_text for n in needles):
+                continue
+            result = func(*args)
+            if result[0]:
+                return name, result
+        return None, self.default
+
+    def first_match(self, guard_text, *args):
+        """Result of the first rule whose candidate is not empty, or the default."""
+        return self.match(guard_text, *args)[1]
@@ -0,0 +1,266 @@
+import re
+
+from .common import (
+    DOMAIN_BLOCKLIST, ORG_BLOCKLIST, RULES_VERSION, extract_urls, domain_from_url,
+    finish_org_fields, first_non_empty_lines, looks_like_org_token, normalize_org_name,
+)
+from .engine import RuleEngine
+from .ner import ml_org_candidate, ml_org_candidates, model_version
+
+
+# --------------- compiled patterns ---------------
+
+IS_RE = re.compile(r"\b([A-Z][\w.& ]{0,40})\s+is\b")
+AT_WE_RE = re.compile(r"At\s+(.{1,40}?),\s+we\b")
+OUR_COMPANY_RE = re.compile(r"Our (company|agency|firm)\s+([A-Z][^,\.]+)")
+OUR_COMPANY_COMMA_RE = re.compile(r"Our (company|agency|firm)\s*,\s*([^,]+),")
+WE_ARE_RE = re.compile(r"We are\s+(.{1,40}?)[,\.]")
+PRODUCT_NAME_RE = re.compile(r"\b([A-Z][\w]*(?:\s+(?:Studio|Labs|App|Platform))?)\b")
+
+
+def extractor_version():
+    """Cache key of this extractor, NER results depend on the installed model."""
+    return f"hybrid-{RULES_VERSION}-" + (model_version() or "rules-only")
+
+
+# --------------- helpers: rule based org extraction ---------------
+
+def org_from_header_lines(description: str):
+    """
+    Look at first few non empty lines.
+    If a line looks like a single company name like 'TradeCafe',
+    treat it as org with high confidence.
+    """
+    if not description:
+        return None, "none"
+    for ln in first_non_empty_lines(description, 5):
+        low = ln.lower()
+        # break on section headers
+        if low in {"about us", "summary"}:
+            break
+        parts = ln.split()
+        if 1 <= len(parts) <= 3:
+            if low in {"remote", "full time", "full time remote", "job summary"}:
+                continue
+            if looks_like_org_token(parts[0]):
+                return ln, "high"
+    return None, "none"
+
+
+def org_from_is_pattern(intro_orig: str):
+    """
+    Pattern: X is ...
+    Example: 'TradeCafe is revolutionizing...'
+    """
+    # limit to first 600 chars
+    text = intro_orig[:600]
+    for m in IS_RE.finditer(text):
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if not norm or norm in ORG_BLOCKLIST:
+            continue
+        if looks_like_org_token(candidate.split()[-1]):
+            return candidate, "high"
+    return None, "none"
+
+
+def org_from_at_pattern(intro_orig: str):
+    """
+    Pattern: At X, we ...
+    Example: 'At LeadFlow, we help...'
+    """
+    m = AT_WE_RE.search(intro_orig)
+    if m:
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high"
+    return None, "none"
+
+
+LOOKING_PHRASES = [
+    " is looking", " are looking",
+    " is seeking", " are seeking",
+    " is in need of", " are in need of",
+    " is searching", " are searching",
+    " is hiring", " are hiring",
+]
+
+
+def org_from_seeking_pattern(intro_orig: str, low=None):
+    """
+    Pattern: X is looking / seeking / in need of / searching / hiring
+    Example: 'ModMarket is seeking experienced QA experts...'
+    """
+    if low is None:
+        low = intro_orig.lower()
+    for phrase in LOOKING_PHRASES:
+        idx = low.find(phrase)
+        if idx == -1:
+            continue
+        before = intro_orig[:idx].rstrip()
+        before_tail = before[-40:]
+        tokens = before_tail.split()
+        if not tokens:
+            continue
+        # drop leading "We", "Our"
+        while tokens and tokens[0].lower() in {"we", "our"}:
+            tokens = tokens[1:]
+        if not tokens:
+            continue
+        candidate = " ".join(tokens[-3:]).strip(",. ")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+            return candidate, "high"
+    return None, "none"
+
+
+def org_from_our_company_pattern(intro_orig: str):
+    """
+    Pattern: Our company X ..., Our agency X ...
+    """
+    m = OUR_COMPANY_RE.search(intro_orig)
+    if m:
+        candidate = m.group(2).strip(" ,.")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high"
+    m = OUR_COMPANY_COMMA_RE.search(intro_orig)
+    if m:
+        candidate = m.group(2).strip(" ,.")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high"
+    return None, "none"
+
+
+def org_from_we_are_pattern(intro_orig: str):
+    """
+    Pattern: We are X, ...
+    Example: 'We are SocialToast.ai, one of...'
+    """
+    m = WE_ARE_RE.search(intro_orig)
+    if m:
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+            return candidate, "medium"
+    return None, "none"
+
+
+def org_from_website_pattern(description: str):
+    """
+    Pattern: look at the app / website here: URL
+    Use domain or matching product name as org.
+    """
+    if not description:
+        return None, "none"
+
+    urls = extract_urls(description)
+    # the product name does not depend on the url
+    m = PRODUCT_NAME_RE.search(description) if urls else None
+    for url in urls:
+        domain = domain_from_url(url)
+        if not domain or domain in DOMAIN_BLOCKLIST:
+            continue
+        sld = domain.split(".")[0]  # second level
+        # try to find a product name containing SLD
+        # simple heuristic: capitalized word or two where SLD appears
+        candidate = None
+        if m:
+            token = m.group(1)
+            if sld.lower() in token.lower():
+                candidate = token.strip()
+        if not candidate:
+            candidate = domain
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "medium"
+    return None, "none"
+
+
+# --------------- main org extraction ---------------
+
+# Rule patterns in order of precedence, called as rule(desc, intro, low).
+# A rule is only tried when one of its needles occurs in the intro (None = always).
+RULES = [
+    # 1 header line pattern
+    ("header", None, lambda desc, intro, low: org_from_header_lines(desc)),
+    # 2 "X is ..." pattern
+    ("is", ("is",), lambda desc, intro, low: org_from_is_pattern(intro)),
+    # 3 "At X, we" pattern
+    ("at_we", ("At",), lambda desc, intro, low: org_from_at_pattern(intro)),
+    # 4 "X is seeking / looking / hiring" pattern
+    ("seeking", None, lambda desc, intro, low: org_from_seeking_pattern(intro, low)),
+    # 5 "Our company X" pattern
+    ("our_company", ("Our company", "Our agency", "Our firm"), lambda desc, intro, low: org_from_our_company_pattern(intro)),
+    # 6 "We are X," pattern
+    ("we_are", ("We are",), lambda desc, intro, low: org_from_we_are_pattern(intro)),
+    # 7 website pattern
+    ("website", None, lambda desc, intro, low: org_from_website_pattern(desc)),
+]
+RULE_ENGINE = RuleEngine(RULES, default=(None, "none"))
+
+
+def rule_org_match(description: str):
+    """
+    (rule name, (org_raw, confidence)) of the first rule that fires, rule
+    name and org_raw are None when none does.
+    """
+    desc = description or ""
+
+    # intro for rule patterns
+    intro_orig = desc[:600]
+    return RULE_ENGINE.match(intro_orig, desc, intro_orig, intro_orig.lower())
+
+
+def rule_org_candidate(description: str):
+    """
+    Rule patterns in order of precedence.
+    Returns (org_raw, confidence), org_raw is None when no rule fires.
+    """
+    return rule_org_match(description)[1]
+
+
+def extract_org_fields(title: str, description: str):
+    """
+    Returns OrgNameRaw, OrgNameNormalized, OrgConfidence, OrgType, OrgSource
+    """
+    title = title or ""
+    desc = description or ""
+
+    name, (org_raw, org_conf) = rule_org_match(desc)
+    org_source = name or "none"
+
+    # 8 ML fallback with spaCy NER
+    if not org_raw:
+        candidate = ml_org_candidate(title + " " + desc)
+        if candidate:
+            org_raw, org_conf, org_source = candidate, "medium", "ner"
+
+    return finish_org_fields(title, desc, org_raw, org_conf, org_source)
+
+
+def extract_org_fields_batch(titles, descriptions):
+    """
+    extract_org_fields for many rows: rules run row by row, the rows no
+    rule matched go through NER together in nlp.pipe batches.
+    """
+    titles = [t or "" for t in titles]
+    descriptions = [d or "" for d in descriptions]
+    candidates = []
+    for d in descriptions:
+        name, (org_raw, org_conf) = rule_org_match(d)
+        candidates.append((org_raw, org_conf, name or "none"))
+
+    # 8 ML fallback with spaCy NER
+    missing = [i for i, (org_raw, _, _) in enumerate(candidates) if not org_raw]
+    found = ml_org_candidates([titles[i] + " " + descriptions[i] for i in missing])
+    for i, candidate in zip(missing, found):
+        if candidate:
+            candidates[i] = (candidate, "medium", "ner")
+
+    return [
+        finish_org_fields(t, d, *candidate)
+        for t, d, candidate in zip(titles, descriptions, candidates)
+    ]
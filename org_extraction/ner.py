@@ -0,0 +1,106 @@
+import importlib.metadata
+import importlib.util
+
+from .common import ORG_BLOCKLIST, normalize_org_name
+
+# spaCy package of the model and the components it runs; only the entity
+# recognizer is used, the disabled components do not feed it
+NER_MODEL = "en_core_web_sm"
+NER_DISABLE = ["parser", "lemmatizer", "tagger", "attribute_ruler"]
+# Texts per nlp.pipe batch and worker processes
+NER_BATCH_SIZE = 256
+NER_N_PROCESS = 1
+# Characters of title + description handed to NER
+NER_MAX_CHARS = 400
+
+# Loaded on first use by get_nlp(); None after a failed attempt
+_NLP = None
+_LOADED = False
+
+
+def get_nlp():
+    """
+    The spaCy pipeline, loaded on the first call. Importing spaCy and the
+    model takes seconds, so nothing touches them until NER is needed.
+    Returns None (with a warning, once) when either is missing.
+    """
+    global _NLP, _LOADED
+    if _LOADED:
+        return _NLP
+    _LOADED = True
+    try:
+        import spacy
+    except ImportError:
+        print("[WARN] spaCy is not installed. Run:")
+        print("       pip install spacy")
+        return None
+    try:
+        _NLP = spacy.load(NER_MODEL, disable=NER_DISABLE)
+    except OSError:
+        print(f"[WARN] spaCy model '{NER_MODEL}' not found. Run:")
+        print(f"       python -m spacy download {NER_MODEL}")
+    return _NLP
+
+
+def ner_available():
+    return get_nlp() is not None
+
+
+def model_version():
+    """
+    name-version of the NER model (as in its meta), or None when spaCy or
+    the model is not installed. Read from the package metadata, so cache
+    keys can be built without loading the model.
+    """
+    if _LOADED:
+        return f"{_NLP.meta['name']}-{_NLP.meta['version']}" if _NLP is not None else None
+    if importlib.util.find_spec("spacy") is None:
+        return None
+    try:
+        version = importlib.metadata.version(NER_MODEL)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+    # meta names drop the language prefix of the package name
+    return f"{NER_MODEL.split('_', 1)[1]}-{version}"
+
+
+def org_from_doc(doc):
+    """First ORG entity of a parsed intro that is not blocklisted."""
+    for ent in doc.ents:
+        if ent.label_ == "ORG":
+            candidate = ent.text.strip()
+            norm = normalize_org_name(candidate)
+            if norm and norm not in ORG_BLOCKLIST:
+                return candidate
+    return None
+
+
+def ml_org_candidate(text: str):
+    """
+    Use spaCy NER to find an ORG entity in the intro.
+    """
+    if not text:
+        return None
+    nlp = get_nlp()
+    if nlp is None:
+        return None
+    return org_from_doc(nlp(text[:NER_MAX_CHARS]))
+
+
+def ml_org_candidates(texts, batch_size=NER_BATCH_SIZE, n_process=NER_N_PROCESS):
+    """ml_org_candidate for many texts, run in batches through nlp.pipe."""
+    out = [None] * len(texts)
+    todo = [i for i, t in enumerate(texts) if t]
+    if not todo:
+        return out
+    nlp = get_nlp()
+    if nlp is None:
+        return out
+    docs = nlp.pipe(
+        (texts[i][:NER_MAX_CHARS] for i in todo),
+        batch_size=batch_size,
+        n_process=n_process,
+    )
+    for i, doc in zip(todo, docs):
+        out[i] = org_from_doc(doc)
+    return out
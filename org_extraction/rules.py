@@ -0,0 +1,247 @@
+import re
+
+from . import common
+from .common import RULES_VERSION, classify_org_type, domain_from_url
+from .engine import RuleEngine
+
+EXTRACTOR_VERSION = f"rules-{RULES_VERSION}"
+
+# The rules extractor also blocks a few catalogue sites and knows .it
+ORG_BLOCKLIST = common.ORG_BLOCKLIST | {"lego", "bricklink", "rebrickable", "sap business one"}
+DOMAIN_BLOCKLIST = common.DOMAIN_BLOCKLIST | {"bricklink.com", "lego.com"}
+URL_TLDS = common.URL_TLDS + ("it",)
+NAME_TLDS = common.NAME_TLDS + ("it",)
+
+
+IS_COMPANY_RE = re.compile(
+    r"\b([A-Z][\w.& ]{0,40})\s+is\s+(?:a|an|the)\s+([a-z ]{2,40})\b",
+    flags=re.MULTILINE,
+)
+IS_PLAIN_RE = re.compile(r"\b([A-Z][\w.& ]{0,40})\s+is\s+[a-z]", flags=re.MULTILINE)
+AT_WE_RE = re.compile(r"\bAt\s+(.{1,40}?),\s+we\b")
+OUR_COMPANY_RE = re.compile(r"Our (company|agency|firm)\s+([A-Z][^,\.]+)")
+OUR_COMPANY_COMMA_RE = re.compile(r"Our (company|agency|firm)\s*,\s*([^,]+),")
+WE_ARE_RE = re.compile(r"We are\s+(.{1,40}?)[,\.]")
+
+
+def extract_urls(text: str):
+    return common.extract_urls(text, URL_TLDS)
+
+
+def normalize_org_name(raw: str):
+    return common.normalize_org_name(raw, common.COMPANY_SUFFIXES, NAME_TLDS)
+
+
+def looks_like_org_token(token: str):
+    return common.looks_like_org_token(token, NAME_TLDS)
+
+
+def org_from_is_company_pattern(text: str):
+    """
+    X is a company or platform etc.
+    Example:
+      RedTap is a specialized consulting firm...
+    """
+    for m in IS_COMPANY_RE.finditer(text):
+        candidate = m.group(1).strip()
+        descriptor = m.group(2).strip()
+        if any(
+            kw in descriptor
+            for kw in ["company", "agency", "platform", "marketplace", "startup", "consulting firm", "consulting", "software"]
+        ):
+            norm = normalize_org_name(candidate)
+            if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+                return candidate, "high", "is_company"
+    return None, "none", None
+
+
+def org_from_is_plain_pattern(text: str):
+    """
+    X is verbing...
+    Example:
+      TradeCafe is revolutionizing...
+      Contour Education is reshaping...
+    """
+    for m in IS_PLAIN_RE.finditer(text):
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+            return candidate, "high", "is_plain"
+    return None, "none", None
+
+
+def org_from_at_pattern(text: str):
+    """
+    At X, we...
+    """
+    m = AT_WE_RE.search(text)
+    if m:
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high", "at_we"
+    return None, "none", None
+
+
+LOOKING_PHRASES = [
+    " is looking", " are looking",
+    " is seeking", " are seeking",
+    " is in need of", " are in need of",
+    " is searching", " are searching",
+    " is hiring", " are hiring",
+]
+
+
+def org_from_seeking_pattern(text: str, low=None):
+    """
+    X is seeking, X is looking, etc.
+    Example:
+      ModMarket is seeking experienced QA experts...
+    """
+    if low is None:
+        low = text.lower()
+    for phrase in LOOKING_PHRASES:
+        idx = low.find(phrase)
+        if idx == -1:
+            continue
+        before = text[:idx].rstrip()
+        before_tail = before[-40:]
+        tokens = before_tail.split()
+        if not tokens:
+            continue
+        # drop leading "We", "Our"
+        while tokens and tokens[0].lower() in {"we", "our"}:
+            tokens = tokens[1:]
+        if not tokens:
+            continue
+        candidate = " ".join(tokens[-3:]).strip(",. ")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+            return candidate, "high", "seeking"
+    return None, "none", None
+
+
+def org_from_our_company_pattern(text: str):
+    """
+    Our company X, Our agency X, etc.
+    """
+    m = OUR_COMPANY_RE.search(text)
+    if m:
+        candidate = m.group(2).strip(" ,.")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high", "our_company"
+    m = OUR_COMPANY_COMMA_RE.search(text)
+    if m:
+        candidate = m.group(2).strip(" ,.")
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "high", "our_company"
+    return None, "none", None
+
+
+def org_from_we_are_pattern(text: str):
+    """
+    We are X, ...
+    Example:
+      We are SocialToast.ai, one of...
+    """
+    m = WE_ARE_RE.search(text)
+    if m:
+        candidate = m.group(1).strip()
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST and looks_like_org_token(candidate.split()[0]):
+            return candidate, "medium", "we_are"
+    return None, "none", None
+
+
+def org_from_website_pattern(text: str, low=None):
+    """
+    Strict website based client org:
+    Only accept domain as org if within a small window we see:
+      "our app", "our website", "our platform", "our product", "our site"
+    """
+    if not text:
+        return None, "none", None
+
+    urls = extract_urls(text)
+    if low is None:
+        low = text.lower()
+
+    for url in urls:
+        domain = domain_from_url(url)
+        if not domain or domain in DOMAIN_BLOCKLIST:
+            continue
+        idx = low.find(url.lower())
+        if idx == -1:
+            idx = low.find(domain)
+        if idx == -1:
+            continue
+        start = max(0, idx - 120)
+        end = min(len(text), idx + 120)
+        window = low[start:end]
+        if not any(
+            phrase in window
+            for phrase in ["our app", "our application", "our platform", "our website", "our site", "our product"]
+        ):
+            continue
+        candidate = domain
+        norm = normalize_org_name(candidate)
+        if norm and norm not in ORG_BLOCKLIST:
+            return candidate, "medium", "website"
+
+    return None, "none", None
+
+
+# Rules in order of precedence, called as rule(text, low). A rule is only
+# tried when one of its needles occurs in the text (None = always).
+RULES = [
+    # 1) "X is a/an/the company/agency/platform/marketplace/startup/consulting firm/software"
+    ("is_company", ("is",), lambda text, low: org_from_is_company_pattern(text)),
+    # 2) "At X, we ..."
+    ("at_we", ("At",), lambda text, low: org_from_at_pattern(text)),
+    # 3) "X is seeking / looking / hiring ..."
+    ("seeking", None, lambda text, low: org_from_seeking_pattern(text, low)),
+    # 4) "Our company/agency/firm X ..."
+    ("our_company", ("Our company", "Our agency", "Our firm"), lambda text, low: org_from_our_company_pattern(text)),
+    # 5) "We are X, ..."
+    ("we_are", ("We are",), lambda text, low: org_from_we_are_pattern(text)),
+    # 6) generic "X is verbing..."
+    ("is_plain", ("is",), lambda text, low: org_from_is_plain_pattern(text)),
+    # 7) strict website pattern
+    ("website", None, lambda text, low: org_from_website_pattern(text, low)),
+]
+RULE_ENGINE = RuleEngine(RULES, default=(None, "none", None))
+
+
+def extract_org_fields(title: str, description: str):
+    """
+    Main entry: returns OrgNameRaw, OrgNameNormalized, OrgConfidence, OrgType, OrgSource
+    """
+    title = title or ""
+    desc = description or ""
+    full_text = (title + "\n" + desc).strip()
+    if not full_text:
+        return "", "", "none", "individual_or_undefined", "none"
+
+    org_raw, org_conf, org_source = RULE_ENGINE.first_match(full_text, full_text, full_text.lower())
+
+    org_norm = normalize_org_name(org_raw) if org_raw else ""
+    if org_norm in ORG_BLOCKLIST:
+        org_raw = ""
+        org_norm = ""
+        org_conf = "none"
+        org_source = "none"
+
+    org_type = classify_org_type(full_text, org_norm, org_conf)
+    if not org_conf:
+        org_conf = "none"
+    if not org_source:
+        org_source = "none"
+
+    return org_raw, org_norm, org_conf, org_type, org_source
+
+
+def extract_org_fields_batch(titles, descriptions):
+    """extract_org_fields for many rows."""
+    return [extract_org_fields(t, d) for t, d in zip(titles, descriptions)]
@@ -0,0 +1,209 @@
+import math
+import os
+import re
+from collections import Counter
+
+import pandas as pd
+
+from content_cache import content_key
+
+INPUT_FILE = "Org.csv"
+JOBS_FILE = "CleanData.csv"
+# Name -> cluster mapping; read back on the next run to keep cluster IDs stable
+CLUSTERS_FILE = "OrgClusters.csv"
+OUTPUT_FILE = "OrgAggregates.csv"
+
+# Names whose padded character trigram sets have at least this Jaccard
+# similarity are the same org
+JACCARD_THRESHOLD = 0.75
+NGRAM = 3
+
+# Trailing TLDs and separators ignored when comparing names
+TLD_RE = re.compile(r"\.(?:com|io|ai|co|net|org|app|it)$")
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+
+
+def compact_name(name: str):
+    """
+    Comparison key of a normalized org name: no TLD, no spaces or
+    punctuation, so "socialtoast.ai", "social toast" and "socialtoast"
+    share one key.
+    """
+    name = TLD_RE.sub("", str(name).lower().strip())
+    return NON_ALNUM_RE.sub("", name)
+
+
+def ngrams(key, n=NGRAM):
+    padded = f"^{key}$"
+    return {padded[i:i + n] for i in range(max(len(padded) - n + 1, 1))}
+
+
+class DisjointSet:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def similar_pairs(keys, threshold=JACCARD_THRESHOLD):
+    """
+    Pairs (i, j) of keys whose trigram Jaccard similarity is >= threshold.
+
+    Blocking by prefix filtering: trigrams are ordered rarest first and
+    every key is only indexed and probed under the first
+    len - ceil(threshold * len) + 1 of them. Two sets reaching the
+    threshold always share one of those, so no pair is missed while
+    frequent trigrams never form blocks.
+    """
+    grams = [ngrams(k) for k in keys]
+    df = Counter(g for s in grams for g in s)
+    ordered = [sorted(s, key=lambda g: (df[g], g)) for s in grams]
+
+    index = {}
+    pairs = []
+    # short keys first, so a probe only meets keys of size <= its own
+    for i in sorted(range(len(keys)), key=lambda i: len(grams[i])):
+        size = len(grams[i])
+        prefix = ordered[i][:size - math.ceil(threshold * size) + 1]
+        seen = set()
+        for g in prefix:
+            for j in index.get(g, ()):
+                if j in seen:
+                    continue
+                seen.add(j)
+                # size filter: |B| >= t|A| is needed for Jaccard >= t
+                if len(grams[j]) < threshold * size:
+                    continue
+                inter = len(grams[i] & grams[j])
+                if inter / (size + len(grams[j]) - inter) >= threshold:
+                    pairs.append((j, i))
+        for g in prefix:
+            index.setdefault(g, []).append(i)
+    return pairs
+
+
+def load_previous_ids(path=CLUSTERS_FILE):
+    """CompactKey -> OrgClusterID of an earlier run (empty when there is none)."""
+    if not path or not os.path.exists(path):
+        return {}
+    prev = pd.read_csv(path, dtype=str, usecols=["CompactKey", "OrgClusterID"]).dropna()
+    return dict(zip(prev["CompactKey"], prev["OrgClusterID"]))
+
+
+def resolve_names(names, counts, previous=None):
+    """
+    Cluster normalized org names. Returns a frame with one row per name:
+    OrgNameNormalized, CompactKey, OrgClusterID and OrgName (the most used
+    name of the cluster).
+
+    A cluster keeps an ID one of its keys had in the previous run (the
+    smallest, if it merged several); new clusters get an ID hashed from
+    their smallest key, so IDs do not depend on input order either.
+    """
+    previous = previous or {}
+    keys = sorted({compact_name(n) for n in names} - {""})
+    ds = DisjointSet(len(keys))
+    for i, j in similar_pairs(keys):
+        ds.union(i, j)
+
+    members = {}
+    for i, k in enumerate(keys):
+        members.setdefault(ds.find(i), []).append(k)
+
+    cluster_of_key = {}
+    taken = set()
+    # biggest clusters first claim their previous ID
+    for root in sorted(members, key=lambda r: (-len(members[r]), members[r][0])):
+        old = sorted({previous[k] for k in members[root] if k in previous} - taken)
+        cid = old[0] if old else "org_" + content_key(members[root][0])[:12]
+        taken.add(cid)
+        for k in members[root]:
+            cluster_of_key[k] = cid
+
+    table = pd.DataFrame({"OrgNameNormalized": list(names)})
+    table["CompactKey"] = table["OrgNameNormalized"].map(compact_name)
+    table = table[table["CompactKey"] != ""].copy()
+    table["OrgClusterID"] = table["CompactKey"].map(cluster_of_key)
+    table["Jobs"] = table["OrgNameNormalized"].map(counts).fillna(0).astype(int)
+
+    # display name: most used name of the cluster
+    best = (
+        table.sort_values(["Jobs", "OrgNameNormalized"], ascending=[False, True])
+             .drop_duplicates("OrgClusterID")
+             .set_index("OrgClusterID")["OrgNameNormalized"]
+    )
+    table["OrgName"] = table["OrgClusterID"].map(best)
+    return table.drop(columns="Jobs").reset_index(drop=True)
+
+
+def org_aggregates(jobs):
+    """
+    One row per org cluster: jobs, budget stats, categories and the name
+    variants seen. jobs needs OrgClusterID, OrgName, OrgNameNormalized,
+    Categories and Budget Avg.
+    """
+    def join_categories(values):
+        # Categories holds comma joined lists already
+        seen = dict.fromkeys(
+            v.strip() for s in values.dropna() for v in str(s).split(",") if v.strip()
+        )
+        return ", ".join(seen)
+
+    def join_names(values):
+        return ", ".join(dict.fromkeys(values.dropna()))
+
+    return (
+        jobs.groupby(["OrgClusterID", "OrgName"])
+            .agg(
+                Jobs=("Job ID", "nunique"),
+                Avg_Budget=("Budget Avg", "mean"),
+                Median_Budget=("Budget Avg", "median"),
+                Min_Budget=("Budget Avg", "min"),
+                Max_Budget=("Budget Avg", "max"),
+                Categories=("Categories", join_categories),
+                Names=("OrgNameNormalized", join_names),
+            )
+            .reset_index()
+            .sort_values(["Jobs", "OrgClusterID"], ascending=[False, True])
+    )
+
+
+def main():
+    print(f"[INFO] Loading {INPUT_FILE}...")
+    org = pd.read_csv(INPUT_FILE, dtype={"Job ID": str})
+    org = org[org["OrgNameNormalized"].notna() & (org["OrgNameNormalized"] != "")]
+    counts = org["OrgNameNormalized"].value_counts()
+    print(f"[INFO] {len(counts)} distinct org names over {len(org)} jobs.")
+
+    names = resolve_names(counts.index.tolist(), counts, load_previous_ids())
+    print(f"[INFO] {names['OrgClusterID'].nunique()} org clusters.")
+    names.to_csv(CLUSTERS_FILE, index=False)
+    print(f"[INFO] Saved {CLUSTERS_FILE}")
+
+    budgets = pd.read_csv(JOBS_FILE, dtype={"Job ID": str}, usecols=["Job ID", "Budget Avg"])
+    budgets["Budget Avg"] = pd.to_numeric(budgets["Budget Avg"], errors="coerce")
+    budgets = budgets.drop_duplicates("Job ID")
+
+    jobs = (
+        org[["Job ID", "OrgNameNormalized", "Categories"]]
+        .merge(names[["OrgNameNormalized", "OrgClusterID", "OrgName"]], on="OrgNameNormalized")
+        .merge(budgets, on="Job ID", how="left")
+    )
+    aggregates = org_aggregates(jobs)
+    aggregates.to_csv(OUTPUT_FILE, index=False)
+    print(f"[INFO] Saved {len(aggregates)} orgs to {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import json
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from org_cache import ORG_FIELDS, cached_org_fields, org_columns, open_org_cache
+from org_extraction import get_backend, ner
+
+# Only reachable from this machine
+HOST = "127.0.0.1"
+PORT = 8765
+SERVICE_URL = f"http://{HOST}:{PORT}"
+
+BACKEND = "hybrid"
+
+# Requests arriving within BATCH_WAIT_MS of the first queued one are
+# extracted together (one nlp.pipe run), up to MAX_BATCH_ROWS rows
+BATCH_WAIT_MS = 5
+MAX_BATCH_ROWS = 2048
+# Largest request body accepted
+MAX_REQUEST_MB = 64
+# Enforce the org cache size bound every this many batches (the batch
+# scripts evict when they close the cache, which a running service never does)
+EVICT_EVERY_BATCHES = 200
+
+
+class OrgExtractor(threading.Thread):
+    """
+    Owns the backend (and its warm model) and the org cache. HTTP handler
+    threads submit batches of rows; this thread merges whatever is queued
+    into one extraction and hands every caller its own rows back.
+    """
+
+    def __init__(self, backend=BACKEND):
+        super().__init__(daemon=True)
+        self.backend = get_backend(backend)
+        if self.backend.name != "rules":
+            # load the model now rather than on the first request
+            ner.get_nlp()
+        self.version = self.backend.version()
+        self.requests = queue.Queue()
+        self.stats = {"requests": 0, "rows": 0, "batches": 0, "extracted": 0, "evicted": 0}
+
+    def stop(self):
+        """Finish the queued requests, then close the cache and exit."""
+        self.requests.put(None)
+
+    def submit(self, titles, descriptions):
+        """Future of the org field rows of (titles, descriptions)."""
+        future = Future()
+        self.requests.put((titles, descriptions, future))
+        return future
+
+    def next_batch(self):
+        """
+        Block for one request, then collect more for up to BATCH_WAIT_MS.
+        Returns the batch and whether stop() was called.
+        """
+        first = self.requests.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        rows = len(first[0])
+        deadline = time.monotonic() + BATCH_WAIT_MS / 1000.0
+        while rows < MAX_BATCH_ROWS:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            rows += len(item[0])
+        return batch, False
+
+    def run(self):
+        # sqlite connections stay on the thread that opened them
+        cache = open_org_cache()
+        extract = lambda t, d: org_columns(self.backend.extract_batch(t, d))
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = self.next_batch()
+                if batch:
+                    self.extract(batch, cache, extract)
+        finally:
+            if cache:
+                cache.close()
+
+    def extract(self, batch, cache, extract):
+        """Extract one merged batch and hand every caller its rows."""
+        titles = [t for ts, _, _ in batch for t in ts]
+        descriptions = [d for _, ds, _ in batch for d in ds]
+        try:
+            columns, extracted = cached_org_fields(titles, descriptions, self.version, extract, cache)
+        except Exception as e:
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        rows = [list(r) for r in zip(*(col.tolist() for col in columns))]
+        start = 0
+        for ts, _, future in batch:
+            future.set_result(rows[start:start + len(ts)])
+            start += len(ts)
+        self.stats["requests"] += len(batch)
+        self.stats["rows"] += len(titles)
+        self.stats["batches"] += 1
+        self.stats["extracted"] += extracted
+        if cache and self.stats["batches"] % EVICT_EVERY_BATCHES == 0:
+            self.stats["evicted"] += cache.evict()
+
+
+def valid_row(row):
+    return (
+        isinstance(row, list) and len(row) == 2
+        and all(v is None or isinstance(v, str) for v in row)
+    )
+
+
+class OrgRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /health -> backend version and counters.
+    POST /extract {"rows": [[title, description], ...]}
+        -> {"fields": ORG_FIELDS, "rows": [[OrgNameRaw, ...], ...]}
+    """
+
+    extractor = None
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        self.send_json(200, {
+            "backend": self.extractor.backend.name,
+            "version": self.extractor.version,
+            **self.extractor.stats,
+        })
+
+    def do_POST(self):
+        if self.path != "/extract":
+            self.send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        size = int(self.headers.get("Content-Length") or 0)
+        if size > MAX_REQUEST_MB * 1024 * 1024:
+            self.send_json(413, {"error": f"request larger than {MAX_REQUEST_MB} MB"})
+            return
+        try:
+            rows = json.loads(self.rfile.read(size))["rows"]
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": f"expected {{'rows': [[title, description], ...]}}: {e}"})
+            return
+        if not isinstance(rows, list) or not all(valid_row(r) for r in rows):
+            self.send_json(400, {"error": "every row must be a [title, description] pair of strings or nulls"})
+            return
+        titles = [r[0] or "" for r in rows]
+        descriptions = [r[1] or "" for r in rows]
+
+        try:
+            result = self.extractor.submit(titles, descriptions).result()
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+        self.send_json(200, {"fields": ORG_FIELDS, "rows": result})
+
+    def log_message(self, format, *args):
+        # one line per request would drown the [INFO] output
+        pass
+
+
+def extract_remote(titles, descriptions, url=SERVICE_URL, timeout=600):
+    """
+    Org field rows of (titles, descriptions) from a running service, in
+    the order of ORG_FIELDS.
+    """
+    body = json.dumps({"rows": [[t, d] for t, d in zip(titles, descriptions)]}).encode("utf-8")
+    request = urllib.request.Request(
+        url + "/extract", data=body, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return [tuple(r) for r in json.loads(response.read())["rows"]]
+
+
+def main():
+    print(f"[INFO] Loading {BACKEND} org extraction backend...")
+    extractor = OrgExtractor()
+    if extractor.backend.name != "rules" and not ner.ner_available():
+        print("[WARN] Serving without NER, only rules will match.")
+    extractor.start()
+
+    OrgRequestHandler.extractor = extractor
+    server = ThreadingHTTPServer((HOST, PORT), OrgRequestHandler)
+    print(f"[INFO] Org extraction service ({extractor.version}) on {SERVICE_URL}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[INFO] Stopping.")
+    finally:
+        server.server_close()
+        # the extractor thread owns the cache: let it evict and close it
+        extractor.stop()
+        extractor.join(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
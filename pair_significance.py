@@ -0,0 +1,150 @@
+import numpy as np
+from scipy import special, stats
+
+
+def contingency(support_ab, support_a, support_b, total):
+    """2x2 table cells (AB, A only, B only, neither) of every pair."""
+    ab = np.asarray(support_ab, dtype=np.float64)
+    a_only = np.asarray(support_a, dtype=np.float64) - ab
+    b_only = np.asarray(support_b, dtype=np.float64) - ab
+    neither = np.asarray(total, dtype=np.float64) - ab - a_only - b_only
+    return ab, a_only, b_only, neither
+
+
+def log_comb(n, k):
+    return -np.log1p(n) - special.betaln(n - k + 1, k + 1)
+
+
+def tail_sums(x, a, b, rest, term, step, rtol):
+    """
+    term (= P(X = x)) plus the following pmf terms, walking x by step (+1 or
+    -1) with the pmf ratio until they stop adding to the sum. The ratio is 0
+    past either end of the support, which ends the walk there.
+    """
+    sums = term.copy()
+    idx = np.arange(len(x))
+    s = sums
+    while len(idx):
+        if step > 0:
+            ratio = (a - x) * (b - x) / ((x + 1) * (rest + x + 1))
+        else:
+            ratio = x * (rest + x) / ((a - x + 1) * (b - x + 1))
+        x = x + step
+        term = term * ratio
+        s = s + term
+        going = term > s * rtol
+        if not going.all():
+            sums[idx[~going]] = s[~going]
+            idx, x, a, b, rest, term, s = (v[going] for v in (idx, x, a, b, rest, term, s))
+    return sums
+
+
+def fisher_p_values(support_ab, support_a, support_b, total, rtol=1e-16):
+    """
+    One sided Fisher exact p-values (A and B together at least this often),
+    i.e. the hypergeometric tail P(X >= Support AB).
+
+    scipy.stats.hypergeom.sf takes about a millisecond per pair, so the tail
+    is summed here for all pairs at once, one pmf ratio step per loop over
+    the pairs still converging. Pairs above the expected count sum the
+    upper tail, the others take one minus the lower tail, so the terms
+    shrink from the start either way.
+    """
+    k = np.asarray(support_ab, dtype=np.float64)
+    a = np.asarray(support_a, dtype=np.float64)
+    b = np.broadcast_to(np.asarray(support_b, dtype=np.float64), k.shape)
+    n = np.broadcast_to(np.asarray(total, dtype=np.float64), k.shape)
+    rest = n - a - b
+
+    upper = k * n > a * b
+    # first term: P(X = k) for the upper tail, P(X = k - 1) for the lower one
+    x = np.where(upper, k, k - 1)
+    inside = (x >= np.maximum(0.0, -rest)) & (x <= np.minimum(a, b))
+    with np.errstate(invalid="ignore"):
+        term = np.where(inside, np.exp(log_comb(a, x) + log_comb(n - a, b - x) - log_comb(n, b)), 0.0)
+
+    tail = np.zeros(k.shape)
+    for side, step in [(upper, 1), (~upper, -1)]:
+        i = np.flatnonzero(side & (term > 0))
+        tail[i] = tail_sums(x[i], a[i], b[i], rest[i], term[i], step, rtol)
+    return np.clip(np.where(upper, tail, 1.0 - tail), 0.0, 1.0)
+
+
+def chi2_p_values(support_ab, support_a, support_b, total):
+    """
+    One sided Pearson chi-square p-values of the 2x2 tables (no continuity
+    correction), testing the same direction as fisher_p_values: the signed
+    root of the statistic is a standard normal z, so a pair seen together
+    less often than expected gets p >= 0.5 instead of a small p.
+    """
+    ab, a_only, b_only, neither = contingency(support_ab, support_a, support_b, total)
+    n = ab + a_only + b_only + neither
+    excess = ab * neither - a_only * b_only
+    with np.errstate(invalid="ignore", divide="ignore"):
+        statistic = n * excess ** 2 / (
+            (ab + a_only) * (b_only + neither) * (ab + b_only) * (a_only + neither)
+        )
+        p = stats.norm.sf(np.sign(excess) * np.sqrt(statistic))
+    # a skill present in every job gives no evidence either way
+    return np.where(np.isfinite(statistic), p, 1.0)
+
+
+P_VALUES = {"fisher": fisher_p_values, "chi2": chi2_p_values}
+
+
+def lift_interval(support_ab, support_a, support_b, total, level=0.95):
+    """
+    Confidence interval of Lift from the exact Poisson interval of Support
+    AB with the single supports fixed. A pair seen once gets a lower
+    bound far below its Lift, so ranking by the lower bound keeps rare
+    pairs from dominating.
+    """
+    k = np.asarray(support_ab, dtype=np.float64)
+    scale = np.asarray(total, dtype=np.float64) / (
+        np.asarray(support_a, dtype=np.float64) * np.asarray(support_b, dtype=np.float64)
+    )
+    alpha = 1.0 - level
+    # the Poisson bounds depend on the count only: one inverse per distinct count
+    counts, inverse = np.unique(k, return_inverse=True)
+    low = np.where(counts > 0, special.gammaincinv(np.maximum(counts, 1), alpha / 2), 0.0)
+    high = special.gammaincinv(counts + 1, 1 - alpha / 2)
+    return low[inverse] * scale, high[inverse] * scale
+
+
+def fdr_q_values(p_values):
+    """Benjamini-Hochberg adjusted p-values (q-values), over all given tests."""
+    p = np.asarray(p_values, dtype=np.float64)
+    m = len(p)
+    if m == 0:
+        return p.copy()
+    order = np.argsort(p, kind="stable")
+    ranked = p[order] * m / np.arange(1, m + 1)
+    # q of the i-th smallest p is the min over the larger ranks
+    ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+    q = np.empty(m)
+    q[order] = np.minimum(ranked, 1.0)
+    return q
+
+
+def add_significance(table, total, method="fisher", fdr=True, level=0.95):
+    """
+    Add P Value (method "fisher" or "chi2"), Q Value (Benjamini-Hochberg
+    over the whole table, when fdr) and Lift Low / Lift High columns to a
+    pairs table with Support AB / A / B. total is the number of jobs the
+    supports are counted in, one value or one per row.
+    """
+    counts = [table[c].to_numpy() for c in ["Support AB", "Support A", "Support B"]]
+    total = np.broadcast_to(np.asarray(total), counts[0].shape)
+    if method not in P_VALUES:
+        raise ValueError(f"Unknown p-value method {method!r}, expected one of {sorted(P_VALUES)}")
+    table["P Value"] = P_VALUES[method](*counts, total)
+    if fdr:
+        table["Q Value"] = fdr_q_values(table["P Value"].to_numpy())
+    table["Lift Low"], table["Lift High"] = lift_interval(*counts, total, level)
+    return table
+
+
+def significant(table, max_q_value):
+    """Rows whose Q Value (P Value without FDR) is at most max_q_value."""
+    column = "Q Value" if "Q Value" in table.columns else "P Value"
+    return table[table[column] <= max_q_value]
@@ -1,11 +1,19 @@
 import csv
-from country_map import country_map
+from country_map import normalize_country
+from category_codes import DICTIONARY_FILE, load_dictionaries
+from check_inconsistencies import InconsistencyTracker, write_reports
+from date_partitions import parse_timestamp, partition_dir, remove_month_partitions, write_month_partitions
+from skill_pay_index import PAY_INDEX_FILE, SkillPayIndex
 
 
 INPUT_FILE = "RawData.csv"
 OUTPUT_CLEAN = "CleanData.csv"
 OUTPUT_SKILLS = "SkillsExploded.csv"
 
+# Also write CleanData / SkillsExploded as one CSV per month, so time
+# bounded runs of the later stages only read the months they need
+PARTITION_BY_MONTH = False
+
 
 def parse_budget(budget_raw):
     """Return (min, max, avg) budget values."""
@@ -29,14 +37,6 @@ def parse_budget(budget_raw):
             return "", "", ""
 
 
-def normalize_country(raw):
-    """Normalize country using country_map."""
-    if not raw:
-        return ""
-    key = raw.strip().upper()
-    return country_map.get(key, raw.strip())
-
-
 def main():
     # Load RawData.csv safely
     with open(INPUT_FILE, "r", encoding="utf-8") as f:
@@ -54,20 +54,26 @@ def main():
         "Category", "Job ID", "Sub ID", "URL", "Title", "Description",
         "Budget Min", "Budget Max", "Budget Avg",
         "Client Location", "Country Normalized",
-        "Payment Verified", "Relative Date", "Absolute Date",
+        "Payment Verified", "Relative Date", "Absolute Date", "Timestamp",
         "Job Type", "Experience Level",
         "Allowed Applicant Countries", "Skills"
     ]
 
     skills_header = [
         "Category", "Job ID", "Sub ID", "Budget Avg",
-        "Country Normalized", "Absolute Date",
+        "Country Normalized", "Absolute Date", "Timestamp",
         "Job Type", "Experience Level", "Skill"
     ]
 
     clean_output = [clean_header]
     skills_output = [skills_header]
 
+    # Pipeline-wide codes of the categorical columns, grown with new values
+    dictionaries = load_dictionaries()
+
+    # Track conflicting segment info per Job ID while rows are exploded
+    tracker = InconsistencyTracker(skills_header, dictionaries)
+
     # Process each row
     for row in rows:
         category = row.get("category", "")
@@ -80,6 +86,9 @@ def main():
         payment_verified = row.get("paymentVerified", "")
         rel_date = row.get("relativeDate", "")
         abs_date = row.get("absoluteDate", "")
+        # Parsed once here, later stages filter on the number
+        ts = parse_timestamp(abs_date)
+        ts = "" if ts is None else ts
         job_type = row.get("jobType", "")
         exp_level = row.get("experienceLevel", "")
         client_location = row.get("clientLocation", "")
@@ -103,19 +112,22 @@ def main():
             category, job_id, sub_id, url, title, desc,
             bmin, bmax, bavg,
             client_location, norm_country,
-            payment_verified, rel_date, abs_date,
+            payment_verified, rel_date, abs_date, ts,
             job_type, exp_level,
             allowed_str, tag_str
         ])
 
         # Add SkillsExploded rows
         for skill in tag_list:
-            skills_output.append([
+            skill_row = [
                 category, job_id, sub_id, bavg,
-                norm_country, abs_date,
+                norm_country, abs_date, ts,
                 job_type, exp_level,
                 skill
-            ])
+            ]
+            skills_output.append(skill_row)
+            tracker.add(skill_row)
+            dictionaries.code("Skill", skill)
 
     # Write CleanData
     with open(OUTPUT_CLEAN, "w", newline="", encoding="utf-8") as f:
@@ -127,9 +139,31 @@ def main():
         writer = csv.writer(f)
         writer.writerows(skills_output)
 
+    if PARTITION_BY_MONTH:
+        write_month_partitions(OUTPUT_CLEAN, clean_header, clean_output[1:])
+        months = write_month_partitions(OUTPUT_SKILLS, skills_header, skills_output[1:])
+        print(f"Partitioned by month: {', '.join(months)}")
+    else:
+        # stale partitions would shadow the files just written
+        remove_month_partitions(OUTPUT_CLEAN)
+        remove_month_partitions(OUTPUT_SKILLS)
+
+    # Inconsistency reports from the tracked state, no reload needed
+    print(f"Jobs with inconsistent segment info: {len(tracker.problem_jobs)}")
+    write_reports(skills_output[1:], skills_header, tracker.problem_jobs)
+
+    dictionaries.save(DICTIONARY_FILE)
+
+    # Budget histograms per skill for pay-rate queries
+    SkillPayIndex.from_rows(skills_output[1:], skills_header).save(PAY_INDEX_FILE)
+
     print("Processing complete.")
     print(f"Wrote: {OUTPUT_CLEAN}")
     print(f"Wrote: {OUTPUT_SKILLS}")
+    if PARTITION_BY_MONTH:
+        print(f"Wrote: {partition_dir(OUTPUT_CLEAN)}/, {partition_dir(OUTPUT_SKILLS)}/")
+    print(f"Wrote: {DICTIONARY_FILE}")
+    print(f"Wrote: {PAY_INDEX_FILE}")
 
 
 if __name__ == "__main__":
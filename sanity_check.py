@@ -1,11 +1,13 @@
 import pandas as pd
 
-# Load raw and aggregated data
-df = pd.read_csv("SkillsExploded.csv")
+from category_codes import load_dictionaries, read_categorical_csv
+
+# Load raw and aggregated data, segment and skill columns as dictionary
+# coded categoricals so the per pair filters below compare codes
+df, _ = read_categorical_csv("SkillsExploded.csv", dictionaries=load_dictionaries())
 pairs = pd.read_csv("SkillsPairsDetailed.csv")
 
 # Clean columns a bit like in your script
-df.columns = [c.strip() for c in df.columns]
 pairs.columns = [c.strip() for c in pairs.columns]
 
 # Filter valid data (same as script)
@@ -0,0 +1,241 @@
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+PAIRS_FILE = "SkillsPairsGlobal.csv"
+SKILLS_FILE = "SkillsExploded.csv"
+GRAPH_FILE = "SkillGraph.npz"
+GRAPHML_FILE = "SkillGraph.graphml"
+CLUSTERS_FILE = "SkillClusters.csv"
+CLUSTER_STATS_FILE = "SkillClusterStats.csv"
+
+# Edge weight column of the pairs table ("Jaccard", "Lift" or "Lift Low")
+# and the pairs kept as edges. MIN_WEIGHT = None takes the weight's
+# default: Jaccard is a share in [0, 1], a Lift below 1 means the skills
+# go together less often than chance, so Lift thresholds start at 1.
+WEIGHT = "Jaccard"
+MIN_WEIGHT = None
+MIN_WEIGHTS = {"Jaccard": 0.05, "Lift": 1.0, "Lift Low": 1.0}
+MIN_SUPPORT = 3
+
+# Label propagation: sweeps at most, fraction of the nodes updated per
+# sweep (partial updates keep it from oscillating) and the random seed
+MAX_ITER = 100
+UPDATE_FRACTION = 0.5
+SEED = 1
+
+# Skills listed per cluster in the stats
+TOP_SKILLS = 10
+
+
+def edge_threshold(weight, min_weight=None):
+    """
+    Smallest weight kept as an edge: min_weight, or the weight's default
+    when None. Raises ValueError for an unknown weight or a threshold
+    outside its range (a Lift threshold below 1 keeps pairs that avoid
+    each other).
+    """
+    if weight not in MIN_WEIGHTS:
+        raise ValueError(f"Unknown edge weight {weight!r}, expected one of {sorted(MIN_WEIGHTS)}")
+    if min_weight is None:
+        return MIN_WEIGHTS[weight]
+    if weight == "Jaccard" and not 0 <= min_weight <= 1:
+        raise ValueError(f"Jaccard threshold must be in [0, 1], got {min_weight}")
+    if weight != "Jaccard" and min_weight < 1:
+        raise ValueError(f"{weight} threshold must be at least 1, got {min_weight}")
+    return min_weight
+
+
+class SkillGraph:
+    """
+    Undirected weighted skill graph held as a symmetric CSR adjacency
+    matrix: adjacency[i, j] is the weight of the pair (skills[i], skills[j]).
+    """
+
+    def __init__(self, skills, adjacency, support=None):
+        self.skills = list(skills)
+        self.adjacency = sparse.csr_matrix(adjacency, dtype=np.float64)
+        self.support = (
+            sparse.csr_matrix(support, dtype=np.int64) if support is not None
+            else sparse.csr_matrix(self.adjacency.shape, dtype=np.int64)
+        )
+
+    def __len__(self):
+        return len(self.skills)
+
+    @classmethod
+    def from_pairs(cls, pairs, weight=WEIGHT, min_weight=MIN_WEIGHT, min_support=MIN_SUPPORT):
+        """Build from a co-occurrence pairs table (Skill A, Skill B, Support AB, weight)."""
+        min_weight = edge_threshold(weight, min_weight)
+        if weight not in pairs.columns:
+            raise ValueError(f"Pairs table has no {weight!r} column")
+        pairs = pairs[(pairs[weight] >= min_weight) & (pairs["Support AB"] >= min_support)]
+        codes, skills = pd.factorize(
+            pd.concat([pairs["Skill A"], pairs["Skill B"]], ignore_index=True).astype(str), sort=True
+        )
+        a, b = codes[:len(pairs)], codes[len(pairs):]
+        n = len(skills)
+
+        def symmetric(values, dtype):
+            m = sparse.coo_matrix((values, (a, b)), shape=(n, n), dtype=dtype).tocsr()
+            return (m + m.T).tocsr()
+
+        return cls(
+            skills.tolist(),
+            symmetric(pairs[weight].to_numpy(dtype=np.float64), np.float64),
+            symmetric(pairs["Support AB"].to_numpy(dtype=np.int64), np.int64),
+        )
+
+    def edge_support(self, rows, cols):
+        """Support AB of the edges (rows[i], cols[i])."""
+        if len(rows) == 0:
+            # scipy answers an empty lookup with a sparse matrix
+            return np.zeros(0, dtype=np.int64)
+        return np.asarray(self.support[rows, cols]).ravel()
+
+    # --------------- persistence ---------------
+
+    def save(self, path=GRAPH_FILE, clusters=None):
+        """CSR arrays (indptr, indices, weight, support) and the skill names, with clusters if given."""
+        extra = {} if clusters is None else {"clusters": np.asarray(clusters, dtype=np.int64)}
+        adj = self.adjacency
+        rows = np.repeat(np.arange(len(self)), np.diff(adj.indptr))
+        np.savez_compressed(
+            path,
+            skills=np.asarray(self.skills, dtype=str),
+            indptr=adj.indptr, indices=adj.indices, weight=adj.data,
+            support=self.edge_support(rows, adj.indices),
+            **extra,
+        )
+
+    @classmethod
+    def load(cls, path=GRAPH_FILE):
+        with np.load(path) as data:
+            n = len(data["skills"])
+            csr = lambda values: sparse.csr_matrix((values, data["indices"], data["indptr"]), shape=(n, n))
+            return cls(data["skills"].tolist(), csr(data["weight"]), csr(data["support"]))
+
+    def write_graphml(self, path=GRAPHML_FILE, clusters=None):
+        """GraphML for Gephi / Cytoscape: each edge once, skill and cluster as node attributes."""
+        upper = sparse.triu(self.adjacency, k=1).tocoo()
+        support = self.edge_support(upper.row, upper.col)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+            f.write('  <key id="label" for="node" attr.name="label" attr.type="string"/>\n')
+            f.write('  <key id="cluster" for="node" attr.name="cluster" attr.type="int"/>\n')
+            f.write('  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n')
+            f.write('  <key id="support" for="edge" attr.name="support" attr.type="int"/>\n')
+            f.write('  <graph id="skills" edgedefault="undirected">\n')
+            for i, skill in enumerate(self.skills):
+                cluster = "" if clusters is None else f'<data key="cluster">{clusters[i]}</data>'
+                f.write(f'    <node id="n{i}"><data key="label">{escape(skill)}</data>{cluster}</node>\n')
+            for a, b, w, s in zip(upper.row, upper.col, upper.data, support):
+                f.write(
+                    f'    <edge source="n{a}" target="n{b}"><data key="weight">{w:.6g}</data>'
+                    f'<data key="support">{s}</data></edge>\n'
+                )
+            f.write("  </graph>\n</graphml>\n")
+
+    # --------------- communities ---------------
+
+    def label_propagation(self, max_iter=MAX_ITER, update_fraction=UPDATE_FRACTION, seed=SEED):
+        """
+        Weighted label propagation: every node starts in its own cluster and
+        repeatedly takes the label with the largest total edge weight among
+        its neighbours (ties to the smallest label). Each sweep is a few
+        array passes over the edges, so a sweep is O(edges).
+
+        Returns one cluster id per skill, numbered by cluster size (0 = largest).
+        """
+        rng = np.random.default_rng(seed)
+        n = len(self)
+        if self.adjacency.nnz == 0:
+            # no edges: every skill is a cluster of its own, as isolated nodes are below
+            return np.arange(n, dtype=np.int64)
+        adj = self.adjacency.tocoo()
+        row, col, w = adj.row.astype(np.int64), adj.col.astype(np.int64), adj.data
+        labels = np.arange(n, dtype=np.int64)
+
+        for _ in range(max_iter):
+            # total weight per (node, neighbour label), then the best label per node
+            key, inverse = np.unique(row * n + labels[col], return_inverse=True)
+            score = np.bincount(inverse, weights=w)
+            node, label = key // n, key % n
+            order = np.lexsort((label, -score, node))
+            first = order[np.r_[True, node[order][1:] != node[order][:-1]]]
+            best = labels.copy()
+            best[node[first]] = label[first]
+
+            if (best == labels).all():
+                break
+            update = rng.random(n) < update_fraction
+            labels[update] = best[update]
+
+        _, labels, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        rank = np.empty(len(sizes), dtype=np.int64)
+        rank[np.lexsort((np.arange(len(sizes)), -sizes))] = np.arange(len(sizes))
+        return rank[labels]
+
+    def strength(self):
+        """Total edge weight of every skill."""
+        return np.asarray(self.adjacency.sum(axis=1)).ravel()
+
+
+def cluster_stats(graph, clusters, skills_df):
+    """
+    One row per cluster: its size, strongest skills and the jobs tagged with
+    any of its skills with their hourly / fixed budget stats (a job counts
+    once per cluster).
+    """
+    skill_cluster = pd.Series(clusters, index=graph.skills)
+    strength = graph.strength()
+    order = np.lexsort((-strength, clusters))
+    members = pd.DataFrame({"Cluster": clusters[order], "Skill": np.asarray(graph.skills)[order]})
+    top = members.groupby("Cluster")["Skill"].agg(lambda s: ", ".join(s.iloc[:TOP_SKILLS]))
+    size = members.groupby("Cluster").size()
+
+    jobs = skills_df[["Job ID", "Skill", "Job Type", "Budget Avg"]].copy()
+    jobs["Cluster"] = jobs["Skill"].astype(str).map(skill_cluster)
+    jobs = jobs.dropna(subset=["Cluster"]).drop_duplicates(["Job ID", "Cluster"])
+    jobs["Cluster"] = jobs["Cluster"].astype(np.int64)
+    jobs["Budget Avg"] = pd.to_numeric(jobs["Budget Avg"], errors="coerce")
+
+    stats = pd.DataFrame({"Skills": size, "Top Skills": top})
+    stats["Jobs"] = jobs.groupby("Cluster").size()
+    for job_type in ["Hourly", "Fixed"]:
+        budget = jobs[jobs["Job Type"].astype(str) == job_type].groupby("Cluster")["Budget Avg"]
+        stats[f"{job_type}_Jobs"] = budget.size()
+        stats[f"{job_type}_Avg"] = budget.mean()
+        stats[f"{job_type}_Median"] = budget.median()
+    count_cols = ["Jobs", "Hourly_Jobs", "Fixed_Jobs"]
+    stats[count_cols] = stats[count_cols].fillna(0).astype(np.int64)
+    return stats.rename_axis("Cluster").reset_index()
+
+
+def main():
+    print(f"[INFO] Loading {PAIRS_FILE}...")
+    graph = SkillGraph.from_pairs(pd.read_csv(PAIRS_FILE))
+    min_weight = edge_threshold(WEIGHT, MIN_WEIGHT)
+    print(f"[INFO] Skill graph: {len(graph)} skills, {graph.adjacency.nnz // 2} edges ({WEIGHT} >= {min_weight:g})")
+
+    clusters = graph.label_propagation()
+    print(f"[INFO] {clusters.max() + 1 if len(clusters) else 0} clusters")
+
+    graph.save(GRAPH_FILE, clusters)
+    graph.write_graphml(GRAPHML_FILE, clusters)
+    pd.DataFrame({
+        "Skill": graph.skills, "Cluster": clusters,
+        "Degree": np.diff(graph.adjacency.indptr), "Strength": graph.strength(),
+    }).sort_values(["Cluster", "Strength"], ascending=[True, False]).to_csv(CLUSTERS_FILE, index=False)
+
+    skills_df = pd.read_csv(SKILLS_FILE, dtype={"Job ID": str})
+    skills_df.columns = [c.strip() for c in skills_df.columns]
+    cluster_stats(graph, clusters, skills_df).to_csv(CLUSTER_STATS_FILE, index=False)
+    print(f"[INFO] Saved {GRAPH_FILE}, {GRAPHML_FILE}, {CLUSTERS_FILE}, {CLUSTER_STATS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+PAY_INDEX_FILE = "SkillPayIndex.npz"
+SKILLS_FILE = "SkillsExploded.csv"
+
+# Fixed log spaced Budget Avg bins shared by every histogram, so histograms
+# merge by adding counts. Budgets outside the range fall in the end bins.
+N_BINS = 96
+BUDGET_MIN = 1.0
+BUDGET_MAX = 1e6
+
+# Key of every histogram, in order
+AXES = ["skill", "category", "experience", "job_type"]
+LABEL_COLS = {
+    "skill": "Skill",
+    "category": "Category",
+    "experience": "Experience Level",
+    "job_type": "Job Type",
+}
+
+
+def bin_edges(n_bins=N_BINS, low=BUDGET_MIN, high=BUDGET_MAX):
+    return np.geomspace(low, high, n_bins + 1)
+
+
+class SkillPayIndex:
+    """
+    Budget Avg histograms of the priced jobs per Skill x Category x
+    Experience Level x Job Type cell, on fixed bins. Only non empty cells
+    are kept: cells[i] holds the label codes (AXES order) of hist[i], and
+    cells are sorted by skill, so skill_ptr[s]:skill_ptr[s + 1] are the
+    cells of skill s. Queries add up the histograms of the selected cells.
+    """
+
+    def __init__(self, labels, cells, hist, budget_sum, edges):
+        self.labels = {axis: list(labels[axis]) for axis in AXES}
+        self.positions = {axis: {v: i for i, v in enumerate(vs)} for axis, vs in self.labels.items()}
+        self.cells = np.asarray(cells, dtype=np.int32).reshape(-1, len(AXES))
+        self.hist = np.asarray(hist, dtype=np.int32)
+        self.budget_sum = np.asarray(budget_sum, dtype=np.float64)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.skill_ptr = np.searchsorted(self.cells[:, 0], np.arange(len(self.labels["skill"]) + 1))
+
+    @classmethod
+    def from_skills(cls, df, edges=None):
+        """Build from SkillsExploded rows; a job counts once per Category it is listed under."""
+        edges = bin_edges() if edges is None else np.asarray(edges, dtype=np.float64)
+        df = df[df["Job ID"].notna() & df["Skill"].notna()]
+        df = df.drop_duplicates(["Job ID", "Category", "Skill"])
+        budget = pd.to_numeric(df["Budget Avg"], errors="coerce").to_numpy(dtype=np.float64)
+        priced = ~np.isnan(budget)
+
+        labels, codes = {}, []
+        for axis in AXES:
+            values = df[LABEL_COLS[axis]].astype(object).fillna("").astype(str).str.strip()
+            c, uniques = pd.factorize(values, sort=True)
+            labels[axis] = uniques.tolist()
+            codes.append(c[priced])
+        budget = budget[priced]
+
+        shape = tuple(len(labels[axis]) for axis in AXES)
+        key = np.ravel_multi_index(codes, shape) if len(budget) else np.zeros(0, dtype=np.int64)
+        cell_keys, cell = np.unique(key, return_inverse=True)
+        n_bins = len(edges) - 1
+        bins = np.clip(np.searchsorted(edges, budget, side="right") - 1, 0, n_bins - 1)
+
+        hist = np.bincount(cell * n_bins + bins, minlength=len(cell_keys) * n_bins)
+        budget_sum = np.bincount(cell, weights=budget, minlength=len(cell_keys))
+        cells = np.column_stack(np.unravel_index(cell_keys, shape)) if len(cell_keys) else np.zeros((0, len(AXES)))
+        return cls(labels, cells, hist.reshape(-1, n_bins), budget_sum, edges)
+
+    @classmethod
+    def from_rows(cls, rows, header, edges=None):
+        """Build from SkillsExploded csv rows (lists in header order)."""
+        return cls.from_skills(pd.DataFrame(rows, columns=header), edges)
+
+    # --------------- persistence ---------------
+
+    def save(self, path=PAY_INDEX_FILE):
+        np.savez(
+            path,
+            cells=self.cells, hist=self.hist, budget_sum=self.budget_sum, edges=self.edges,
+            **{f"labels_{axis}": np.asarray(self.labels[axis], dtype=str) for axis in AXES},
+        )
+
+    @classmethod
+    def load(cls, path=PAY_INDEX_FILE):
+        with np.load(path) as data:
+            labels = {axis: data[f"labels_{axis}"].tolist() for axis in AXES}
+            return cls(labels, data["cells"], data["hist"], data["budget_sum"], data["edges"])
+
+    # --------------- queries ---------------
+
+    def _rows(self, skills, selection):
+        """Cell rows of the given skills within the selected labels (axis=label or list)."""
+        if isinstance(skills, str):
+            skills = [skills]
+        pos = self.positions["skill"]
+        found = [pos[s] for s in skills if s in pos]
+        rows = np.concatenate(
+            [np.arange(self.skill_ptr[s], self.skill_ptr[s + 1]) for s in found] or [np.zeros(0, dtype=np.int64)]
+        )
+        for i, axis in enumerate(AXES[1:], start=1):
+            values = selection.get(axis)
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            wanted = np.zeros(len(self.labels[axis]), dtype=bool)
+            wanted[[self.positions[axis][v] for v in values if v in self.positions[axis]]] = True
+            rows = rows[wanted[self.cells[rows, i]]]
+        return rows
+
+    def histogram(self, skills, **selection):
+        """
+        Merged histogram (job counts per bin) of skills among the selected
+        cells, e.g. job_type="Hourly", experience=["Expert"]. A job tagged
+        with several of the skills counts once for each.
+        """
+        return self.hist[self._rows(skills, selection)].sum(axis=0)
+
+    def percentiles(self, skills, q=(25, 50, 75), **selection):
+        """
+        Budget percentiles of the merged histogram, interpolated log
+        linearly inside the bin (NaN when no priced job matches).
+        """
+        return self.histogram_percentiles(self.histogram(skills, **selection), q)
+
+    def histogram_percentiles(self, hist, q=(25, 50, 75)):
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64)) / 100.0
+        total = hist.sum()
+        if total == 0:
+            return np.full(len(q), np.nan)
+        cdf = np.cumsum(hist) / total
+        b = np.minimum(np.searchsorted(cdf, q, side="left"), len(hist) - 1)
+        before = np.where(b > 0, cdf[b - 1], 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.clip(np.nan_to_num((q - before) / (cdf[b] - before)), 0.0, 1.0)
+        low, high = self.edges[b], self.edges[b + 1]
+        return low * (high / low) ** frac
+
+    def mean(self, skills, **selection):
+        """Exact mean Budget Avg over the merged histogram's jobs."""
+        rows = self._rows(skills, selection)
+        jobs = self.hist[rows].sum()
+        return self.budget_sum[rows].sum() / jobs if jobs else np.nan
+
+    def estimate(self, skills, q=(25, 50, 75), **selection):
+        """
+        What jobs with skills pay: one row per Job Type with the priced
+        jobs, mean and percentiles of the merged histograms.
+        """
+        rows = self._rows(skills, selection)
+        job_types = self.cells[rows, AXES.index("job_type")]
+        table = []
+        for jt in np.unique(job_types):
+            jt_rows = rows[job_types == jt]
+            hist = self.hist[jt_rows].sum(axis=0)
+            table.append([
+                self.labels["job_type"][jt], int(hist.sum()),
+                self.budget_sum[jt_rows].sum() / hist.sum(),
+                *self.histogram_percentiles(hist, q),
+            ])
+        columns = ["Job Type", "Jobs", "Mean Budget"] + [f"P{p:g}" for p in q]
+        return pd.DataFrame(table, columns=columns)
+
+
+def main():
+    print(f"[INFO] Loading {SKILLS_FILE}...")
+    df = pd.read_csv(SKILLS_FILE, dtype={"Job ID": str})
+    df.columns = [c.strip() for c in df.columns]
+    index = SkillPayIndex.from_skills(df)
+    index.save(PAY_INDEX_FILE)
+    print(f"[INFO] Saved {PAY_INDEX_FILE} ({len(index.labels['skill'])} skills, {len(index.cells)} cells)")
+
+
+if __name__ == "__main__":
+    main()
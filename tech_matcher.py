@@ -0,0 +1,101 @@
+import csv
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Default tech dictionary for TechnicalScore. Terms are matched on the raw
+# description, so punctuation and multi word terms work ("c#", "node.js",
+# "google cloud").
+TECH_TERMS = [
+    'python', 'java', 'c#', 'sql', 'javascript', 'react', 'node', 'node.js',
+    'azure', 'aws', 'google cloud', 'docker', 'ml', 'ai', 'tensorflow', 'pytorch',
+]
+
+# Characters that may not touch a match on either side
+BOUNDARY_BEFORE = r"(?<![\w#+])"
+BOUNDARY_AFTER = r"(?![\w#+])"
+
+
+def normalize_term(term):
+    return " ".join(str(term).lower().split())
+
+
+def _trie_pattern(node):
+    """
+    Regex for a character trie. Children are alternatives, a terminal node
+    makes the rest optional; the regex engine tries the longer branch first
+    so the longest term wins ("node.js" over "node").
+    """
+    branches = []
+    for ch in sorted(k for k in node if k):
+        piece = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(piece + _trie_pattern(node[ch]))
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    return group + "?" if "" in node else group
+
+
+class TechTermMatcher:
+    """
+    Multi-pattern matcher built once from a term dictionary.
+
+    All terms go into one character trie which is compiled into a single
+    regex, so each document is scanned once by the C regex engine no matter
+    how many terms there are. Matching is case insensitive and only whole
+    terms count.
+    """
+
+    def __init__(self, terms):
+        # normalized term -> term as given (first spelling wins)
+        self.canonical = {}
+        for t in terms:
+            key = normalize_term(t)
+            if key and key not in self.canonical:
+                self.canonical[key] = str(t).strip()
+
+        trie = {}
+        for key in self.canonical:
+            node = trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        body = _trie_pattern(trie)
+        self.regex = None
+        if body:
+            self.regex = re.compile(
+                BOUNDARY_BEFORE + "(?:" + body + ")" + BOUNDARY_AFTER, re.IGNORECASE
+            )
+
+    def count(self, text):
+        """Counter of normalized term -> occurrences in one document."""
+        counts = Counter()
+        if self.regex is None or not text:
+            return counts
+        for m in self.regex.finditer(text):
+            counts[normalize_term(m.group(0))] += 1
+        return counts
+
+
+@lru_cache(maxsize=8)
+def get_matcher(terms):
+    """Matcher for a tuple of terms, built once per process."""
+    return TechTermMatcher(terms)
+
+
+def load_skill_terms(path="SkillsExploded.csv", min_jobs=3):
+    """
+    Seed a dictionary from the scraped skill tags: every skill that appears
+    on at least min_jobs distinct jobs.
+    """
+    jobs = {}
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            skill = (row.get("Skill") or "").strip()
+            job_id = (row.get("Job ID") or "").strip()
+            if skill and job_id:
+                jobs.setdefault(skill, set()).add(job_id)
+    return sorted(s for s, ids in jobs.items() if len(ids) >= min_jobs)
@@ -0,0 +1,163 @@
+import json
+import os
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+# Default location of the encoded description tokens
+TOKEN_STORE_DIR = "DescriptionTokens"
+
+IDS_FILE = "ids.i32"
+OFFSETS_FILE = "offsets.i64"
+VOCAB_FILE = "vocab.txt"
+META_FILE = "meta.json"
+
+
+class Vocabulary:
+    """
+    Token <-> int32 id mapping. Ids are handed out in first seen order and
+    never change, so arrays encoded earlier stay valid as the vocab grows.
+    """
+
+    def __init__(self, tokens=None):
+        self.tokens = []
+        self.ids = {}
+        for t in tokens or []:
+            self.add(t)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def add(self, token):
+        idx = self.ids.get(token)
+        if idx is None:
+            idx = self.ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return idx
+
+    def encode(self, token_lists):
+        """
+        Encode lists of tokens as CSR arrays: offsets (n_docs + 1, int64)
+        and ids (int32). Document i owns ids[offsets[i]:offsets[i + 1]].
+        """
+        lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+        offsets = np.zeros(len(token_lists) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        flat = list(chain.from_iterable(token_lists))
+        if not flat:
+            return offsets, np.zeros(0, dtype=np.int32)
+
+        # hash every token in C, only the distinct ones go through the dict
+        codes, uniques = pd.factorize(pd.Series(flat, dtype=object), sort=False)
+        global_ids = np.fromiter((self.add(t) for t in uniques), dtype=np.int32, count=len(uniques))
+        return offsets, global_ids[codes]
+
+    def decode(self, ids):
+        return [self.tokens[i] for i in ids]
+
+    def save(self, path):
+        # tokens never contain whitespace, one per line is safe
+        with open(path, "w", encoding="utf-8") as f:
+            for t in self.tokens:
+                f.write(t + "\n")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(line.rstrip("\n") for line in f)
+
+
+class TokenStoreWriter:
+    """
+    Write side of a token store. CSR chunks are appended to the binary files
+    as they come, so a corpus can be stored without ever holding all of its
+    tokens; close() writes the vocabulary and the meta file.
+    """
+
+    def __init__(self, path=TOKEN_STORE_DIR):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.n_docs = 0
+        self.n_tokens = 0
+        self.ids_file = open(os.path.join(path, IDS_FILE), "wb")
+        self.offsets_file = open(os.path.join(path, OFFSETS_FILE), "wb")
+        np.zeros(1, dtype=np.int64).tofile(self.offsets_file)
+
+    def append(self, offsets, ids):
+        offsets = np.asarray(offsets, dtype=np.int64)
+        (offsets[1:] - offsets[0] + self.n_tokens).tofile(self.offsets_file)
+        np.ascontiguousarray(ids, dtype=np.int32).tofile(self.ids_file)
+        self.n_docs += len(offsets) - 1
+        self.n_tokens += int(offsets[-1] - offsets[0])
+
+    def close(self, vocab):
+        self.ids_file.close()
+        self.offsets_file.close()
+        vocab.save(os.path.join(self.path, VOCAB_FILE))
+        meta = {
+            "n_docs": self.n_docs,
+            "n_tokens": self.n_tokens,
+            "n_vocab": len(vocab),
+        }
+        with open(os.path.join(self.path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+
+def write_token_store(path, offsets, ids, vocab):
+    """Persist CSR token arrays and their vocabulary as raw binary files."""
+    writer = TokenStoreWriter(path)
+    writer.append(offsets, ids)
+    writer.close(vocab)
+
+
+class TokenStore:
+    """
+    Read side of a token store. The id and offset arrays are memory mapped,
+    so opening a store costs nothing until rows are actually touched.
+    """
+
+    def __init__(self, path=TOKEN_STORE_DIR):
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.offsets = np.memmap(
+            os.path.join(path, OFFSETS_FILE), dtype=np.int64, mode="r",
+            shape=(self.meta["n_docs"] + 1,),
+        )
+        if self.meta["n_tokens"]:
+            self.ids = np.memmap(
+                os.path.join(path, IDS_FILE), dtype=np.int32, mode="r",
+                shape=(self.meta["n_tokens"],),
+            )
+        else:
+            # numpy cannot map an empty file
+            self.ids = np.zeros(0, dtype=np.int32)
+        self.path = path
+        self._vocab = None
+
+    def __len__(self):
+        return self.meta["n_docs"]
+
+    @property
+    def vocab(self):
+        if self._vocab is None:
+            self._vocab = Vocabulary.load(os.path.join(self.path, VOCAB_FILE))
+        return self._vocab
+
+    def row(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def tokens(self, i):
+        return self.vocab.decode(self.row(i))
+
+
+def take_rows(offsets, ids, rows):
+    """CSR arrays holding the given rows (repeats allowed) in the given order."""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, np.asarray(ids)[gather]